@@ -23,6 +23,10 @@ secretsmanager = boto3.client('secretsmanager')
 SAGEMAKER_ENDPOINT = os.environ.get(
     'SAGEMAKER_ENDPOINT_NAME', 'marketminute-dev-endpoint')
 WEBAPP_URL = os.environ.get('WEBAPP_URL', '')
+# Send raw OHLCV tails (with the full-history OBV anchor) and let the
+# endpoint compute features with each model's feature_names (skips the
+# local FeatureEngine pass)
+SERVER_SIDE_FEATURES = os.environ.get('SERVER_SIDE_FEATURES', '0') == '1'
 LAMBDA_API_KEY = os.environ.get('LAMBDA_API_KEY', '')
 
 
@@ -197,7 +201,7 @@ def handler(event, context):
 
             # Step 3: Fetch market data and generate predictions
             features, prices, volatilities, raw_data = fetch_market_data()
-            raw_predictions = get_predictions(features)
+            raw_predictions = get_predictions(features, raw_data)
             live_predictions = generate_live_predictions(
                 raw_predictions, prices, volatilities, raw_data, webapp_url=WEBAPP_URL, lambda_api_key=LAMBDA_API_KEY)
             distributional_forecasts = generate_distributional_forecasts(
@@ -281,6 +285,9 @@ def fetch_market_data():
             volatilities[ticker] = calculate_historical_volatility(df)
             prices[ticker] = float(df['close'].iloc[-1])
 
+            if SERVER_SIDE_FEATURES:
+                continue
+
             df_features = feature_engine.calculate_all(df)
             if df_features.empty:
                 print(f"[Lambda] No features generated for {ticker}")
@@ -295,12 +302,15 @@ def fetch_market_data():
             print(f"[Lambda] Error processing {ticker}: {str(e)}")
             continue
 
-    print(f"[Lambda] Successfully processed {len(features)} tickers")
+    print(f"[Lambda] Successfully processed {len(raw_data if SERVER_SIDE_FEATURES else features)} tickers")
     return features, prices, volatilities, raw_data
 
 
-def get_predictions(features):
-    """Call SageMaker endpoint with market features"""
+def get_predictions(features, raw_data=None):
+    """Call SageMaker endpoint with market features (or raw OHLCV tails)"""
+    if SERVER_SIDE_FEATURES and raw_data:
+        return get_predictions_from_ohlcv(raw_data)
+
     response = sagemaker_runtime.invoke_endpoint(
         EndpointName=SAGEMAKER_ENDPOINT,
         ContentType='application/json',
@@ -308,3 +318,27 @@ def get_predictions(features):
             {'tickers': list(features.keys()), 'features': features})
     )
     return json.loads(response['Body'].read().decode()).get('predictions', {})
+
+
+def get_predictions_from_ohlcv(raw_data):
+    """
+    Call SageMaker endpoint with OHLCV tails; features are computed server-side.
+    Each tail carries the OBV of its first bar over the full history, so the
+    cumulative obv / obv_slope features match the ones the models trained on.
+    """
+    columns = ['open', 'high', 'low', 'close', 'volume']
+    ohlcv = {}
+    for ticker, df in raw_data.items():
+        df = df.sort_values('timestamp')
+        tail = df.tail(FeatureEngine.TAIL_HISTORY)
+        bars = {c: tail[c].astype(float).tolist() for c in columns}
+        bars['timestamp'] = pd.to_datetime(tail['timestamp']).dt.strftime('%Y-%m-%d').tolist()
+        bars['obv_anchor'] = FeatureEngine.obv_anchor(df, FeatureEngine.TAIL_HISTORY)
+        ohlcv[ticker] = bars
+
+    response = sagemaker_runtime.invoke_endpoint(
+        EndpointName=SAGEMAKER_ENDPOINT,
+        ContentType='application/json',
+        Body=json.dumps({'ohlcv': ohlcv, 'rows': 1})
+    )
+    return json.loads(response['Body'].read().decode()).get('predictions', {})
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Compile LightGBM model artifacts to native libraries for serving.
+
+Runs during the Docker build (the libraries are tuned for the build CPU).
+Every compiled model is checked against Booster.predict on rows probing its
+split thresholds; libraries failing parity are removed and the model is
+served through LightGBM as before. Non-LightGBM artifacts are skipped.
+
+Pickles in version directories (model_manifest.py) are compiled in place,
+so each library sits next to the artifact the manifest points at.
+
+Usage:
+    python3 compile_models.py [/opt/ml/model]
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import joblib
+import lightgbm as lgb
+
+sys.path.insert(0, '/opt/ml/code')
+
+from src.models.compiled_booster import (
+    LLEAVES_AVAILABLE, PARITY_ATOL, compile_booster, remove_compiled,
+    save_compiled_meta, verify_parity
+)
+
+
+def main():
+    model_dir = Path(sys.argv[1] if len(sys.argv) > 1 else "/opt/ml/model")
+
+    if not LLEAVES_AVAILABLE:
+        print("lleaves not installed - skipping model compilation")
+        return
+
+    compiled, failed, skipped = 0, 0, 0
+    start = time.perf_counter()
+
+    for model_path in sorted(model_dir.rglob("*.pkl")):
+        lib_path = model_path.with_suffix(".so")
+
+        try:
+            model = joblib.load(model_path)
+            booster = getattr(model, "model", None)
+            if not isinstance(booster, lgb.Booster):
+                skipped += 1
+                continue
+
+            compiled_booster = compile_booster(booster, lib_path)
+            max_error = verify_parity(booster, compiled_booster)
+
+            if max_error > PARITY_ATOL:
+                print(f"  {model_path.stem}: parity FAILED (max error {max_error:.2e})")
+                remove_compiled(lib_path)
+                failed += 1
+                continue
+
+            save_compiled_meta(lib_path, booster, max_error)
+            compiled += 1
+        except Exception as e:
+            print(f"  {model_path.stem}: compilation failed: {e}")
+            remove_compiled(lib_path)
+            failed += 1
+
+    elapsed = time.perf_counter() - start
+    print(f"Compiled {compiled} models in {elapsed:.1f}s "
+          f"({failed} failed, {skipped} skipped)")
+
+
+if __name__ == '__main__':
+    main()
@@ -62,19 +62,19 @@ echo -e "${BLUE}📦 Preparing build context...${NC}"
 SCRIPT_DIR="$( cd "$( dirname "${BASH_SOURCE[0]}" )" && pwd )"
 cd "$SCRIPT_DIR"
 
-rm -rf models src
-mkdir -p models
+rm -rf models models_staging src
+mkdir -p models models_staging
 
-# Copy return models (preferred) and lgbm models as fallback
+# Stage return models (preferred) and lgbm models as fallback
 if [ -d "../models/return" ]; then
-    cp ../models/return/*.pkl models/ 2>/dev/null || true
-    RETURN_COUNT=$(ls -1 models/*_return.pkl 2>/dev/null | wc -l | tr -d ' ')
+    cp ../models/return/*.pkl models_staging/ 2>/dev/null || true
+    RETURN_COUNT=$(ls -1 models_staging/*_return.pkl 2>/dev/null | wc -l | tr -d ' ')
     echo -e "${GREEN}✅ Copied $RETURN_COUNT return models${NC}"
 fi
 
 if [ -d "../models/lgbm" ]; then
-    cp ../models/lgbm/*.pkl models/ 2>/dev/null || true
-    LGBM_COUNT=$(ls -1 models/*_lgbm.pkl 2>/dev/null | wc -l | tr -d ' ')
+    cp ../models/lgbm/*.pkl models_staging/ 2>/dev/null || true
+    LGBM_COUNT=$(ls -1 models_staging/*_lgbm.pkl 2>/dev/null | wc -l | tr -d ' ')
     echo -e "${GREEN}✅ Copied $LGBM_COUNT lgbm models${NC}"
 fi
 
@@ -84,7 +84,7 @@ if [ -f "../models/model_metadata.json" ]; then
     echo -e "${GREEN}✅ Copied model_metadata.json${NC}"
 fi
 
-TOTAL_MODELS=$(ls -1 models/*.pkl 2>/dev/null | wc -l | tr -d ' ')
+TOTAL_MODELS=$(ls -1 models_staging/*.pkl 2>/dev/null | wc -l | tr -d ' ')
 if [ "$TOTAL_MODELS" -eq 0 ]; then
     echo -e "${RED}❌ Error: No models found${NC}"
     exit 1
@@ -92,6 +92,10 @@ fi
 
 cp -r ../src src
 echo -e "${GREEN}✅ Total models: $TOTAL_MODELS${NC}"
+
+# Publish under models/<version>/ with the manifest the endpoint watches
+python3 ../scripts/build_model_manifest.py models/ --source models_staging/
+rm -rf models_staging
 echo
 
 # 4) Build image (disable provenance to avoid OCI manifest issues with SageMaker)
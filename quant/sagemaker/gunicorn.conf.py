@@ -0,0 +1,77 @@
+"""
+Gunicorn settings for the SageMaker endpoint (pre-fork, copy-on-write models).
+
+The app is imported once in the master (preload_app) and wsgi.py warms the
+model cache synchronously there, so every forked worker starts with the
+models already resident and shares their pages copy-on-write. gc.freeze()
+moves the loaded objects out of the collector's generations so collections
+in the workers don't write to (and un-share) those pages.
+
+Configuration (environment):
+    SERVER_WORKERS   worker processes (default: CPU count)
+    SERVER_THREADS   request threads per worker (default 4)
+    SERVER_TIMEOUT   worker timeout in seconds (default 120)
+    OMP_NUM_THREADS  per-worker native threads (default: CPUs / workers)
+    PROMETHEUS_MULTIPROC_DIR  per-process metric files aggregated by /metrics
+                     (default /tmp/prometheus_multiproc, emptied at startup)
+
+Each worker polls the model manifest itself, so a hot-reloaded model is
+private to that worker (not shared copy-on-write) until the next restart.
+"""
+
+import gc
+import multiprocessing
+import os
+import shutil
+
+cpu_count = multiprocessing.cpu_count()
+
+bind = "0.0.0.0:8080"
+chdir = "/opt/ml/code"
+pythonpath = "/opt/ml/code"
+
+workers = int(os.environ.get("SERVER_WORKERS", cpu_count))
+threads = int(os.environ.get("SERVER_THREADS", "4"))
+worker_class = "gthread"
+timeout = int(os.environ.get("SERVER_TIMEOUT", "120"))
+graceful_timeout = 30
+keepalive = 5
+
+preload_app = True
+
+# Must be set before the app (and LightGBM's OpenMP runtime) is imported:
+# split the cores across workers instead of every worker using all of them
+os.environ.setdefault("OMP_NUM_THREADS", str(max(1, cpu_count // max(1, workers))))
+
+# Threads don't survive fork: warm the cache in the master before forking
+os.environ["PRELOAD_IN_BACKGROUND"] = "0"
+
+# Metrics shared across workers: must exist (and hold no stale files from a
+# previous run) before the app imports prometheus_client
+multiproc_dir = os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", "/tmp/prometheus_multiproc")
+shutil.rmtree(multiproc_dir, ignore_errors=True)
+os.makedirs(multiproc_dir, exist_ok=True)
+
+accesslog = "-"
+errorlog = "-"
+loglevel = "info"
+
+
+def post_fork(server, worker):
+    """Per-worker threads (they don't survive the fork from the master)."""
+    import inference
+    inference.start_manifest_watcher()
+
+
+def child_exit(server, worker):
+    """Drop the exited worker's live gauges from the aggregated metrics."""
+    from prometheus_client import multiprocess
+    multiprocess.mark_process_dead(worker.pid)
+
+
+def when_ready(server):
+    """Runs in the master after the app is loaded, before workers fork."""
+    gc.collect()
+    gc.freeze()
+    server.log.info(f"Frozen {gc.get_freeze_count()} objects before forking "
+                    f"{workers} workers x {threads} threads")
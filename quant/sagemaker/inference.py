@@ -1,13 +1,65 @@
-import json
 import numpy as np
+import pandas as pd
 import os
+import time
+import threading
 import joblib
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+from src.models.compiled_booster import attach_compiled
+from model_cache import ModelCache, resident_bytes
+import metrics
+import model_manifest
+import payloads
+
 MODEL_DIR = "/opt/ml/model"
 
-# Global model cache for lazy loading
-_model_cache = {}
+# Use native libraries built by compile_models.py when present
+USE_COMPILED_MODELS = os.environ.get("USE_COMPILED_MODELS", "1") == "1"
+
+# Memory-bounded model cache for lazy loading (budget/pins via MODEL_CACHE_* env)
+_model_cache = ModelCache.from_env(on_event=metrics.cache_event)
+
+# Threads scoring the tickers of one batch request (LightGBM and the
+# compiled libraries release the GIL while predicting)
+PREDICT_THREADS = int(os.environ.get("PREDICT_THREADS", min(8, os.cpu_count() or 1)))
+
+_predict_pool = None
+_predict_pool_pid = None
+_predict_pool_lock = threading.Lock()
+
+# Hot reload: poll the versioned manifest every MODEL_RELOAD_INTERVAL seconds
+# (0 disables) and swap changed tickers in place
+MODEL_MANIFEST = os.environ.get(
+    "MODEL_MANIFEST", str(Path(MODEL_DIR) / model_manifest.MANIFEST_NAME))
+MODEL_RELOAD_INTERVAL = float(os.environ.get("MODEL_RELOAD_INTERVAL", "60"))
+
+# Manifest currently served (entries whose reload failed keep the old version)
+_manifest = model_manifest.read_manifest(MODEL_MANIFEST) or {"version": None, "models": {}}
+_manifest_mtime = None
+_manifest_lock = threading.Lock()
+# Changed tickers whose reload failed; retried on every poll until applied
+_pending = []
+_watcher_pid = None
+
+# Tickers with a pickle in MODEL_DIR when no manifest is served (listed once)
+_dir_tickers = None
+
+# TICKER_INVOCATIONS label for tickers without a model, so client-sent
+# strings cannot add unbounded series
+UNKNOWN_TICKER_LABEL = "unknown"
+
+
+def available_tickers():
+    """Tickers in the manifest, or with a return or lgbm model in MODEL_DIR."""
+    if _manifest.get("version") is not None:
+        return sorted(_manifest["models"])
+    model_path = Path(MODEL_DIR)
+    return sorted(
+        {f.stem.replace("_return", "") for f in model_path.glob("*_return.pkl")}
+        | {f.stem.replace("_lgbm", "") for f in model_path.glob("*_lgbm.pkl")}
+    )
 
 
 def model_fn(model_dir):
@@ -16,46 +68,249 @@ def model_fn(model_dir):
     Models are loaded on-demand in predict_fn to save memory.
     """
     model_path = Path(MODEL_DIR)
-    # Support both return and lgbm models
-    available_return = [f.stem.replace("_return", "")
-                        for f in model_path.glob("*_return.pkl")]
-    available_lgbm = [f.stem.replace("_lgbm", "")
-                      for f in model_path.glob("*_lgbm.pkl")]
-
-    total = len(available_return) + len(available_lgbm)
-    print(f"Model directory ready with {total} models available")
-    print(f"  - Return models: {len(available_return)}")
-    print(f"  - LGBM models: {len(available_lgbm)}")
+    # Manifest entries live under <version>/; without one, top-level pickles
+    if _manifest.get("version") is not None:
+        files = [Path(entry["file"]).name for entry in _manifest["models"].values()]
+        print(f"Manifest {_manifest['version']}: serving {len(files)} models")
+    else:
+        files = [model_artifact_path(t).name for t in available_tickers()]
+
+    print(f"Model directory ready with {len(files)} models available")
+    print(f"  - Return models: {sum(f.endswith('_return.pkl') for f in files)}")
+    print(f"  - LGBM models: {sum(f.endswith('_lgbm.pkl') for f in files)}")
     print(f"Memory optimization: Models will be lazy-loaded on demand")
 
     return model_path
 
 
-def load_model(ticker):
-    """Lazy-load a model only when needed. Prefers return model over lgbm."""
-    if ticker in _model_cache:
-        return _model_cache[ticker]
+def is_served(ticker):
+    """Whether ``ticker`` is one of available_tickers() (without re-listing MODEL_DIR)."""
+    global _dir_tickers
+    if _manifest.get("version") is not None:
+        return ticker in _manifest["models"]
+    if _dir_tickers is None:
+        _dir_tickers = frozenset(available_tickers())
+    return ticker in _dir_tickers
+
+
+def model_artifact_path(ticker):
+    """
+    Model pickle for a ticker. With a manifest only its (immutable, versioned)
+    entries are served; otherwise prefers the return model over lgbm.
+    """
+    if _manifest.get("version") is not None:
+        entry = _manifest["models"].get(ticker)
+        if entry is None:
+            return None
+        model_path = Path(MODEL_MANIFEST).parent / entry["file"]
+        return model_path if model_path.exists() else None
 
     # Try return model first (better performance), then lgbm
     model_path = Path(MODEL_DIR) / f"{ticker}_return.pkl"
     if not model_path.exists():
         model_path = Path(MODEL_DIR) / f"{ticker}_lgbm.pkl"
-    if not model_path.exists():
-        return None
+    return model_path if model_path.exists() else None
+
 
+def _load_from_disk(ticker, model_path):
     try:
+        start = time.perf_counter()
         model = joblib.load(model_path)
-        _model_cache[ticker] = model  # Cache for reuse
-        print(f"Lazy-loaded model for {ticker}")
+        compiled = USE_COMPILED_MODELS and attach_compiled(
+            model, model_path.with_suffix(".so"))
+        elapsed = time.perf_counter() - start
+        print(f"Loaded model for {ticker} in {elapsed*1000:.0f} ms"
+              + (" (compiled)" if compiled else ""))
         return model
     except Exception as e:
         print(f"Failed to load model for {ticker}: {e}")
         return None
 
 
+def load_model(ticker):
+    """Lazy-load a model only when needed, through the bounded cache."""
+    model_path = model_artifact_path(ticker)
+    if model_path is None:
+        return None
+
+    return _model_cache.get_or_load(
+        ticker,
+        lambda: _load_from_disk(ticker, model_path),
+        artifact_paths=[model_path, model_path.with_suffix(".so")],
+    )
+
+
+def warm_models(tickers, workers=8):
+    """
+    Load models into the cache in a thread pool before serving traffic
+    (deserialization and the compiled-library loads release the GIL for
+    much of their time).
+
+    Args:
+        tickers: Tickers to preload
+        workers: Loader threads
+
+    Returns:
+        Summary dict with loaded/failed counts and total seconds
+    """
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        loaded = list(pool.map(load_model, tickers))
+
+    failed = [t for t, m in zip(tickers, loaded) if m is None]
+    elapsed = time.perf_counter() - start
+    stats = _model_cache.stats()
+    print(f"Warm-up: loaded {len(tickers) - len(failed)}/{len(tickers)} models "
+          f"in {elapsed:.1f}s with {workers} threads "
+          f"({stats['bytes'] / 1e6:.0f} MB cached)")
+    if failed:
+        print(f"Warm-up: failed to load {', '.join(failed)}")
+    if stats["evictions"]:
+        print(f"Warm-up: {stats['evictions']} models evicted - "
+              f"MODEL_CACHE_MAX_MB is smaller than the preload set")
+
+    return {"loaded": len(tickers) - len(failed), "failed": failed,
+            "seconds": round(elapsed, 3)}
+
+
+def _reload_ticker(ticker, entry):
+    """Swap in a changed artifact. False = not ready yet (retry next poll)."""
+    model_path = Path(MODEL_MANIFEST).parent / entry["file"]
+    try:
+        if model_manifest.file_sha256(model_path) != entry["sha256"]:
+            print(f"Reload: {model_path.name} does not match the manifest yet")
+            return False
+    except OSError as e:
+        print(f"Reload: cannot read {model_path.name}: {e}")
+        return False
+
+    if ticker not in _model_cache:
+        # Not resident: the next lazy load reads the new artifact
+        return True
+
+    # The old model keeps serving until the new one is loaded
+    model = _model_cache.refresh(
+        ticker,
+        lambda: _load_from_disk(ticker, model_path),
+        artifact_paths=[model_path, model_path.with_suffix(".so")],
+    )
+    return model is not None
+
+
+def reload_models(force=False):
+    """
+    Apply a new manifest version: reload only the tickers whose artifact
+    hash changed and drop removed ones.
+
+    Returns:
+        Summary dict, or None when the manifest is unchanged
+    """
+    global _manifest, _manifest_mtime, _pending
+
+    with _manifest_lock:
+        try:
+            mtime = os.stat(MODEL_MANIFEST).st_mtime
+        except OSError:
+            return None
+        retry = force or bool(_pending)
+        if not retry and mtime == _manifest_mtime:
+            return None
+
+        new = model_manifest.read_manifest(MODEL_MANIFEST)
+        if new is None:
+            return None
+        _manifest_mtime = mtime
+        # _manifest already carries the new version after a partial reload;
+        # its pending tickers still hold their old entries, so diffing again
+        # picks them up
+        if not retry and new.get("version") == _manifest.get("version"):
+            return None
+
+        start = time.perf_counter()
+        changed, removed = model_manifest.diff_manifests(_manifest, new)
+        entries = [new["models"][t] for t in changed]
+        with ThreadPoolExecutor(max_workers=max(1, PREDICT_THREADS)) as pool:
+            swapped = list(pool.map(_reload_ticker, changed, entries))
+
+        # Tickers that failed keep serving their previous entry
+        models = dict(new["models"])
+        pending = [t for t, ok in zip(changed, swapped) if not ok]
+        for ticker in pending:
+            if ticker in _manifest["models"]:
+                models[ticker] = _manifest["models"][ticker]
+            else:
+                models.pop(ticker)
+
+        for ticker in removed:
+            _model_cache.pop(ticker)
+
+        _manifest = {**new, "models": models}
+        _pending = pending
+
+    elapsed = time.perf_counter() - start
+    metrics.MODEL_RELOADS.labels("ok" if not pending else "partial").inc()
+    update_worker_metrics()
+    print(f"Reload: manifest {new.get('version')} - {len(changed) - len(pending)} "
+          f"changed, {len(removed)} removed, {len(pending)} pending in {elapsed:.1f}s")
+    return {"version": new.get("version"), "changed": len(changed) - len(pending),
+            "removed": len(removed), "pending": pending, "seconds": round(elapsed, 3)}
+
+
+def _watch_manifest():
+    while True:
+        time.sleep(MODEL_RELOAD_INTERVAL)
+        try:
+            reload_models()
+        except Exception as e:
+            metrics.MODEL_RELOADS.labels("error").inc()
+            print(f"Reload failed: {e}")
+
+
+def start_manifest_watcher():
+    """Start the manifest polling thread once per (forked) worker process."""
+    global _watcher_pid
+    if MODEL_RELOAD_INTERVAL <= 0 or _watcher_pid == os.getpid():
+        return
+    _watcher_pid = os.getpid()
+    threading.Thread(target=_watch_manifest, name="manifest-watcher", daemon=True).start()
+
+
+def manifest_version():
+    return _manifest.get("version")
+
+
+def cache_stats():
+    """Hit/miss/eviction counters and memory use of the model cache."""
+    return _model_cache.stats()
+
+
+def update_worker_metrics():
+    """Publish this worker's memory, cache and manifest gauges."""
+    metrics.update_worker(cache_stats=_model_cache.stats(), resident_bytes=resident_bytes(),
+                          manifest_version=manifest_version())
+
+
+def render_metrics():
+    """Prometheus text exposition, aggregated across gunicorn workers."""
+    update_worker_metrics()
+    return metrics.render()
+
+
+def predict_ticker(model, features):
+    """Class predictions and probabilities for one ticker in a single pass."""
+    if hasattr(model, "predict_with_proba"):
+        pred_class, pred_proba = model.predict_with_proba(features)
+    else:
+        pred_class, pred_proba = model.predict(features), model.predict_proba(features)
+    return {
+        "class": np.asarray(pred_class),
+        "probabilities": np.asarray(pred_proba)
+    }
+
+
 def input_fn(request_body, request_content_type):
     """
-    Expected input format:
+    Expected input format (application/json):
     {
         "ticker": "AAPL",  # Single ticker
         "features": [[...]]  # Feature array
@@ -65,13 +320,104 @@ def input_fn(request_body, request_content_type):
         "tickers": ["AAPL", "MSFT"],  # Multiple tickers
         "features": {"AAPL": [[...]], "MSFT": [[...]]}  # Features per ticker
     }
+
+    OR raw bars, with features computed server-side (see ohlcv_features)
+    {
+        "ohlcv": {"AAPL": {"timestamp": [...], "open": [...], "high": [...],
+                           "low": [...], "close": [...], "volume": [...],
+                           "obv_anchor": 1.2e9}},  # FeatureEngine.obv_anchor
+        "rows": 1  # Latest feature rows to score per ticker (1..MAX_OHLCV_ROWS)
+    }
+
+    application/x-npy and application/x-msgpack carry one float32
+    (rows x features) matrix plus a per-row ticker index (see payloads.py)
+    and decode to the batch form above; msgpack may also carry the
+    "ohlcv" form.
     """
-    if request_content_type == "application/json":
-        data = json.loads(request_body)
-        return data
-    else:
+    return payloads.decode_request(request_body, request_content_type)
+
+
+def _predict_executor():
+    """Shared scoring pool, created lazily in each (forked) worker process."""
+    global _predict_pool, _predict_pool_pid
+    with _predict_pool_lock:
+        if _predict_pool is None or _predict_pool_pid != os.getpid():
+            _predict_pool = ThreadPoolExecutor(
+                max_workers=PREDICT_THREADS, thread_name_prefix="predict")
+            _predict_pool_pid = os.getpid()
+        return _predict_pool
+
+
+OHLCV_COLUMNS = ("timestamp", "open", "high", "low", "close", "volume")
+
+# Upper bound on "rows" per OHLCV request: each row beyond the last costs
+# FeatureEngine rolling applies over the whole tail
+MAX_OHLCV_ROWS = int(os.environ.get("MAX_OHLCV_ROWS", "252"))
+
+
+def ohlcv_features(model, bars, rows=1):
+    """
+    Model-ready feature rows computed in the container from raw OHLCV bars,
+    selected and ordered by the model's feature_names.
+
+    Args:
+        bars: {"timestamp": [...], "open": [...], ..., "volume": [...]} plus
+              "obv_anchor" when the bars are the tail of a longer history
+              (without it OBV restarts at the first bar sent)
+        rows: Latest rows to return (send >= FeatureEngine.TAIL_HISTORY bars)
+    """
+    # Imported on first use: only the OHLCV mode needs the feature stack
+    from src.data.features.feature_engine import FeatureEngine
+
+    missing = [c for c in OHLCV_COLUMNS if c not in bars]
+    if missing:
+        raise ValueError(f"OHLCV bars missing columns {missing}")
+
+    df = pd.DataFrame({c: bars[c] for c in OHLCV_COLUMNS})
+    df["timestamp"] = pd.to_datetime(df["timestamp"])
+    features = FeatureEngine().calculate_all(
+        df, tail_rows=rows, obv_anchor=bars.get("obv_anchor"))
+
+    feature_names = list(getattr(model, "feature_names", None) or [])
+    if not feature_names:
+        raise ValueError("model has no feature_names")
+    missing = [f for f in feature_names if f not in features.columns]
+    if missing or features.empty:
         raise ValueError(
-            "Unsupported content type: {}".format(request_content_type))
+            f"insufficient history: {len(df)} bars (need >= {FeatureEngine.MIN_HISTORY}), "
+            f"missing features {missing[:5]}")
+
+    return features[feature_names].to_numpy(dtype=float)
+
+
+def _score_ticker(ticker, ticker_features, ohlcv_rows=None):
+    """
+    Prediction dict for one ticker; failures stay local to the ticker.
+    With ``ohlcv_rows`` set, ticker_features are raw OHLCV bars.
+    """
+    if ticker_features is None:
+        return {"error": f"No features for {ticker}"}
+
+    with metrics.timed("load"):
+        model = load_model(ticker)
+    if not model:
+        return {"error": f"No model available for {ticker}"}
+
+    if ohlcv_rows is not None:
+        try:
+            with metrics.timed("features"):
+                ticker_features = ohlcv_features(model, ticker_features, ohlcv_rows)
+        except Exception as e:
+            print(f"Feature computation failed for {ticker}: {e}")
+            return {"error": f"Feature computation failed for {ticker}: {e}"}
+
+    try:
+        # Return both class prediction and probabilities
+        with metrics.timed("predict"):
+            return predict_ticker(model, np.asarray(ticker_features))
+    except Exception as e:
+        print(f"Prediction failed for {ticker}: {e}")
+        return {"error": f"Prediction failed for {ticker}: {e}"}
 
 
 def predict_fn(input_data, model_path):
@@ -81,49 +427,67 @@ def predict_fn(input_data, model_path):
     # Single ticker prediction
     if "ticker" in input_data:
         ticker = input_data["ticker"]
-        features = np.array(input_data["features"])
+        features = np.asarray(input_data["features"])
 
-        model = load_model(ticker)
+        with metrics.timed("load"):
+            model = load_model(ticker)
         if model:
             # Return both class prediction and probabilities
-            pred_class = model.predict(features).tolist()
-            pred_proba = model.predict_proba(features).tolist()
-            predictions[ticker] = {
-                "class": pred_class,
-                "probabilities": pred_proba
-            }
+            with metrics.timed("predict"):
+                predictions[ticker] = predict_ticker(model, features)
         else:
             predictions[ticker] = {"error": f"No model available for {ticker}"}
 
-    # Multiple tickers prediction (batch)
+    # Multiple tickers prediction (batch): loads and scoring overlap across
+    # tickers; results keep the request's ticker order
     elif "tickers" in input_data:
-        for ticker in input_data["tickers"]:
-            if ticker in input_data.get("features", {}):
-                model = load_model(ticker)
-                if model:
-                    features = np.array(input_data["features"][ticker])
-                    # Return both class prediction and probabilities
-                    pred_class = model.predict(features).tolist()
-                    pred_proba = model.predict_proba(features).tolist()
-                    predictions[ticker] = {
-                        "class": pred_class,
-                        "probabilities": pred_proba
-                    }
-                else:
-                    predictions[ticker] = {
-                        "error": f"No model available for {ticker}"}
-            else:
-                predictions[ticker] = {"error": f"No features for {ticker}"}
+        tickers = list(input_data["tickers"])
+        features = input_data.get("features", {})
+        ticker_features = [features.get(t) for t in tickers]
+
+        if len(tickers) > 1 and PREDICT_THREADS > 1:
+            results = _predict_executor().map(_score_ticker, tickers, ticker_features)
+        else:
+            results = map(_score_ticker, tickers, ticker_features)
+
+        for ticker, result in zip(tickers, results):
+            predictions[ticker] = result
+
+    # Raw OHLCV tails per ticker: features are computed here with each
+    # model's feature_names, so the client needs no feature code
+    elif "ohlcv" in input_data:
+        bars = input_data["ohlcv"]
+        tickers = list(bars)
+        try:
+            rows = int(input_data.get("rows", 1))
+        except (TypeError, ValueError):
+            rows = 0
+        if not 1 <= rows <= MAX_OHLCV_ROWS:
+            return {"error": f"'rows' must be an integer from 1 to {MAX_OHLCV_ROWS}, "
+                             f"got {input_data.get('rows')!r}"}
+
+        def score(ticker):
+            return _score_ticker(ticker, bars[ticker], ohlcv_rows=rows)
+
+        if len(tickers) > 1 and PREDICT_THREADS > 1:
+            results = _predict_executor().map(score, tickers)
+        else:
+            results = map(score, tickers)
+
+        for ticker, result in zip(tickers, results):
+            predictions[ticker] = result
 
     # Not supported: predicting for all models (would load 223 models!)
     else:
-        return {"error": "Must specify 'ticker' or 'tickers' in request"}
+        return {"error": "Must specify 'ticker', 'tickers' or 'ohlcv' in request"}
+
+    for ticker, result in predictions.items():
+        label = ticker if is_served(ticker) else UNKNOWN_TICKER_LABEL
+        metrics.TICKER_INVOCATIONS.labels(label, "error" if "error" in result else "ok").inc()
 
     return predictions
 
 
 def output_fn(prediction, response_content_type):
-    return json.dumps({
-        "predictions": prediction,
-        "model_count": len(prediction) if isinstance(prediction, dict) else 0
-    })
+    """Serialize predictions as JSON (default), x-npy or x-msgpack."""
+    return payloads.encode_response(prediction, response_content_type)
@@ -0,0 +1,113 @@
+"""
+Prometheus metrics for the inference server (prometheus_client).
+
+Under gunicorn every worker is a separate process, so the series are kept
+in prometheus_client's multiprocess mode: each process writes its values to
+files in PROMETHEUS_MULTIPROC_DIR (set and emptied by gunicorn.conf.py
+before the app is imported) and /metrics aggregates every worker's files,
+whichever worker serves the scrape. Counters and histograms are summed
+across workers; per-worker gauges carry a pid label and are dropped when
+gunicorn reaps the worker (child_exit -> mark_process_dead); the master's
+series show the warm-up it did before forking. Without the variable (dev
+server) the default single-process registry is served.
+
+Phases timed per request:
+    parse      input_fn (request decode)
+    load       model lookup / load per ticker (cache hit or miss)
+    features   server-side FeatureEngine per ticker (OHLCV requests)
+    predict    predict_with_proba per ticker
+    serialize  output_fn (response encode)
+"""
+
+import os
+import time
+from contextlib import contextmanager
+
+from prometheus_client import (CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter,
+                               Gauge, Histogram, generate_latest, multiprocess)
+
+CONTENT_TYPE = CONTENT_TYPE_LATEST
+
+# Seconds; covers cache hits (~us) through cold pickle loads and 500-ticker batches
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1,
+                   0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+REQUEST_LATENCY = Histogram(
+    "model_server_request_seconds", "End-to-end /invocations latency", ["status"],
+    buckets=LATENCY_BUCKETS)
+PHASE_LATENCY = Histogram(
+    "model_server_phase_seconds", "Time per request phase (load/predict are per ticker)",
+    ["phase"], buckets=LATENCY_BUCKETS)
+TICKER_INVOCATIONS = Counter(
+    "model_server_ticker_invocations",
+    "Ticker predictions served (tickers without a model share the label 'unknown')",
+    ["ticker", "status"])
+MODEL_RELOADS = Counter(
+    "model_server_model_reloads", "Manifest versions applied", ["status"])
+
+# Counted as they happen (ModelCache on_event), so they sum across workers
+CACHE_EVENTS = {
+    stat: Counter(f"model_server_cache_{stat}", f"Model cache {stat}")
+    for stat in ("hits", "misses", "evictions")
+}
+
+# Per-worker state, one series per live pid
+RESIDENT_MEMORY = Gauge(
+    "model_server_resident_memory_bytes", "Resident set size of the worker",
+    multiprocess_mode="liveall")
+CACHE_ENTRIES = Gauge(
+    "model_server_cache_entries", "Models resident in the worker's cache",
+    multiprocess_mode="liveall")
+CACHE_BYTES = Gauge(
+    "model_server_cache_bytes", "Bytes charged to the worker's model cache",
+    multiprocess_mode="liveall")
+CACHE_MAX_BYTES = Gauge(
+    "model_server_cache_max_bytes", "Model cache budget (0 = unbounded)",
+    multiprocess_mode="liveall")
+MANIFEST_INFO = Gauge(
+    "model_server_manifest_info", "Model manifest version served (1 = current)", ["version"],
+    multiprocess_mode="liveall")
+
+_served_version = (None, None)  # (pid, version): forked workers publish their own
+
+
+def cache_event(stat):
+    """ModelCache on_event hook."""
+    CACHE_EVENTS[stat].inc()
+
+
+@contextmanager
+def timed(phase):
+    """Observe the duration of the with-block under PHASE_LATENCY{phase}."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        PHASE_LATENCY.labels(phase).observe(time.perf_counter() - start)
+
+
+def update_worker(cache_stats=None, resident_bytes=None, manifest_version=None):
+    """Refresh this process's gauges (after each request and before a scrape)."""
+    global _served_version
+
+    if resident_bytes is not None:
+        RESIDENT_MEMORY.set(resident_bytes)
+    if cache_stats is not None:
+        CACHE_ENTRIES.set(cache_stats["entries"])
+        CACHE_BYTES.set(cache_stats["bytes"])
+        CACHE_MAX_BYTES.set(cache_stats["max_bytes"])
+    served = (os.getpid(), manifest_version)
+    if manifest_version is not None and served != _served_version:
+        if _served_version[0] == served[0]:
+            MANIFEST_INFO.labels(_served_version[1]).set(0)
+        MANIFEST_INFO.labels(manifest_version).set(1)
+        _served_version = served
+
+
+def render():
+    """Full /metrics body, aggregated across workers in multiprocess mode."""
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry)
+    return generate_latest(REGISTRY)
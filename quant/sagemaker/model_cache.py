@@ -0,0 +1,220 @@
+"""
+Memory-bounded model cache for the inference server.
+
+Models are lazy-loaded per ticker; without a bound, a batch request for the
+whole universe would keep every pickle resident. Entries are charged their
+on-disk artifact size (or the process RSS growth while loading) against a
+byte budget and evicted least-recently- or least-frequently-used first.
+Pinned tickers are never evicted.
+
+RSS sizing measures the whole process, so under "rss" loads are serialized
+by a process-wide lock (concurrent warm-up or batch loads run one at a
+time); the charge can still include allocations made meanwhile by
+request threads. Prefer "artifact" when load throughput matters.
+
+Configuration (environment):
+    MODEL_CACHE_MAX_MB    byte budget in MB (0 = unbounded, default 2048)
+    MODEL_CACHE_POLICY    "lru" (default) or "lfu"
+    MODEL_CACHE_SIZING    "artifact" (default) or "rss"
+    MODEL_CACHE_PINNED    comma-separated tickers kept resident
+"""
+
+import os
+import resource
+import sys
+import threading
+from collections import OrderedDict
+
+POLICIES = ("lru", "lfu")
+SIZINGS = ("artifact", "rss")
+
+# RSS deltas are process-wide: only one rss-sized load may be measured at a time
+_rss_load_lock = threading.Lock()
+
+
+def resident_bytes():
+    """Current resident set size of this process."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        # Peak RSS: bytes on macOS, kilobytes on Linux
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+class _Entry:
+    __slots__ = ("value", "size", "hits")
+
+    def __init__(self, value, size):
+        self.value = value
+        self.size = size
+        self.hits = 0
+
+
+class ModelCache:
+    """Thread-safe LRU/LFU cache with a byte budget and pinned keys."""
+
+    def __init__(self, max_bytes=0, policy="lru", sizing="artifact", pinned=(), on_event=None):
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown cache policy '{policy}', expected one of {POLICIES}")
+        if sizing not in SIZINGS:
+            raise ValueError(f"Unknown cache sizing '{sizing}', expected one of {SIZINGS}")
+
+        self.max_bytes = max_bytes
+        self.policy = policy
+        self.sizing = sizing
+        self.pinned = set(pinned)
+        self.on_event = on_event  # called with "hits" / "misses" / "evictions"
+
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._loading = {}  # per-key load locks
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @classmethod
+    def from_env(cls, **kwargs):
+        pinned = os.environ.get("MODEL_CACHE_PINNED", "")
+        return cls(
+            max_bytes=int(float(os.environ.get("MODEL_CACHE_MAX_MB", "2048")) * 1024 * 1024),
+            policy=os.environ.get("MODEL_CACHE_POLICY", "lru"),
+            sizing=os.environ.get("MODEL_CACHE_SIZING", "artifact"),
+            pinned=[t.strip() for t in pinned.split(",") if t.strip()],
+            **kwargs
+        )
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._entries
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    def _count(self, stat):
+        """Bump a hits/misses/evictions counter (caller holds the lock)."""
+        setattr(self, stat, getattr(self, stat) + 1)
+        if self.on_event is not None:
+            self.on_event(stat)
+
+    def _lookup(self, key):
+        """Cached value counted as a hit, or None (caller holds the lock)."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        self._count("hits")
+        entry.hits += 1
+        self._entries.move_to_end(key)
+        return entry.value
+
+    def get(self, key):
+        """Cached value or None (counts a hit or miss)."""
+        with self._lock:
+            value = self._lookup(key)
+            if value is None:
+                self._count("misses")
+            return value
+
+    def get_or_load(self, key, loader, artifact_paths=()):
+        """
+        Cached value, or ``loader()`` stored under ``key``. Concurrent calls
+        for the same key share one load. Loader results of None are not cached.
+
+        Args:
+            loader: Zero-argument callable returning the model (or None)
+            artifact_paths: Files whose sizes are charged with "artifact" sizing
+        """
+        with self._lock:
+            value = self._lookup(key)
+        if value is not None:
+            return value
+
+        with self._key_lock(key):
+            # Another thread may have finished loading while we waited
+            with self._lock:
+                value = self._lookup(key)
+                if value is not None:
+                    return value
+                self._count("misses")
+
+            return self._load(key, loader, artifact_paths)
+
+    def refresh(self, key, loader, artifact_paths=()):
+        """
+        Load a new value for ``key`` and swap it in. Readers keep getting the
+        old value until the swap; if the loader returns None the old value
+        stays cached.
+        """
+        with self._key_lock(key):
+            return self._load(key, loader, artifact_paths)
+
+    def _key_lock(self, key):
+        with self._lock:
+            return self._loading.setdefault(key, threading.Lock())
+
+    def _load(self, key, loader, artifact_paths):
+        """Run the loader and cache its result (caller holds the key lock)."""
+        if self.sizing == "rss":
+            with _rss_load_lock:
+                rss_before = resident_bytes()
+                value = loader()
+                size = max(0, resident_bytes() - rss_before)
+        else:
+            value = loader()
+            size = sum(os.path.getsize(p) for p in artifact_paths if os.path.exists(p))
+        if value is not None:
+            self.put(key, value, size)
+        return value
+
+    def put(self, key, value, size):
+        """Insert or replace an entry, then evict down to the budget."""
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.current_bytes -= old.size
+            self._entries[key] = _Entry(value, size)
+            self.current_bytes += size
+            self._evict(protect=key)
+
+    def pop(self, key):
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self.current_bytes -= entry.size
+            return entry.value if entry is not None else None
+
+    def _evict(self, protect=None):
+        """Evict unpinned entries until within budget (caller holds the lock)."""
+        if not self.max_bytes:
+            return
+
+        while self.current_bytes > self.max_bytes:
+            candidates = [k for k in self._entries if k not in self.pinned and k != protect]
+            if not candidates:
+                return
+            if self.policy == "lfu":
+                # Ties go to the least recently used (OrderedDict order)
+                victim = min(candidates, key=lambda k: self._entries[k].hits)
+            else:
+                victim = candidates[0]
+
+            self.current_bytes -= self._entries.pop(victim).size
+            self._count("evictions")
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self.current_bytes,
+                "max_bytes": self.max_bytes,
+                "policy": self.policy,
+                "pinned": sorted(self.pinned),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
@@ -0,0 +1,190 @@
+"""
+Versioned model manifest for hot reloads.
+
+manifest.json sits in the model directory and lists the artifact serving
+each ticker with its content hash. Every model set is published under its
+own version directory, and files are never overwritten in place:
+
+    models/
+        manifest.json
+        20250114T220501Z/AAPL_return.pkl   (+ .so/.txt/.compiled.json if compiled)
+        20250121T220430Z/MSFT_return.pkl
+
+    {
+        "version": "20250121T220430Z",
+        "created_at": "2025-01-21T22:04:30+00:00",
+        "models": {
+            "AAPL": {"file": "20250114T220501Z/AAPL_return.pkl", "sha256": "...", "size": 123456},
+            "MSFT": {"file": "20250121T220430Z/MSFT_return.pkl", "sha256": "...", "size": 120112},
+            ...
+        },
+        "history": ["20250114T220501Z"]
+    }
+
+Publishing (scripts/build_model_manifest.py): changed artifacts are copied
+into a new version directory, unchanged tickers keep pointing at the file
+they already had, and the manifest is written last. Every path a manifest
+names is therefore complete and immutable, and the files of the previous
+versions listed in "history" stay in place for workers that have not
+polled the new manifest yet.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+from datetime import datetime, timezone
+from pathlib import Path
+
+MANIFEST_NAME = "manifest.json"
+
+# Compiled-library sidecars published with a pickle (see compile_models.py)
+SIDECAR_SUFFIXES = (".so", ".txt", ".compiled.json")
+
+
+def file_sha256(path, chunk_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def model_files(model_dir):
+    """{ticker: artifact path}, preferring return models over lgbm (as inference does)."""
+    model_dir = Path(model_dir)
+    files = {f.stem[:-len("_lgbm")]: f for f in model_dir.glob("*_lgbm.pkl")}
+    files.update({f.stem[:-len("_return")]: f for f in model_dir.glob("*_return.pkl")})
+    return dict(sorted(files.items()))
+
+
+def served_tickers(model_dir):
+    """Tickers a model directory serves: its manifest's entries, else top-level pickles."""
+    manifest = read_manifest(Path(model_dir) / MANIFEST_NAME)
+    if manifest is not None:
+        return sorted(manifest["models"])
+    return list(model_files(model_dir))
+
+
+def artifact_files(path):
+    """A model pickle plus whichever compiled sidecars exist next to it."""
+    path = Path(path)
+    sidecars = [path.with_suffix(suffix) for suffix in SIDECAR_SUFFIXES]
+    return [path] + [p for p in sidecars if p.exists()]
+
+
+def build_manifest(source_dir, version=None, previous=None):
+    """
+    Manifest for the model artifacts in ``source_dir``.
+
+    Tickers whose artifact hash matches ``previous`` keep its entry (and its
+    version directory); every other artifact is assigned to
+    ``<version>/<file name>``, to be copied there by ``publish``.
+    """
+    now = datetime.now(timezone.utc)
+    version = version or now.strftime("%Y%m%dT%H%M%SZ")
+    if not version or "/" in version or "\\" in version or version.startswith("."):
+        raise ValueError(f"Invalid manifest version '{version}'")
+
+    old_models = (previous or {}).get("models", {})
+    models = {}
+    for ticker, path in model_files(source_dir).items():
+        sha256 = file_sha256(path)
+        old = old_models.get(ticker)
+        # Reuse only versioned paths: flat legacy files may be overwritten
+        if old is not None and old.get("sha256") == sha256 and "/" in old["file"]:
+            models[ticker] = old
+            continue
+        models[ticker] = {
+            "file": f"{version}/{path.name}",
+            "sha256": sha256,
+            "size": path.stat().st_size,
+        }
+
+    return {
+        "version": version,
+        "created_at": now.isoformat(timespec="seconds"),
+        "models": models,
+    }
+
+
+def publish(manifest, source_dir, model_dir, previous=None, keep=3):
+    """
+    Copy the manifest's new artifacts into their version directory, write
+    the manifest, then delete version directories older than the ``keep``
+    most recent previous versions that nothing references any more.
+
+    Returns:
+        Names of the version directories removed
+    """
+    source_dir, model_dir = Path(source_dir), Path(model_dir)
+    version = manifest["version"]
+    version_dir = model_dir / version
+    if version_dir.exists() or (previous is not None and version == previous.get("version")):
+        raise ValueError(f"Version {version} is already published")
+
+    sources = model_files(source_dir)
+    new_entries = [t for t, entry in manifest["models"].items()
+                   if entry["file"].startswith(f"{version}/")]
+    if new_entries:
+        version_dir.mkdir(parents=True)
+    for ticker in new_entries:
+        for src in artifact_files(sources[ticker]):
+            # copy2 to a temp name, then rename: an interrupted publish
+            # leaves no complete-looking file behind
+            tmp_path = version_dir / f".{src.name}.tmp"
+            shutil.copy2(src, tmp_path)
+            os.replace(tmp_path, version_dir / src.name)
+        copied = version_dir / sources[ticker].name
+        if file_sha256(copied) != manifest["models"][ticker]["sha256"]:
+            raise ValueError(f"{sources[ticker]} changed while publishing")
+
+    history = []
+    if previous is not None and previous.get("version"):
+        history = [previous["version"]] + list(previous.get("history", []))
+    manifest["history"] = history[:keep]
+    write_manifest(manifest, model_dir / MANIFEST_NAME)
+
+    in_use = {entry["file"].split("/", 1)[0] for entry in manifest["models"].values()}
+    in_use.update(manifest["history"])
+    in_use.add(version)
+    removed = []
+    for old_version in history[keep:]:
+        old_dir = model_dir / old_version
+        if old_version not in in_use and old_dir.is_dir():
+            shutil.rmtree(old_dir)
+            removed.append(old_version)
+    return removed
+
+
+def read_manifest(path):
+    """Parsed manifest, or None if missing or unreadable (e.g. mid-write)."""
+    try:
+        with open(path, "r") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(manifest, dict) or not isinstance(manifest.get("models"), dict):
+        return None
+    return manifest
+
+
+def write_manifest(manifest, path):
+    """Write atomically so readers never see a partial manifest."""
+    path = Path(path)
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(manifest, f, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def diff_manifests(old, new):
+    """(changed or added tickers, removed tickers) between two manifests."""
+    old_models = (old or {}).get("models", {})
+    new_models = new.get("models", {})
+    changed = [t for t, entry in new_models.items()
+               if old_models.get(t, {}).get("sha256") != entry.get("sha256")]
+    removed = [t for t in old_models if t not in new_models]
+    return changed, removed
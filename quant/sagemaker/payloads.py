@@ -0,0 +1,230 @@
+"""
+Request/response codecs for the /invocations endpoint.
+
+JSON nests a list of float64 text per ticker; the binary formats carry one
+contiguous float32 (rows x features) matrix plus a ticker index with one
+entry per row (a ticker may own several consecutive rows).
+
+application/json (fallback)
+    request:  {"tickers": [...], "features": {ticker: [[...]]}}  or
+              {"ticker": "AAPL", "features": [[...]]}
+    response: {"predictions": {ticker: {"class", "probabilities"} | {"error"}},
+               "model_count": n}
+
+application/x-npy
+    Consecutive .npy arrays in one body (np.save twice / np.load twice).
+    request:  features float32 (rows, F), tickers unicode (rows,)
+    response: tickers (rows,), class int8 (rows,), probabilities float32
+              (rows, C), error_tickers, error_messages
+
+application/x-msgpack
+    request:  {"tickers": [...], "shape": [rows, F], "features": <float32 bytes>}
+              or the JSON "ohlcv" form (raw bars, features computed server-side)
+    response: {"tickers": [...], "shape": [rows, C], "class": <int8 bytes>,
+               "probabilities": <float32 bytes>, "errors": {ticker: msg},
+               "model_count": n}
+"""
+
+import io
+import json
+
+import numpy as np
+
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+
+JSON = "application/json"
+NPY = "application/x-npy"
+MSGPACK = "application/x-msgpack"
+CONTENT_TYPES = (JSON, NPY, MSGPACK)
+
+
+def _media_type(content_type):
+    """'application/json; charset=utf-8' -> 'application/json'"""
+    return (content_type or JSON).split(";")[0].strip().lower()
+
+
+def _check_supported(media_type):
+    if media_type not in CONTENT_TYPES:
+        raise ValueError("Unsupported content type: {}".format(media_type))
+    if media_type == MSGPACK and not MSGPACK_AVAILABLE:
+        raise ValueError("msgpack is not installed; use {} or {}".format(NPY, JSON))
+
+
+def negotiate(accept, request_content_type=None):
+    """
+    Response type: the first supported type in Accept, else the request's
+    own type when supported, else JSON.
+    """
+    for item in (accept or "").split(","):
+        media_type = _media_type(item)
+        if media_type in CONTENT_TYPES and (media_type != MSGPACK or MSGPACK_AVAILABLE):
+            return media_type
+
+    media_type = _media_type(request_content_type)
+    if media_type in CONTENT_TYPES and (media_type != MSGPACK or MSGPACK_AVAILABLE):
+        return media_type
+    return JSON
+
+
+def _group_rows(tickers, matrix):
+    """Per-ticker row blocks of the matrix, in first-seen ticker order."""
+    rows = {}
+    for i, ticker in enumerate(tickers):
+        rows.setdefault(str(ticker), []).append(i)
+
+    features = {}
+    for ticker, idx in rows.items():
+        if idx[-1] - idx[0] + 1 == len(idx):
+            features[ticker] = matrix[idx[0]:idx[-1] + 1]  # view, no copy
+        else:
+            features[ticker] = matrix[idx]
+    return {"tickers": list(rows), "features": features}
+
+
+def encode_request(features, content_type=NPY):
+    """
+    Client-side encoder.
+
+    Args:
+        features: {ticker: (rows, F) array-like}
+        content_type: One of CONTENT_TYPES
+    """
+    media_type = _media_type(content_type)
+    _check_supported(media_type)
+
+    if media_type == JSON:
+        return json.dumps({
+            "tickers": list(features),
+            "features": {t: np.asarray(f).tolist() for t, f in features.items()}
+        })
+
+    blocks = [np.atleast_2d(np.asarray(f, dtype=np.float32)) for f in features.values()]
+    matrix = np.ascontiguousarray(np.vstack(blocks)) if blocks else np.empty((0, 0), np.float32)
+    tickers = [t for t, block in zip(features, blocks) for _ in range(len(block))]
+
+    if media_type == NPY:
+        buf = io.BytesIO()
+        np.save(buf, matrix)
+        np.save(buf, np.array(tickers, dtype=str))
+        return buf.getvalue()
+
+    return msgpack.packb({
+        "tickers": tickers,
+        "shape": list(matrix.shape),
+        "features": matrix.astype("<f4", copy=False).tobytes()
+    })
+
+
+def decode_request(body, content_type):
+    """Server-side decoder into the predict_fn input dict."""
+    media_type = _media_type(content_type)
+    _check_supported(media_type)
+
+    if media_type == JSON:
+        return json.loads(body)
+
+    if media_type == NPY:
+        buf = io.BytesIO(body)
+        matrix = np.load(buf, allow_pickle=False)
+        tickers = np.load(buf, allow_pickle=False)
+    else:
+        payload = msgpack.unpackb(body)
+        if "ohlcv" in payload:
+            # Raw bars for server-side features: same structure as JSON
+            return payload
+        tickers = payload["tickers"]
+        matrix = np.frombuffer(payload["features"], dtype="<f4").reshape(payload["shape"])
+
+    if matrix.ndim != 2 or len(tickers) != len(matrix):
+        raise ValueError(
+            f"Expected a (rows, features) matrix with one ticker per row, "
+            f"got {matrix.shape} and {len(tickers)} tickers")
+    return _group_rows(tickers, matrix)
+
+
+def _columnar(predictions):
+    """predict_fn output -> row-aligned arrays plus an error map."""
+    tickers, classes, probas, errors = [], [], [], {}
+    for ticker, result in predictions.items():
+        if not isinstance(result, dict) or "error" in result:
+            errors[ticker] = result.get("error") if isinstance(result, dict) else str(result)
+            continue
+        cls = np.asarray(result["class"]).reshape(-1)
+        tickers.extend([ticker] * len(cls))
+        classes.append(cls.astype(np.int8))
+        probas.append(np.atleast_2d(np.asarray(result["probabilities"], dtype=np.float32)))
+
+    classes = np.concatenate(classes) if classes else np.empty(0, np.int8)
+    probas = np.ascontiguousarray(np.vstack(probas)) if probas else np.empty((0, 0), np.float32)
+    return tickers, classes, probas, errors
+
+
+def _to_json(value):
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def encode_response(predictions, content_type=JSON):
+    media_type = _media_type(content_type)
+    _check_supported(media_type)
+    model_count = len(predictions) if isinstance(predictions, dict) else 0
+
+    if media_type == JSON:
+        return json.dumps({"predictions": predictions, "model_count": model_count},
+                          default=_to_json)
+
+    tickers, classes, probas, errors = _columnar(predictions)
+
+    if media_type == NPY:
+        buf = io.BytesIO()
+        np.save(buf, np.array(tickers, dtype=str))
+        np.save(buf, classes)
+        np.save(buf, probas)
+        np.save(buf, np.array(list(errors), dtype=str))
+        np.save(buf, np.array(list(errors.values()), dtype=str))
+        return buf.getvalue()
+
+    return msgpack.packb({
+        "tickers": tickers,
+        "shape": list(probas.shape),
+        "class": classes.tobytes(),
+        "probabilities": probas.astype("<f4", copy=False).tobytes(),
+        "errors": errors,
+        "model_count": model_count
+    })
+
+
+def decode_response(body, content_type=JSON):
+    """Client-side decoder into the JSON response's {"predictions": ...} shape."""
+    media_type = _media_type(content_type)
+    _check_supported(media_type)
+
+    if media_type == JSON:
+        return json.loads(body)
+
+    if media_type == NPY:
+        buf = io.BytesIO(body)
+        tickers, classes, probas, error_tickers, error_messages = (
+            np.load(buf, allow_pickle=False) for _ in range(5))
+        errors = dict(zip(error_tickers.tolist(), error_messages.tolist()))
+    else:
+        payload = msgpack.unpackb(body)
+        tickers = payload["tickers"]
+        classes = np.frombuffer(payload["class"], dtype=np.int8)
+        probas = np.frombuffer(payload["probabilities"], dtype="<f4").reshape(payload["shape"])
+        errors = payload["errors"]
+
+    grouped = _group_rows(tickers, np.arange(len(tickers)))
+    predictions = {
+        ticker: {"class": classes[rows].tolist(), "probabilities": probas[rows].tolist()}
+        for ticker, rows in grouped["features"].items()
+    }
+    predictions.update({ticker: {"error": msg} for ticker, msg in errors.items()})
+    return {"predictions": predictions, "model_count": len(predictions)}
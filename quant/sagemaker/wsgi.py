@@ -1,43 +1,110 @@
+import os
+import threading
+import time
 from flask import Flask, request, jsonify
 import inference
+import metrics
 
 app = Flask(__name__)
+_startup_start = time.perf_counter()
+
+# Models loaded before /ping reports healthy: "all", "none", or comma-separated tickers
+PRELOAD_MODELS = os.environ.get("PRELOAD_MODELS", "all")
+PRELOAD_WORKERS = int(os.environ.get("PRELOAD_WORKERS", "8"))
+# The dev server warms up in a thread; gunicorn warms up before forking
+PRELOAD_IN_BACKGROUND = os.environ.get("PRELOAD_IN_BACKGROUND", "1") == "1"
 
 # Initialize model directory for lazy loading
 print("Initializing model directory...")
 model_path = inference.model_fn("/opt/ml/model")
-# Count available models without loading them
-available_models = len(list(model_path.glob("*_lgbm.pkl")))
+# Count available models (return or lgbm) without loading them
+available_models = len(inference.available_tickers())
 print(
     f"Model directory ready: {available_models} models available for lazy loading")
 
+_ready = threading.Event()
+_warmup = {}
+
+
+def preload_tickers():
+    if PRELOAD_MODELS.strip().lower() in ("", "none", "0"):
+        return []
+    if PRELOAD_MODELS.strip().lower() == "all":
+        return inference.available_tickers()
+    return [t.strip() for t in PRELOAD_MODELS.split(",") if t.strip()]
+
+
+def warm_up():
+    """Preload models, then mark the container healthy."""
+    try:
+        tickers = preload_tickers()
+        if tickers:
+            _warmup.update(inference.warm_models(tickers, workers=PRELOAD_WORKERS))
+    except Exception as e:
+        # Serve with lazy loading rather than never becoming healthy
+        print(f"Warm-up failed, falling back to lazy loading: {e}")
+    finally:
+        print(f"Startup complete in {time.perf_counter() - _startup_start:.1f}s")
+        inference.update_worker_metrics()
+        _ready.set()
+
+
+if PRELOAD_IN_BACKGROUND:
+    threading.Thread(target=warm_up, name="model-warmup", daemon=True).start()
+    # Under gunicorn the watcher starts per worker (post_fork)
+    inference.start_manifest_watcher()
+else:
+    warm_up()
+
 
 @app.route('/ping', methods=['GET'])
 def ping():
-    """Health check endpoint"""
-    return jsonify({'status': 'healthy', 'models_available': available_models})
+    """Health check endpoint (503 until warm-up has finished)"""
+    if not _ready.is_set():
+        return jsonify({'status': 'warming', 'model_cache': inference.cache_stats()}), 503
+    return jsonify({
+        'status': 'healthy',
+        'models_available': available_models,
+        'manifest_version': inference.manifest_version(),
+        'warmup': _warmup,
+        'model_cache': inference.cache_stats()
+    })
+
+
+@app.route('/metrics', methods=['GET'])
+def prometheus_metrics():
+    """Prometheus text-format metrics, aggregated across all workers"""
+    return inference.render_metrics(), 200, {'Content-Type': metrics.CONTENT_TYPE}
 
 
 @app.route('/invocations', methods=['POST'])
 def invocations():
     """
     Main inference endpoint
-    Expected POST body: JSON with prediction request
+    Expected POST body: JSON, x-npy or x-msgpack prediction request
+    (response format follows the Accept header, defaulting to the request's)
     """
+    start = time.perf_counter()
     try:
         # Parse request
         content_type = request.content_type or 'application/json'
-        input_data = inference.input_fn(request.data, content_type)
+        accept = inference.payloads.negotiate(request.headers.get('Accept'), content_type)
+        with metrics.timed("parse"):
+            input_data = inference.input_fn(request.data, content_type)
 
-        # Generate predictions
+        # Generate predictions (load/predict phases are timed per ticker)
         predictions = inference.predict_fn(input_data, model_path)
 
         # Format response
-        response = inference.output_fn(predictions, content_type)
+        with metrics.timed("serialize"):
+            response = inference.output_fn(predictions, accept)
 
-        return response, 200, {'Content-Type': 'application/json'}
+        metrics.REQUEST_LATENCY.labels("200").observe(time.perf_counter() - start)
+        inference.update_worker_metrics()
+        return response, 200, {'Content-Type': accept}
 
     except Exception as e:
+        metrics.REQUEST_LATENCY.labels("500").observe(time.perf_counter() - start)
         return jsonify({'error': str(e)}), 500
 
 
@@ -0,0 +1,111 @@
+"""
+Benchmark compiled (lleaves) inference against Booster.predict.
+
+Compiles a trained LightGBM model into a temporary directory, checks parity
+on split-boundary rows (plus the ticker's real feature rows when a dataset
+is available) and reports median predict latency for 1, 10 and 500 rows.
+
+Usage:
+    python3 scripts/benchmark_compiled_inference.py AAPL
+    python3 scripts/benchmark_compiled_inference.py JPM --model lgbm --repeats 500
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import joblib
+import lightgbm as lgb
+import numpy as np
+
+from src.models.compiled_booster import (
+    LLEAVES_AVAILABLE, PARITY_ATOL, compile_booster, parity_inputs, verify_parity
+)
+
+BATCH_SIZES = [1, 10, 500]
+
+
+def median_latency_ms(predict, X, repeats):
+    predict(X)  # warm-up
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        predict(X)
+        timings.append(time.perf_counter() - start)
+    return float(np.median(timings) * 1000)
+
+
+def real_rows(ticker, feature_names):
+    """Feature rows from the ticker's dataset, or None if unavailable."""
+    try:
+        from scripts.train_model import load_dataset
+        df = load_dataset(ticker)
+    except Exception as e:
+        print(f"  (no dataset for real-row parity: {e})")
+        return None
+
+    missing = [c for c in feature_names if c not in df.columns]
+    if missing:
+        print(f"  (dataset lacks {len(missing)} model features - skipping real rows)")
+        return None
+    return df[feature_names].to_numpy(dtype=np.float64)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compare compiled and LightGBM inference latency")
+    parser.add_argument("ticker", type=str)
+    parser.add_argument("--model", type=str, default="return",
+                        choices=["return", "lgbm"])
+    parser.add_argument("--repeats", type=int, default=200)
+    args = parser.parse_args()
+
+    if not LLEAVES_AVAILABLE:
+        raise SystemExit("lleaves is not installed (pip install lleaves)")
+
+    model_path = Path(f"models/{args.model}/{args.ticker.lower()}_{args.model}.pkl")
+    model = joblib.load(model_path)
+    booster = getattr(model, "model", None)
+    if not isinstance(booster, lgb.Booster):
+        raise SystemExit(f"{model_path} does not hold a LightGBM booster")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        start = time.perf_counter()
+        compiled = compile_booster(booster, Path(tmp) / "model.so")
+        compile_time = time.perf_counter() - start
+
+        print(f"\n{'='*64}")
+        print(f" COMPILED INFERENCE BENCHMARK: {args.ticker} | {args.model}")
+        print(f"{'='*64}")
+        print(f" Trees: {booster.num_trees()} | Features: {booster.num_feature()} "
+              f"| Compile: {compile_time:.1f}s")
+
+        synthetic_error = verify_parity(booster, compiled)
+        print(f" Parity (split boundaries): max |err| = {synthetic_error:.2e}")
+
+        X_real = real_rows(args.ticker, booster.feature_name())
+        if X_real is not None:
+            real_error = verify_parity(booster, compiled, X=X_real)
+            print(f" Parity ({len(X_real)} real rows):   max |err| = {real_error:.2e}")
+            synthetic_error = max(synthetic_error, real_error)
+
+        status = "PASS" if synthetic_error <= PARITY_ATOL else "FAIL"
+        print(f" Parity {status} (tolerance {PARITY_ATOL:.0e})")
+
+        print(f"\n{'Rows':>6} {'LightGBM (ms)':>15} {'Compiled (ms)':>15} {'Speedup':>9}")
+        print("-" * 64)
+
+        pool = parity_inputs(booster, n_rows=max(BATCH_SIZES), missing_rate=0.0)
+        for n_rows in BATCH_SIZES:
+            X = pool[:n_rows]
+            base_ms = median_latency_ms(booster.predict, X, args.repeats)
+            compiled_ms = median_latency_ms(compiled.predict, X, args.repeats)
+            print(f"{n_rows:>6} {base_ms:>15.3f} {compiled_ms:>15.3f} "
+                  f"{base_ms / compiled_ms:>8.1f}x")
+
+        print("-" * 64)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Check and time FinancialMetrics.evaluate_many against per-call evaluate.
+
+Scores K random -1/0/1 strategies on one synthetic forward-return series
+both ways, reports the largest per-metric difference and the speedup.
+
+Usage:
+    python3 scripts/benchmark_financial_metrics.py
+    python3 scripts/benchmark_financial_metrics.py --strategies 2000 --rows 5000
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from src.evaluation.financial_metrics import FinancialMetrics
+
+# Worst acceptable |evaluate_many - evaluate| (summation-order rounding only)
+TOLERANCE = 1e-9
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compare evaluate_many with per-call evaluate")
+    parser.add_argument("--strategies", type=int, default=500)
+    parser.add_argument("--rows", type=int, default=2500)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    forward_returns = rng.normal(0.0004, 0.015, args.rows)
+    forward_returns[rng.random(args.rows) < 0.01] = np.nan
+    y_true = np.sign(np.nan_to_num(forward_returns)).astype(int)
+
+    # Mix of sparse and dense traders, plus an all-flat strategy
+    activity = rng.uniform(0.0, 0.9, (args.strategies, 1))
+    preds = np.where(rng.random((args.strategies, args.rows)) < activity,
+                     rng.choice([-1, 1], (args.strategies, args.rows)), 0)
+    preds[0] = 0
+
+    evaluator = FinancialMetrics(transaction_cost_bps=10)
+
+    start = time.perf_counter()
+    per_call = [evaluator.evaluate(y_true, p, forward_returns).to_dict() for p in preds]
+    loop_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batched = evaluator.evaluate_many(preds, forward_returns, y_true=y_true)
+    batch_time = time.perf_counter() - start
+
+    print(f"\n{'='*60}")
+    print(f" FINANCIAL METRICS: {args.strategies} strategies x {args.rows} rows")
+    print(f"{'='*60}")
+    print(f"{'Metric':<20} {'Max |diff|':>14} {'Status':>8}")
+    print("-" * 60)
+
+    all_ok = True
+    for key, values in batched.items():
+        expected = np.array([m[key] for m in per_call], dtype=float)
+        actual = np.asarray(values, dtype=float)
+        same_special = (np.isnan(expected) & np.isnan(actual)) | (expected == actual)
+        diff = np.where(same_special, 0.0, np.abs(expected - actual))
+        max_diff = float(np.max(diff))
+        ok = max_diff <= TOLERANCE
+        all_ok &= ok
+        print(f"{key:<20} {max_diff:>14.2e} {'OK' if ok else 'FAIL':>8}")
+
+    print("-" * 60)
+    print(f" Per-call: {loop_time*1000:.1f} ms | evaluate_many: {batch_time*1000:.1f} ms "
+          f"| {loop_time / batch_time:.1f}x")
+    print(f" Parity: {'PASS' if all_ok else 'FAIL'}")
+
+
+if __name__ == "__main__":
+    main()
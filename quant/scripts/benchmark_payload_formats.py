@@ -0,0 +1,89 @@
+"""
+Compare /invocations payload formats for a daily batch request.
+
+Encodes a synthetic (tickers x features) request and a matching response
+as JSON, x-npy and x-msgpack, and reports body size plus server-side
+parse (request) and serialize (response) time per format. Decoded feature
+matrices are checked against the float32 source.
+
+Usage:
+    python3 scripts/benchmark_payload_formats.py
+    python3 scripts/benchmark_payload_formats.py --tickers 500 --features 120
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# SageMaker serving modules are flat files next to inference.py
+sys.path.insert(0, str(Path(__file__).parent.parent / "sagemaker"))
+
+import payloads  # noqa: E402
+
+
+def best_time(fn, repeats):
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark /invocations payload formats")
+    parser.add_argument("--tickers", type=int, default=500)
+    parser.add_argument("--features", type=int, default=100)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    tickers = [f"T{i:04d}" for i in range(args.tickers)]
+    # Lambda sends the latest feature row per ticker, as float64 lists in JSON
+    matrix = rng.normal(0, 1, (args.tickers, args.features)).astype(np.float32)
+    features = {t: matrix[i:i + 1].astype(np.float64) for i, t in enumerate(tickers)}
+
+    probas = rng.dirichlet(np.ones(3), args.tickers)
+    predictions = {
+        t: {"class": np.array([int(np.argmax(p)) - 1]), "probabilities": p[None, :]}
+        for t, p in zip(tickers, probas)
+    }
+
+    formats = [payloads.JSON, payloads.NPY]
+    if payloads.MSGPACK_AVAILABLE:
+        formats.append(payloads.MSGPACK)
+    else:
+        print("msgpack not installed - skipping application/x-msgpack")
+
+    print(f"\n{'='*78}")
+    print(f" PAYLOAD FORMATS: {args.tickers} tickers x {args.features} features")
+    print(f"{'='*78}")
+    print(f"{'Format':<24} {'Request':>10} {'Parse':>10} {'Response':>10} "
+          f"{'Serialize':>10} {'Max |err|':>10}")
+    print("-" * 78)
+
+    for fmt in formats:
+        body = payloads.encode_request(features, fmt)
+        parse = best_time(lambda: payloads.decode_request(body, fmt), args.repeats)
+
+        decoded = payloads.decode_request(body, fmt)
+        rebuilt = np.vstack([np.asarray(decoded["features"][t]) for t in tickers])
+        error = float(np.max(np.abs(rebuilt - matrix)))
+
+        response = payloads.encode_response(predictions, fmt)
+        serialize = best_time(lambda: payloads.encode_response(predictions, fmt),
+                              args.repeats)
+
+        print(f"{fmt:<24} {len(body)/1024:>8.0f}KB {parse*1000:>8.2f}ms "
+              f"{len(response)/1024:>8.0f}KB {serialize*1000:>8.2f}ms {error:>10.1e}")
+
+    print("-" * 78)
+    print(" Parse/serialize: best of --repeats, server side only")
+
+
+if __name__ == "__main__":
+    main()
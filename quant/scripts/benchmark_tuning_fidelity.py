@@ -0,0 +1,147 @@
+"""
+Benchmark multi-fidelity tuning against the full-fidelity search.
+
+Runs the same tuner on one ticker with full-data trials, recent-window rungs
+and row-subsample rungs, and reports wall time plus the chosen params'
+full-data validation score and test score. The test score comes from the
+model train_model.py would deploy: fit on the full training window with
+early stopping on the validation split, then scored once on the held-out
+test split.
+
+Usage:
+    python3 scripts/benchmark_tuning_fidelity.py AAPL
+    python3 scripts/benchmark_tuning_fidelity.py JPM --model return --trials 40
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import optuna
+from sklearn.metrics import f1_score
+
+# Shared data/label helpers live in train_model.py next to this script
+sys.path.insert(0, str(Path(__file__).parent))
+
+from train_model import (  # noqa: E402
+    FORWARD_PERIODS, generate_labels, hybrid_balance, load_dataset,
+    select_feature_columns, time_split_with_embargo
+)
+from src.evaluation.regime_detector import RegimeDetector
+from src.models.base.lgbm_classifier import LGBMClassifier
+from src.models.base.lgbm_return_predictor import LGBMReturnPredictor
+from src.models.base.xgb_classifier import XGBClassifier
+from src.models.lgbm_hyperparameter_tuner import LightGBMHyperparameterTuner
+from src.models.lgbm_return_tuner import LGBMReturnTuner
+from src.models.xgb_hyperparameter_tuner import XGBHyperparameterTuner
+
+optuna.logging.set_verbosity(optuna.logging.WARNING)
+
+MODES = [None, "window", "rows"]
+
+
+def load_split(ticker):
+    df = load_dataset(ticker)
+    df = RegimeDetector().detect_regimes(df)
+    df = generate_labels(df, mode="multiclass")
+
+    feature_cols = select_feature_columns(df)
+    df_clean = df.dropna(subset=feature_cols + ["label"])
+
+    X = df_clean[feature_cols]
+    y = df_clean["label"]
+    forward_returns = df_clean["forward_ret"].values
+
+    return time_split_with_embargo(X, y, forward_returns, embargo_periods=FORWARD_PERIODS)
+
+
+def make_tuner(model, n_trials, multi_fidelity):
+    if model == "lgbm":
+        return LightGBMHyperparameterTuner(
+            n_trials=n_trials, multi_fidelity=multi_fidelity)
+    if model == "xgb":
+        return XGBHyperparameterTuner(
+            n_trials=n_trials, multi_fidelity=multi_fidelity)
+    return LGBMReturnTuner(
+        n_trials=n_trials, forward_periods=FORWARD_PERIODS,
+        multi_fidelity=multi_fidelity)
+
+
+def test_score(model, tuner, tuned, train_args, val_args, test_args):
+    """
+    Score the deployable model for the tuned params on the test split.
+    Early stopping uses the validation split only.
+    """
+    X_test, y_test = test_args
+    if model == "return":
+        best_params, threshold_scale = tuned
+        predictor = LGBMReturnPredictor()
+        predictor.params.update(best_params)
+        predictor.threshold_scale = threshold_scale
+        predictor.fit(*train_args, *val_args)
+        return tuner._strategy_sharpe(
+            predictor.predict_returns(X_test), y_test, threshold_scale)
+
+    cls = LGBMClassifier if model == "lgbm" else XGBClassifier
+    classifier = cls(params=tuned)
+    classifier.fit(*train_args, *val_args)
+    return f1_score(y_test, classifier.predict(X_test), average="macro", zero_division=0)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compare full-fidelity and multi-fidelity tuning")
+    parser.add_argument("ticker", type=str)
+    parser.add_argument("--model", type=str, default="lgbm",
+                        choices=["lgbm", "xgb", "return"])
+    parser.add_argument("--trials", type=int, default=40)
+    args = parser.parse_args()
+
+    (
+        X_train, X_val, X_test,
+        y_train, y_val, y_test,
+        fwd_ret_train, fwd_ret_val, fwd_ret_test
+    ) = load_split(args.ticker)
+
+    if args.model == "return":
+        train_args = (X_train, fwd_ret_train)
+        val_args, test_args = (X_val, fwd_ret_val), (X_test, fwd_ret_test)
+    else:
+        Xb, yb = hybrid_balance(X_train, y_train)
+        train_args = (Xb, yb)
+        val_args, test_args = (X_val, y_val), (X_test, y_test)
+
+    metric = "Sharpe" if args.model == "return" else "Macro-F1"
+
+    print(f"\n{'='*78}")
+    print(f" TUNING FIDELITY BENCHMARK: {args.ticker} | {args.model} | {args.trials} trials")
+    print(f"{'='*78}")
+    print(f"{'Mode':<10} {'Time (s)':>10} {'Speedup':>9} "
+          f"{'Val ' + metric:>14} {'Test ' + metric:>15}")
+    print("-" * 78)
+
+    baseline_time = None
+    for mode in MODES:
+        tuner = make_tuner(args.model, args.trials, mode)
+
+        start = time.perf_counter()
+        tuned = tuner.tune(*train_args, *val_args)
+        elapsed = time.perf_counter() - start
+        baseline_time = baseline_time or elapsed
+
+        # Re-score the chosen params on full data so every mode is comparable
+        val_score = tuner.objective(
+            optuna.trial.FixedTrial(tuner.best_trial_params), *train_args, *val_args)
+        if hasattr(tuner, "_prepared"):
+            tuner._prepared.clear()
+        score = test_score(args.model, tuner, tuned, train_args, val_args, test_args)
+
+        print(f"{mode or 'full':<10} {elapsed:>10.1f} {baseline_time / elapsed:>8.2f}x "
+              f"{val_score:>14.4f} {score:>15.4f}")
+
+    print("-" * 78)
+
+
+if __name__ == "__main__":
+    main()
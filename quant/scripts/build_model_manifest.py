@@ -0,0 +1,90 @@
+"""
+Publish a model set under a new version and write the manifest the
+inference server watches.
+
+Hashes every *_return.pkl / *_lgbm.pkl in the source directory, copies the
+changed ones (with any compiled sidecars) into <model_dir>/<version>/ and
+writes manifest.json atomically last. Unchanged tickers keep serving the
+file they already had; old version directories are deleted once they drop
+out of the last --keep versions. The endpoint picks up the new version on
+its next poll and reloads only the tickers whose artifact hash changed.
+
+Usage:
+    python3 scripts/build_model_manifest.py sagemaker/models/ --source models/return/
+    python3 scripts/build_model_manifest.py /mnt/models --source new_models/ --version 2025-01-14
+    python3 scripts/build_model_manifest.py /mnt/models --source new_models/ --dry-run
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# SageMaker serving modules are flat files next to inference.py
+sys.path.insert(0, str(Path(__file__).parent.parent / "sagemaker"))
+
+import model_manifest  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the model manifest for hot reloads")
+    parser.add_argument("model_dir", help="Model directory the endpoint serves")
+    parser.add_argument("--source", default=None,
+                        help="Directory with the new artifacts (default: model_dir itself)")
+    parser.add_argument("--version", default=None,
+                        help="Manifest version (default: UTC timestamp)")
+    parser.add_argument("--keep", type=int, default=3,
+                        help="Previous versions whose files are kept (default 3)")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="Report changes without writing the manifest")
+    args = parser.parse_args()
+
+    model_dir = Path(args.model_dir)
+    source_dir = Path(args.source) if args.source else model_dir
+    for directory in (model_dir, source_dir):
+        if not directory.is_dir():
+            parser.error(f"{directory} is not a directory")
+
+    manifest_path = model_dir / model_manifest.MANIFEST_NAME
+    previous = model_manifest.read_manifest(manifest_path)
+    try:
+        manifest = model_manifest.build_manifest(
+            source_dir, version=args.version, previous=previous)
+    except ValueError as e:
+        parser.error(str(e))
+
+    if not manifest["models"]:
+        print(f"No model artifacts found in {source_dir}")
+        sys.exit(1)
+
+    changed, removed = model_manifest.diff_manifests(previous, manifest)
+    print(f"Manifest {manifest['version']}: {len(manifest['models'])} models")
+    if previous is not None:
+        print(f"  vs {previous.get('version')}: {len(changed)} changed/added, "
+              f"{len(removed)} removed")
+        for ticker in changed:
+            print(f"    ~ {ticker}")
+        for ticker in removed:
+            print(f"    - {ticker}")
+
+    if args.dry_run:
+        return
+
+    if previous is not None and not changed and not removed:
+        print("No artifact changes - manifest left as is")
+        return
+
+    try:
+        removed_versions = model_manifest.publish(
+            manifest, source_dir, model_dir, previous=previous, keep=args.keep)
+    except ValueError as e:
+        parser.error(str(e))
+    published = [t for t, entry in manifest["models"].items()
+                 if entry["file"].startswith(f"{manifest['version']}/")]
+    print(f"Published {len(published)} artifacts to {model_dir / manifest['version']}")
+    print(f"Wrote {manifest_path}")
+    if removed_versions:
+        print(f"Removed old versions: {', '.join(removed_versions)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -59,123 +59,142 @@ def safe_f1(y_true, y_pred):
 # ================================================================
 # Trading engine
 # ================================================================
-def simulate_trading(df, probas, long_thresh, short_thresh, min_edge=0.05, cost_bps=1.0):
-    """
-    probas: array (N, 3) for multiclass or (N, 2) for binary
-    df: must contain "return_at_label"
-    """
+LONG_GRID = [0.55, 0.60, 0.65, 0.70]
+SHORT_GRID = [0.55, 0.60, 0.65, 0.70]
+EDGE_GRID = [0.05, 0.08, 0.10, 0.12]
 
-    returns = df["return_at_label"].values
-    n = len(returns)
 
-    # Identify labels from proba shape
-    multiclass = (probas.shape[1] == 3)
+def simulate_trading_grid(returns, probas, long_threshs, short_threshs, min_edges,
+                          cost_bps=1.0):
+    """
+    Evaluate every (long_thresh, short_thresh, min_edge) combination with
+    broadcast passes over the probability matrix, one long threshold at a
+    time so peak memory is a single (short, edge, row) slice.
 
-    if multiclass:
-        p_down = probas[:, 0]
-        p_flat = probas[:, 1]
-        p_up = probas[:, 2]
+    Rule per row: long if p_up - p_down >= min_edge and p_up >= long_thresh,
+    else short if p_down - p_up >= min_edge and p_down >= short_thresh.
 
-        edges_up = p_up - p_down
-        edges_dn = p_down - p_up
-    else:
-        p_down = probas[:, 0]
-        p_up = probas[:, 1]
-        edges_up = p_up - p_down
-        edges_dn = p_down - p_up
-
-    positions = []
-    realized_rets = []
-    gross = []
-    costs = []
-
-    for i in range(n):
-        e_up = edges_up[i]
-        e_dn = edges_dn[i]
-
-        if e_up >= min_edge and p_up[i] >= long_thresh:
-            pos = 1
-        elif e_dn >= min_edge and p_down[i] >= short_thresh:
-            pos = -1
-        else:
-            pos = 0
-
-        positions.append(pos)
-
-        if pos != 0:
-            trade_ret = pos * returns[i]
-            cost = abs(pos) * cost_bps * 0.0001
-            realized_rets.append(trade_ret - cost)
-            gross.append(trade_ret)
-            costs.append(cost)
-
-    if len(realized_rets) == 0:
-        return {
-            "n_positions": 0,
-            "n_trades": 0,
-            "hit_rate": 0.0,
-            "avg_ret": 0.0,
-            "std_ret": 0.0,
-            "sharpe": 0.0,
-            "gross_mean": 0.0,
-            "cost_mean": 0.0,
-        }
-
-    arr = np.array(realized_rets)
-    gross_arr = np.array(gross)
-    cost_arr = np.array(costs)
+    probas: array (N, 3) for multiclass or (N, 2) for binary
+    returns: array (N,) of returns realized by a position at each row
+
+    Returns:
+        dict of arrays shaped (len(long_threshs), len(short_threshs),
+        len(min_edges)): n_trades, hit_rate, avg_ret, std_ret, sharpe,
+        gross_mean, cost_mean
+    """
+    returns = np.asarray(returns, dtype=float)
+    p_down = probas[:, 0]
+    p_up = probas[:, -1]  # column 2 (multiclass) or 1 (binary)
+    edges_up = p_up - p_down
+    edges_dn = p_down - p_up
+
+    # Slice axes: (short, edge, row)
+    S = np.asarray(short_threshs, dtype=float)[:, None, None]
+    E = np.asarray(min_edges, dtype=float)[None, :, None]
+    cost = cost_bps * 0.0001
+
+    # Short candidates do not depend on the long threshold
+    short_ok = (edges_dn >= E) & (p_down >= S)
+    edge_up_ok = edges_up >= E
+
+    slices = []
+    for long_thresh in long_threshs:
+        go_long = edge_up_ok & (p_up >= long_thresh)
+        positions = go_long.astype(np.int8) - (~go_long & short_ok).astype(np.int8)
+
+        traded = positions != 0
+        n_trades = traded.sum(axis=-1)
+        safe_n = np.maximum(n_trades, 1)
+
+        gross = positions * returns
+        realized = np.where(traded, gross - cost, 0.0)
+
+        avg_ret = realized.sum(axis=-1) / safe_n
+        deviations = np.where(traded, realized - avg_ret[..., None], 0.0)
+        std_ret = np.sqrt((deviations ** 2).sum(axis=-1) / safe_n)
+
+        slices.append({
+            "n_trades": n_trades,
+            "n_wins": (realized > 0).sum(axis=-1),
+            "avg_ret": avg_ret,
+            "std_ret": std_ret,
+            "gross_sum": gross.sum(axis=-1),
+        })
+
+    n_trades = np.stack([sl["n_trades"] for sl in slices])
+    avg_ret = np.stack([sl["avg_ret"] for sl in slices])
+    std_ret = np.stack([sl["std_ret"] for sl in slices])
+    safe_n = np.maximum(n_trades, 1)
 
     # annualize assuming 252 trading days
-    if arr.std() == 0:
-        sharpe = 0.0
-    else:
-        sharpe = (arr.mean() * 252) / (arr.std() * np.sqrt(252))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sharpe = np.where(std_ret > 0, (avg_ret * 252) / (std_ret * np.sqrt(252)), 0.0)
 
+    has_trades = n_trades > 0
     return {
-        "n_positions": len(positions),
-        "n_trades": len(arr),
-        "hit_rate": (arr > 0).mean(),
-        "avg_ret": arr.mean(),
-        "std_ret": arr.std(),
+        "n_trades": n_trades,
+        "hit_rate": np.where(has_trades, np.stack([sl["n_wins"] for sl in slices]) / safe_n, 0.0),
+        "avg_ret": avg_ret,
+        "std_ret": std_ret,
         "sharpe": sharpe,
-        "gross_mean": gross_arr.mean(),
-        "cost_mean": cost_arr.mean(),
+        "gross_mean": np.stack([sl["gross_sum"] for sl in slices]) / safe_n,
+        "cost_mean": np.where(has_trades, cost, 0.0),
     }
 
 
+def _grid_cell_stats(grid, index, n_positions):
+    stats = {"n_positions": n_positions}
+    for key, values in grid.items():
+        value = values[index]
+        stats[key] = int(value) if key == "n_trades" else float(value)
+    return stats
+
+
+def simulate_trading(df, probas, long_thresh, short_thresh, min_edge=0.05, cost_bps=1.0):
+    """
+    probas: array (N, 3) for multiclass or (N, 2) for binary
+    df: must contain "return_at_label"
+    """
+    returns = df["return_at_label"].values
+    grid = simulate_trading_grid(
+        returns, probas, [long_thresh], [short_thresh], [min_edge], cost_bps=cost_bps)
+
+    stats = _grid_cell_stats(grid, (0, 0, 0), len(returns))
+    if stats["n_trades"] == 0:
+        stats["n_positions"] = 0
+    return stats
+
+
 # ================================================================
 # Threshold sweep
 # ================================================================
-def sweep_thresholds(df, probas):
-    grid = [0.55, 0.60, 0.65, 0.70]
-    best = None
-    best_key = None
-
-    for long_t in grid:
-        for short_t in grid:
-            for edge in [0.05, 0.08, 0.10, 0.12]:
-                stats = simulate_trading(
-                    df, probas,
-                    long_thresh=long_t,
-                    short_thresh=short_t,
-                    min_edge=edge
-                )
-                sharpe = stats["sharpe"]
-
-                if (best is None) or (sharpe > best["sharpe"]):
-                    best = stats
-                    best_key = (long_t, short_t, edge)
+def sweep_thresholds(df, probas, long_grid=None, short_grid=None, edge_grid=None):
+    """
+    Best (long, short, edge) thresholds by Sharpe over the full grid
+    (first cell in long/short/edge order wins ties).
+    """
+    long_grid = LONG_GRID if long_grid is None else long_grid
+    short_grid = SHORT_GRID if short_grid is None else short_grid
+    edge_grid = EDGE_GRID if edge_grid is None else edge_grid
 
+    returns = df["return_at_label"].values
+    grid = simulate_trading_grid(returns, probas, long_grid, short_grid, edge_grid)
+
+    index = np.unravel_index(np.argmax(grid["sharpe"]), grid["sharpe"].shape)
+    best = _grid_cell_stats(grid, index, len(returns))
+    if best["n_trades"] == 0:
+        best["n_positions"] = 0
+
+    best_key = (long_grid[index[0]], short_grid[index[1]], edge_grid[index[2]])
     return best_key, best
 
 
 # ================================================================
 # Evaluate classification + trading
 # ================================================================
-def evaluate_model(model, df_test, X_test, y_test):
+def evaluate_model(model, df_test, X_test, y_test, grid_points=0):
     print("\n--- Predicting probabilities ---")
-    probas = model.predict_proba(X_test)
-    preds = model.predict(X_test)
+    preds, probas = model.predict_with_proba(X_test)
 
     # ------------------------------------------------------------
     # Classification Metrics
@@ -205,7 +224,13 @@ def evaluate_model(model, df_test, X_test, y_test):
     # Trading Simulation
     # ------------------------------------------------------------
     print("\n--- Optimizing thresholds ---")
-    best_key, best_stats = sweep_thresholds(df_test, probas)
+    if grid_points > 0:
+        thresh_grid = np.round(np.linspace(0.40, 0.80, grid_points), 4).tolist()
+        edge_grid = np.round(np.linspace(0.0, 0.20, grid_points), 4).tolist()
+        best_key, best_stats = sweep_thresholds(
+            df_test, probas, thresh_grid, thresh_grid, edge_grid)
+    else:
+        best_key, best_stats = sweep_thresholds(df_test, probas)
 
     long_t, short_t, edge = best_key
     print(
@@ -292,6 +317,9 @@ def main():
     p.add_argument("--model", type=str, default="ensemble",
                    choices=["ensemble", "lgbm", "xgb"])
     p.add_argument("--binary", action="store_true")
+    p.add_argument("--grid-points", type=int, default=0,
+                   help="Points per threshold axis for a dense sweep "
+                        "(default: the standard 4x4x4 grid)")
     args = p.parse_args()
 
     ticker = args.ticker.upper()
@@ -311,7 +339,8 @@ def main():
     df_test, X_test, y_test = load_test_data(ticker, label_mode=label_mode)
 
     # Evaluate
-    results = evaluate_model(model, df_test, X_test, y_test)
+    results = evaluate_model(model, df_test, X_test, y_test,
+                             grid_points=args.grid_points)
 
     print("\n🎉 Evaluation complete.\n")
 
@@ -332,8 +332,7 @@ def predict_single_ticker(ticker, model_path=None, show_details=True):
 
     # Make predictions
     print("\n📊 Making predictions...")
-    predictions = model.predict(X)
-    probabilities = model.predict_proba(X)
+    predictions, probabilities = model.predict_with_proba(X)
 
     # Show summary
     unique, counts = np.unique(predictions, return_counts=True)
@@ -0,0 +1,142 @@
+"""
+Load-test a running inference server (local container or `serve`).
+
+Sends concurrent batch /invocations requests with synthetic feature rows
+and reports latency percentiles and throughput. /ping is polled alongside
+the load so a blocked health check shows up.
+
+Usage:
+    docker run -p 8080:8080 marketminute-sagemaker
+    python3 scripts/load_test_endpoint.py --tickers AAPL,MSFT,NVDA --n-features 95
+    python3 scripts/load_test_endpoint.py --model-dir models/ --concurrency 16 \\
+        --requests 500 --format application/x-npy
+"""
+
+import argparse
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+# SageMaker serving modules are flat files next to inference.py
+sys.path.insert(0, str(Path(__file__).parent.parent / "sagemaker"))
+
+import model_manifest  # noqa: E402
+import payloads  # noqa: E402
+
+
+def timed_request(url, body=None, content_type=None, accept=None, timeout=60):
+    """(seconds, HTTP status) for one request; status 0 on connection errors."""
+    headers = {}
+    if content_type:
+        headers["Content-Type"] = content_type
+    if accept:
+        headers["Accept"] = accept
+    req = urllib.request.Request(url, data=body, headers=headers)
+
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(req, timeout=timeout) as resp:
+            resp.read()
+            status = resp.status
+    except urllib.error.HTTPError as e:
+        status = e.code
+    except (urllib.error.URLError, OSError):
+        status = 0
+    return time.perf_counter() - start, status
+
+
+def summarize(name, latencies):
+    ms = np.asarray(latencies) * 1000
+    if len(ms) == 0:
+        return f"{name:<12} no samples"
+    p50, p90, p99 = np.percentile(ms, [50, 90, 99])
+    return (f"{name:<12} n={len(ms):<6} p50={p50:8.1f}ms  p90={p90:8.1f}ms  "
+            f"p99={p99:8.1f}ms  max={ms.max():8.1f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test the inference endpoint")
+    parser.add_argument("--url", default="http://localhost:8080")
+    parser.add_argument("--tickers", default=None, help="Comma-separated tickers")
+    parser.add_argument("--model-dir", default=None,
+                        help="Use every ticker with a model in this directory")
+    parser.add_argument("--batch-size", type=int, default=0,
+                        help="Tickers per request (0 = all)")
+    parser.add_argument("--n-features", type=int, default=95,
+                        help="Feature columns the models expect")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--format", default=payloads.JSON, choices=payloads.CONTENT_TYPES)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    if args.tickers:
+        tickers = [t.strip() for t in args.tickers.split(",") if t.strip()]
+    elif args.model_dir:
+        tickers = model_manifest.served_tickers(args.model_dir)
+    else:
+        parser.error("pass --tickers or --model-dir")
+    if args.batch_size:
+        tickers = tickers[:args.batch_size]
+
+    rng = np.random.default_rng(args.seed)
+    features = {t: rng.normal(0, 1, (1, args.n_features)) for t in tickers}
+    body = payloads.encode_request(features, args.format)
+    if isinstance(body, str):
+        body = body.encode()
+
+    invocations_url = args.url.rstrip("/") + "/invocations"
+    ping_url = args.url.rstrip("/") + "/ping"
+
+    _, status = timed_request(ping_url)
+    if status != 200:
+        print(f"/ping returned {status or 'no response'} - is the server up and warm?")
+        return
+
+    # Poll /ping while the load runs
+    ping_latencies = []
+    done = threading.Event()
+
+    def poll_ping():
+        while not done.is_set():
+            elapsed, _ = timed_request(ping_url)
+            ping_latencies.append(elapsed)
+            time.sleep(0.05)
+
+    pinger = threading.Thread(target=poll_ping, daemon=True)
+    pinger.start()
+
+    def invoke(_):
+        return timed_request(invocations_url, body, args.format, args.format)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        results = list(pool.map(invoke, range(args.requests)))
+    wall = time.perf_counter() - start
+
+    done.set()
+    pinger.join()
+
+    ok = [elapsed for elapsed, status in results if status == 200]
+    failed = len(results) - len(ok)
+
+    print(f"\n{'='*78}")
+    print(f" LOAD TEST: {args.requests} requests x {len(tickers)} tickers, "
+          f"concurrency {args.concurrency}, {args.format}")
+    print(f"{'='*78}")
+    print(summarize("invocations", ok))
+    print(summarize("ping", ping_latencies))
+    print("-" * 78)
+    print(f" Throughput: {len(ok) / wall:.1f} req/s "
+          f"({len(ok) * len(tickers) / wall:.0f} ticker predictions/s)")
+    print(f" Request body: {len(body)/1024:.0f}KB | Failed: {failed}")
+
+
+if __name__ == "__main__":
+    main()
@@ -43,12 +43,22 @@ from src.models.lgbm_hyperparameter_tuner import LightGBMHyperparameterTuner
 from src.models.xgb_hyperparameter_tuner import XGBHyperparameterTuner
 from src.models.regime_aware_tuner import RegimeAwareHyperparameterTuner, RegimeAwareXGBTuner
 from src.models.lgbm_return_tuner import LGBMReturnTuner
+from src.models.param_history import TuningParamHistory, return_profile
 
+from src.evaluation.bootstrap import StrategyBootstrap
 from src.evaluation.financial_metrics import FinancialMetrics
 from src.evaluation.regime_detector import RegimeDetector
 
 FORWARD_PERIODS = 10
 
+# Tuners supporting the successive-halving multi-fidelity search
+MULTI_FIDELITY_TUNERS = ("lgbm", "xgb", "return")
+
+# Deployability gate: point estimates, plus 90% bootstrap lower bounds when
+# available (a single test split is too noisy to trust point values alone)
+DEPLOY_SHARPE, DEPLOY_PF = 1.0, 1.5
+DEPLOY_SHARPE_LOWER, DEPLOY_PF_LOWER = 0.5, 1.2
+
 
 def hybrid_balance(X, y, multiplier=1.4):
     df = X.copy()
@@ -235,24 +245,102 @@ def time_split(X, y):
     return X_train, X_val, X_test, y_train, y_val, y_test
 
 
+def study_options(tuning_config, tuner_key, n_trials):
+    """
+    Trial budget, storage, worker and warm-start kwargs for a tuner.
+
+    With a study dir every (ticker, split, tuner) gets its own study file so
+    reruns resume it. With a param history the best params of similar
+    tickers (never the ticker itself) are enqueued first and the budget drops
+    to ``warm_start_trials``.
+    """
+    options = {
+        "n_trials": n_trials,
+        "n_workers": tuning_config.get("tune_workers", 1),
+        "pruner": tuning_config.get("pruner", "none"),
+    }
+
+    history = tuning_config.get("param_history")
+    if history is not None:
+        seeds = history.seeds(
+            tuner_key,
+            profile=tuning_config.get("profile"),
+            sector=tuning_config.get("sector"),
+            exclude=tuning_config.get("ticker"),
+            k=tuning_config.get("warm_start_seeds", 3)
+        )
+        if seeds:
+            options["seed_params"] = seeds
+            options["n_trials"] = min(
+                n_trials, tuning_config.get("warm_start_trials", n_trials))
+
+    multi_fidelity = tuning_config.get("multi_fidelity")
+    if multi_fidelity and tuner_key in MULTI_FIDELITY_TUNERS:
+        options["multi_fidelity"] = multi_fidelity
+
+    study_dir = tuning_config.get("study_dir")
+    if study_dir:
+        study_name = f"{tuning_config.get('study_key', 'default')}_{tuner_key}"
+        if "multi_fidelity" in options:
+            # Low-fidelity trial scores are not comparable with full-data ones
+            study_name += f"_mf{options['multi_fidelity']}"
+        suffix = ".log" if tuning_config.get("study_backend") == "journal" else ".db"
+        options["storage"] = str(Path(study_dir) / f"{study_name}{suffix}")
+        options["study_name"] = study_name
+
+    return options
+
+
+def record_tuned_params(tuning_config, tuner_key, tuner):
+    """Add a finished study's best params to the cross-ticker history."""
+    history = tuning_config.get("param_history")
+    ticker = tuning_config.get("ticker")
+    if history is None or ticker is None or tuner.study is None:
+        return
+    if not tuning_config.get("record_params", True):
+        return
+
+    # Multi-fidelity winners are picked on full data, not from the study
+    params = getattr(tuner, "best_trial_params", None) or tuner.study.best_params
+    score = getattr(tuner, "best_score", None)
+    if score is None:
+        score = tuner.study.best_value
+
+    history.record(
+        ticker, tuner_key, params, score,
+        profile=tuning_config.get("profile"),
+        sector=tuning_config.get("sector")
+    )
+
+
 def train_model(
     model_type,
     X_train, y_train,
     X_val, y_val,
     use_tuning=False,
     regime_labels_val=None,
-    adaptive_threshold=None
+    adaptive_threshold=None,
+    tuning_config=None
 ):
+    tuning_config = tuning_config or {}
+    dataset_cache_dir = tuning_config.get("dataset_cache_dir")
+
     if model_type == "lgbm":
         if use_tuning:
             if regime_labels_val is not None:
                 tuner = RegimeAwareHyperparameterTuner(
-                    n_trials=40, regime_weight=0.6)
+                    regime_weight=0.6,
+                    dataset_cache_dir=dataset_cache_dir,
+                    **study_options(tuning_config, "lgbm_regime", n_trials=40))
                 params = tuner.tune(X_train, y_train, X_val,
                                     y_val, regime_labels_val)
+                record_tuned_params(tuning_config, "lgbm_regime", tuner)
             else:
-                tuner = LightGBMHyperparameterTuner(n_trials=40)
+                tuner = LightGBMHyperparameterTuner(
+                    dataset_cache_dir=dataset_cache_dir,
+                    **study_options(tuning_config, "lgbm", n_trials=40))
                 params = tuner.tune(X_train, y_train, X_val, y_val)
+                record_tuned_params(tuning_config, "lgbm", tuner)
         else:
             params = None
 
@@ -263,12 +351,17 @@ def train_model(
     elif model_type == "xgb":
         if use_tuning:
             if regime_labels_val is not None:
-                tuner = RegimeAwareXGBTuner(n_trials=40, regime_weight=0.6)
+                tuner = RegimeAwareXGBTuner(
+                    regime_weight=0.6,
+                    **study_options(tuning_config, "xgb_regime", n_trials=40))
                 params = tuner.tune(X_train, y_train, X_val,
                                     y_val, regime_labels_val)
+                record_tuned_params(tuning_config, "xgb_regime", tuner)
             else:
-                tuner = XGBHyperparameterTuner(n_trials=40)
+                tuner = XGBHyperparameterTuner(
+                    **study_options(tuning_config, "xgb", n_trials=40))
                 params = tuner.tune(X_train, y_train, X_val, y_val)
+                record_tuned_params(tuning_config, "xgb", tuner)
         else:
             params = None
 
@@ -279,12 +372,14 @@ def train_model(
     elif model_type == "return":
         if use_tuning:
             tuner = LGBMReturnTuner(
-                n_trials=30,
                 forward_periods=FORWARD_PERIODS,
-                transaction_cost_bps=10.0
+                transaction_cost_bps=10.0,
+                dataset_cache_dir=dataset_cache_dir,
+                **study_options(tuning_config, "return", n_trials=30)
             )
             best_params, threshold_scale = tuner.tune(
                 X_train, y_train, X_val, y_val)
+            record_tuned_params(tuning_config, "return", tuner)
             model = LGBMReturnPredictor()
             model.params.update(best_params)
             model.threshold_scale = threshold_scale
@@ -327,6 +422,18 @@ def save_artifact(model, ticker, model_type, metrics=None):
         save_model_metadata(ticker, model_type, metrics)
 
 
+def bootstrap_metrics(fin_evaluator, y_pred, forward_returns):
+    """Block-bootstrap CI bounds for Sharpe and profit factor, as metric keys."""
+    cis = StrategyBootstrap(evaluator=fin_evaluator).run(
+        y_pred, forward_returns, holding_period=FORWARD_PERIODS)
+    return {
+        "sharpe_ci_lower": cis["sharpe_ratio"].lower,
+        "sharpe_ci_upper": cis["sharpe_ratio"].upper,
+        "pf_ci_lower": cis["profit_factor"].lower,
+        "pf_ci_upper": cis["profit_factor"].upper,
+    }
+
+
 def save_model_metadata(ticker, model_type, metrics):
     import json
 
@@ -354,13 +461,37 @@ def save_model_metadata(ticker, model_type, metrics):
     sharpe = round(float(to_native(metrics.get('sharpe_ratio', 0))), 2)
     pf_value = round(float(pf), 2) if pf is not None else None
 
+    def finite_or_none(key):
+        val = to_native(metrics.get(key))
+        if val is None or not np.isfinite(val):
+            return None
+        return round(float(val), 2)
+
+    sharpe_lower = finite_or_none('sharpe_ci_lower')
+    pf_lower = finite_or_none('pf_ci_lower')
+    # A non-finite PF bound (resamples without a losing trade) fails the CI gates
+    has_ci = sharpe_lower is not None and metrics.get('pf_ci_lower') is not None
+
     is_deployable = (
-        sharpe > 1.0 and
+        sharpe > DEPLOY_SHARPE and
         pf_value is not None and
-        pf_value > 1.5
+        pf_value > DEPLOY_PF
     )
+    if has_ci:
+        is_deployable = (
+            is_deployable and
+            sharpe_lower > DEPLOY_SHARPE_LOWER and
+            pf_lower is not None and
+            pf_lower > DEPLOY_PF_LOWER
+        )
+
+    if has_ci:
+        is_excellent = (sharpe_lower > DEPLOY_SHARPE and
+                        pf_lower is not None and pf_lower > DEPLOY_PF)
+    else:
+        is_excellent = sharpe > 5.0 and (pf_value or 0) > 3.0
 
-    if is_deployable and sharpe > 5.0 and (pf_value or 0) > 3.0:
+    if is_deployable and is_excellent:
         quality_tier = "excellent"
     elif is_deployable:
         quality_tier = "good"
@@ -383,6 +514,8 @@ def save_model_metadata(ticker, model_type, metrics):
         "max_drawdown": round(float(to_native(metrics.get('max_drawdown', 0))), 4),
         "total_return": round(float(to_native(metrics.get('total_return', 0))), 4),
         "samples": int(to_native(metrics.get('samples', 0))),
+        "sharpe_ci": [sharpe_lower, finite_or_none('sharpe_ci_upper')] if has_ci else None,
+        "profit_factor_ci": [pf_lower, finite_or_none('pf_ci_upper')] if has_ci else None,
         "deployable": is_deployable,
         "quality_tier": quality_tier,
         "trained_at": pd.Timestamp.now().isoformat()
@@ -419,7 +552,56 @@ def load_tickers():
     return tickers
 
 
-def train_single_ticker(ticker, model_type, label_mode, use_tuning, use_regime=True):
+def load_sectors():
+    """Optional {ticker: sector} map under objectives.universe.sectors."""
+    project_root = Path(__file__).resolve().parents[1]
+    spec_file = project_root / "SYSTEM_SPEC.yaml"
+    if not spec_file.exists():
+        return {}
+
+    with open(spec_file, 'r') as f:
+        config = yaml.safe_load(f)
+
+    return config['objectives']['universe'].get('sectors') or {}
+
+
+def ticker_tuning_config(tuning_config, ticker, close, n_profile):
+    """
+    Per-ticker tuning config: study key plus the sector and return profile
+    (over the first ``n_profile`` training rows) used for warm starts.
+    """
+    config = {**(tuning_config or {}), "study_key": ticker, "ticker": ticker}
+    if config.get("param_history") is not None:
+        returns = close.pct_change().values[1:n_profile]
+        config["profile"] = return_profile(returns)
+        config["sector"] = config.get("sectors", {}).get(ticker)
+    return config
+
+
+def select_feature_columns(df, use_regime=True):
+    exclude_cols = [
+        "timestamp", "open", "high", "low", "close", "volume", "ticker",
+        "label", "forward_ret", "return_at_label",
+        "rolling_vol", "neutral_thresh", "strong_thresh", "dyn_thresh",
+        "trend_regime", "volatility_regime", "momentum_regime",
+        "ma_fast", "ma_slow", "ma_long", "ma_fast_slope", "ma_slow_slope",
+        "price_vs_fast", "price_vs_slow", "price_vs_long", "ma_alignment",
+        "atr", "atr_pct", "hist_vol", "hist_vol_long", "vol_ratio", "vol_percentile",
+        "rsi", "rsi_divergence", "momentum", "momentum_accel",
+        "macd", "macd_signal", "macd_hist"
+    ]
+
+    regime_feature_cols = ["regime_score", "trend_regime_num",
+                           "volatility_regime_num", "momentum_regime_num"]
+
+    feature_cols = [c for c in df.columns if c not in exclude_cols]
+    if use_regime:
+        feature_cols = [
+            c for c in feature_cols if c not in regime_feature_cols] + regime_feature_cols
+    return feature_cols
+
+
+def train_single_ticker(ticker, model_type, label_mode, use_tuning, use_regime=True, tuning_config=None):
     try:
         df = load_dataset(ticker)
 
@@ -428,25 +610,7 @@ def train_single_ticker(ticker, model_type, label_mode, use_tuning, use_regime=T
 
         df = generate_labels(df, mode=label_mode)
 
-        exclude_cols = [
-            "timestamp", "open", "high", "low", "close", "volume", "ticker",
-            "label", "forward_ret", "return_at_label",
-            "rolling_vol", "neutral_thresh", "strong_thresh", "dyn_thresh",
-            "trend_regime", "volatility_regime", "momentum_regime",
-            "ma_fast", "ma_slow", "ma_long", "ma_fast_slope", "ma_slow_slope",
-            "price_vs_fast", "price_vs_slow", "price_vs_long", "ma_alignment",
-            "atr", "atr_pct", "hist_vol", "hist_vol_long", "vol_ratio", "vol_percentile",
-            "rsi", "rsi_divergence", "momentum", "momentum_accel",
-            "macd", "macd_signal", "macd_hist"
-        ]
-
-        regime_feature_cols = ["regime_score", "trend_regime_num",
-                               "volatility_regime_num", "momentum_regime_num"]
-
-        feature_cols = [c for c in df.columns if c not in exclude_cols]
-        if use_regime:
-            feature_cols = [
-                c for c in feature_cols if c not in regime_feature_cols] + regime_feature_cols
+        feature_cols = select_feature_columns(df, use_regime)
 
         df_clean = df.dropna(subset=feature_cols + ["label"])
 
@@ -467,6 +631,8 @@ def train_single_ticker(ticker, model_type, label_mode, use_tuning, use_regime=T
 
         regime_labels_all = df_clean["trend_regime"].values if "trend_regime" in df_clean.columns else None
         n_train = len(y_train)
+        tuning_config = ticker_tuning_config(
+            tuning_config, ticker, df_clean["close"], n_train)
         n_val_start = int(len(X) * 0.64)  # Match split point
         n_val_end = n_val_start + len(y_val)
         regime_labels_val = regime_labels_all[n_val_start:
@@ -480,14 +646,16 @@ def train_single_ticker(ticker, model_type, label_mode, use_tuning, use_regime=T
             model = train_model(
                 model_type, X_train, fwd_ret_train, X_val, fwd_ret_val,
                 use_tuning=use_tuning, regime_labels_val=None,
-                adaptive_threshold=adaptive_threshold
+                adaptive_threshold=adaptive_threshold,
+                tuning_config=tuning_config
             )
         else:
             Xb, yb = hybrid_balance(X_train, y_train)
             model = train_model(
                 model_type, Xb, yb, X_val, y_val,
                 use_tuning=use_tuning,
-                regime_labels_val=regime_labels_val if use_tuning and use_regime else None
+                regime_labels_val=regime_labels_val if use_tuning and use_regime else None,
+                tuning_config=tuning_config
             )
 
         y_pred = model.predict(X_test)
@@ -518,7 +686,8 @@ def train_single_ticker(ticker, model_type, label_mode, use_tuning, use_regime=T
             "profit_factor": fin_metrics.profit_factor,
             "win_rate": fin_metrics.win_rate,
             "total_return": fin_metrics.total_return,
-            "num_trades": fin_metrics.num_trades
+            "num_trades": fin_metrics.num_trades,
+            **bootstrap_metrics(fin_evaluator, y_pred, fwd_ret_test)
         }
 
         save_artifact(model, ticker, model_type, metrics=metrics)
@@ -547,7 +716,8 @@ def train_single_ticker(ticker, model_type, label_mode, use_tuning, use_regime=T
         return {"status": "ERROR", "reason": str(e)[:100]}
 
 
-def train_walk_forward(ticker, model_type, label_mode, use_tuning, use_regime=True, n_splits=5):
+def train_walk_forward(ticker, model_type, label_mode, use_tuning, use_regime=True, n_splits=5,
+                       tuning_config=None):
     """
     Train using walk-forward validation for more robust performance estimates.
 
@@ -562,25 +732,7 @@ def train_walk_forward(ticker, model_type, label_mode, use_tuning, use_regime=Tr
 
         df = generate_labels(df, mode=label_mode)
 
-        exclude_cols = [
-            "timestamp", "open", "high", "low", "close", "volume", "ticker",
-            "label", "forward_ret", "return_at_label",
-            "rolling_vol", "neutral_thresh", "strong_thresh", "dyn_thresh",
-            "trend_regime", "volatility_regime", "momentum_regime",
-            "ma_fast", "ma_slow", "ma_long", "ma_fast_slope", "ma_slow_slope",
-            "price_vs_fast", "price_vs_slow", "price_vs_long", "ma_alignment",
-            "atr", "atr_pct", "hist_vol", "hist_vol_long", "vol_ratio", "vol_percentile",
-            "rsi", "rsi_divergence", "momentum", "momentum_accel",
-            "macd", "macd_signal", "macd_hist"
-        ]
-
-        regime_feature_cols = ["regime_score", "trend_regime_num",
-                               "volatility_regime_num", "momentum_regime_num"]
-
-        feature_cols = [c for c in df.columns if c not in exclude_cols]
-        if use_regime:
-            feature_cols = [
-                c for c in feature_cols if c not in regime_feature_cols] + regime_feature_cols
+        feature_cols = select_feature_columns(df, use_regime)
 
         df_clean = df.dropna(subset=feature_cols + ["label"])
 
@@ -592,6 +744,13 @@ def train_walk_forward(ticker, model_type, label_mode, use_tuning, use_regime=Tr
         forward_returns = df_clean["forward_ret"].values if "forward_ret" in df_clean.columns else np.zeros(
             len(y))
 
+        # Profile over the minimum training window every fold sees; only the
+        # final fit records its params in the warm-start history. Folds keep
+        # the ticker so its own past entries are never used as seeds.
+        ticker_config = ticker_tuning_config(
+            tuning_config, ticker, df_clean["close"], int(len(X) * 0.4))
+        fold_config = {**ticker_config, "record_params": False}
+
         # Collect metrics across all folds
         fold_metrics = []
         all_y_true = []
@@ -621,7 +780,11 @@ def train_walk_forward(ticker, model_type, label_mode, use_tuning, use_regime=Tr
                 Xb, yb = hybrid_balance(X_tr, y_tr)
                 model = train_model(
                     model_type, Xb, yb, X_vl, y_vl,
-                    use_tuning=use_tuning, regime_labels_val=None
+                    use_tuning=use_tuning, regime_labels_val=None,
+                    tuning_config={
+                        **fold_config,
+                        "study_key": f"{ticker}_fold{fold_info['fold']}"
+                    }
                 )
 
             y_pred = model.predict(X_test)
@@ -679,7 +842,8 @@ def train_walk_forward(ticker, model_type, label_mode, use_tuning, use_regime=Tr
             Xb, yb = hybrid_balance(X_tr_final, y_tr_final)
             final_model = train_model(
                 model_type, Xb, yb, X_vl_final, y_vl_final,
-                use_tuning=use_tuning, regime_labels_val=None
+                use_tuning=use_tuning, regime_labels_val=None,
+                tuning_config={**ticker_config, "study_key": f"{ticker}_final"}
             )
 
         metrics = {
@@ -691,7 +855,8 @@ def train_walk_forward(ticker, model_type, label_mode, use_tuning, use_regime=Tr
             "win_rate": agg_metrics.win_rate,
             "total_return": agg_metrics.total_return,
             "num_trades": agg_metrics.num_trades,
-            "walk_forward_folds": n_splits
+            "walk_forward_folds": n_splits,
+            **bootstrap_metrics(fin_evaluator, all_y_pred, all_fwd_ret)
         }
 
         save_artifact(final_model, ticker, model_type, metrics=metrics)
@@ -742,10 +907,49 @@ def main():
                         help="Use walk-forward validation (more robust, slower)")
     parser.add_argument("--wf-splits", type=int, default=5,
                         help="Number of walk-forward splits (default: 5)")
+    parser.add_argument("--dataset-cache", type=str, default=None,
+                        help="Directory to persist binned LightGBM Datasets used by tuners")
+    parser.add_argument("--study-dir", type=str, default=None,
+                        help="Directory for per-ticker Optuna studies (resumed on rerun)")
+    parser.add_argument("--study-backend", type=str, default="sqlite",
+                        choices=["sqlite", "journal"],
+                        help="Study storage format (journal copes better with many workers)")
+    parser.add_argument("--tune-workers", type=int, default=1,
+                        help="Worker processes per study, sharing the CPU threads (needs --study-dir)")
+    parser.add_argument("--pruner", type=str, default="none",
+                        choices=["none", "median", "halving"],
+                        help="Optuna pruner stopping weak tuning trials early on their "
+                             "intermediate objective score (default: none)")
+    parser.add_argument("--warm-start", action="store_true",
+                        help="Seed studies with best params of similar already-tuned tickers")
+    parser.add_argument("--warm-start-trials", type=int, default=15,
+                        help="Trial budget for warm-started studies (default: 15)")
+    parser.add_argument("--multi-fidelity", type=str, default=None,
+                        choices=["window", "rows"],
+                        help="Search on recent-history (window) or subsampled (rows) data first, "
+                             "promoting only the best trials to full-data training")
 
     args = parser.parse_args()
     use_regime = not args.no_regime
 
+    tuning_config = {
+        "dataset_cache_dir": args.dataset_cache,
+        "study_dir": args.study_dir,
+        "study_backend": args.study_backend,
+        "tune_workers": args.tune_workers,
+        "pruner": args.pruner,
+        "multi_fidelity": args.multi_fidelity,
+    }
+
+    if args.warm_start:
+        project_root = Path(__file__).resolve().parents[1]
+        tuning_config.update({
+            "param_history": TuningParamHistory(
+                project_root / "models" / "tuning_history.json"),
+            "warm_start_trials": args.warm_start_trials,
+            "sectors": load_sectors(),
+        })
+
     tickers = load_tickers()
     total = len(tickers)
 
@@ -769,7 +973,8 @@ def main():
                 args.labels,
                 args.tune,
                 use_regime,
-                n_splits=args.wf_splits
+                n_splits=args.wf_splits,
+                tuning_config=tuning_config
             )
         else:
             result = train_single_ticker(
@@ -777,7 +982,8 @@ def main():
                 args.model,
                 args.labels,
                 args.tune,
-                use_regime
+                use_regime,
+                tuning_config=tuning_config
             )
 
         result["ticker"] = ticker
@@ -27,8 +27,19 @@ class FeatureEngine:
     Usage:
         fe = FeatureEngine()
         df = fe.calculate_all(df)
+
+        # Latest row only (live scoring): send at least TAIL_HISTORY bars,
+        # anchored so the cumulative OBV matches the full history
+        tail = df.tail(FeatureEngine.TAIL_HISTORY)
+        anchor = FeatureEngine.obv_anchor(df, FeatureEngine.TAIL_HISTORY)
+        latest = fe.calculate_all(tail, tail_rows=1, obv_anchor=anchor)
     """
 
+    # Longest lookback (52-week high/low): bars needed for one complete row
+    MIN_HISTORY = 252
+    # Bars to keep for live scoring (EWM warm-up beyond MIN_HISTORY)
+    TAIL_HISTORY = 300
+
     def __init__(self):
         pass
 
@@ -43,6 +54,32 @@ class FeatureEngine:
         """Safe division handling zeros."""
         return np.where(b != 0, a / b, 0)
 
+    @staticmethod
+    def _obv_steps(df):
+        return np.sign(df["close"].diff()) * df["volume"]
+
+    @classmethod
+    def obv_anchor(cls, df, tail_bars):
+        """
+        OBV at the first of the last ``tail_bars`` bars of ``df`` (full
+        history). Pass it to calculate_all with that tail so obv and
+        obv_slope equal the full-history values; None if nothing is cut.
+        """
+        if len(df) <= tail_bars:
+            return None
+        obv = cls._obv_steps(df.sort_values("timestamp")).cumsum()
+        return float(obv.iloc[-tail_bars])
+
+    def _rolling_apply(self, s, window, func, raw, tail_rows=None):
+        """
+        s.rolling(window).apply(func), evaluated only for the last
+        ``tail_rows`` windows when set (earlier positions are NaN).
+        """
+        if tail_rows is None or len(s) <= tail_rows + window - 1:
+            return s.rolling(window).apply(func, raw=raw)
+        tail = s.iloc[-(tail_rows + window - 1):]
+        return tail.rolling(window).apply(func, raw=raw).reindex(s.index)
+
     def _roll(self, s, window, func="mean"):
         """Safe rolling window helper."""
         if func == "mean":
@@ -130,7 +167,7 @@ class FeatureEngine:
         low_min = df["low"].rolling(window=period).min()
         return -100 * (high_max - df["close"]) / (high_max - low_min).replace(0, np.nan)
 
-    def _volatility_features(self, df):
+    def _volatility_features(self, df, tail_rows=None):
         for w in [5, 10, 20]:
             df[f"vol_{w}"] = df["return_1d"].rolling(w).std()
             df[f"range_vol_{w}"] = (df["high"] - df["low"]).rolling(w).std()
@@ -150,8 +187,10 @@ class FeatureEngine:
         df["squeeze"] = ((df["bb_upper"] < df["keltner_upper"]) &
                          (df["bb_lower"] > df["keltner_lower"])).astype(int)
 
-        df["vol_percentile"] = df["vol_20"].rolling(60).apply(
-            lambda x: (x[-1] > x).mean() * 100 if len(x) > 1 else 50, raw=True
+        df["vol_percentile"] = self._rolling_apply(
+            df["vol_20"], 60,
+            lambda x: (x[-1] > x).mean() * 100 if len(x) > 1 else 50,
+            raw=True, tail_rows=tail_rows
         )
 
         return df
@@ -181,7 +220,7 @@ class FeatureEngine:
         lower = ema - (atr * multiplier)
         return upper, lower
 
-    def _volume_features(self, df):
+    def _volume_features(self, df, obv_anchor=None):
         df["volume_z"] = (
             df["volume"] - df["volume"].rolling(20).mean()) / df["volume"].rolling(20).std()
         df["vol_chg"] = df["volume"].pct_change()
@@ -189,7 +228,11 @@ class FeatureEngine:
             df[f"vol_sma_ratio_{w}"] = df["volume"] / \
                 df["volume"].rolling(w).mean() - 1
 
-        df["obv"] = (np.sign(df["close"].diff()) * df["volume"]).cumsum()
+        if obv_anchor is None:
+            df["obv"] = self._obv_steps(df).cumsum()
+        else:
+            # Continue the full-history sum from the first bar of the tail
+            df["obv"] = obv_anchor + self._obv_steps(df).fillna(0).cumsum()
         df["obv_slope"] = df["obv"].pct_change(5)
 
         df["vwap_ratio"] = df["close"] / self._calculate_vwap(df, 20)
@@ -216,19 +259,21 @@ class FeatureEngine:
             )
         return df
 
-    def _autocorrelation_features(self, df):
+    def _autocorrelation_features(self, df, tail_rows=None):
         """Return autocorrelation features - predictive for mean reversion."""
         returns = df["return_1d"]
 
         for lag in [1, 2, 5, 10]:
-            df[f"autocorr_{lag}"] = returns.rolling(20).apply(
-                lambda x: x.autocorr(lag=lag) if len(x) > lag else 0, raw=False
+            df[f"autocorr_{lag}"] = self._rolling_apply(
+                returns, 20,
+                lambda x: x.autocorr(lag=lag) if len(x) > lag else 0,
+                raw=False, tail_rows=tail_rows
             )
 
         df["return_streak"] = self._calculate_streak(returns)
 
-        df["hurst"] = returns.rolling(100).apply(
-            self._estimate_hurst, raw=True)
+        df["hurst"] = self._rolling_apply(
+            returns, 100, self._estimate_hurst, raw=True, tail_rows=tail_rows)
 
         return df
 
@@ -381,17 +426,30 @@ class FeatureEngine:
 
         return adx
 
-    def calculate_all(self, df: pd.DataFrame) -> pd.DataFrame:
+    def calculate_all(self, df: pd.DataFrame, tail_rows: int = None,
+                      obv_anchor: float = None) -> pd.DataFrame:
+        """
+        Args:
+            df: OHLCV bars with a timestamp column
+            tail_rows: Only return the last ``tail_rows`` complete rows; the
+                       Python rolling-window features (autocorrelation,
+                       Hurst, vol percentile) are then computed for those
+                       rows only. Values match the full computation on the
+                       same input.
+            obv_anchor: OBV of the first bar when ``df`` is the tail of a
+                        longer history (see obv_anchor()); without it OBV
+                        starts from zero at the first bar given.
+        """
         df = df.copy()
         df = df.sort_values("timestamp")
 
         df = self._price_features(df)
         df = self._lag_features(df)
         df = self._momentum_features(df)
-        df = self._volatility_features(df)
-        df = self._volume_features(df)
+        df = self._volatility_features(df, tail_rows=tail_rows)
+        df = self._volume_features(df, obv_anchor=obv_anchor)
         df = self._stat_features(df)
-        df = self._autocorrelation_features(df)
+        df = self._autocorrelation_features(df, tail_rows=tail_rows)
         df = self._mean_reversion_features(df)
         df = self._candle_pattern_features(df)
         df = self._relative_strength_features(df)
@@ -400,4 +458,7 @@ class FeatureEngine:
         df = df.replace([np.inf, -np.inf], np.nan)
         df = df.dropna().reset_index(drop=True)
 
+        if tail_rows is not None:
+            df = df.tail(tail_rows).reset_index(drop=True)
+
         return df
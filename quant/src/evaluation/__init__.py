@@ -1,6 +1,7 @@
 """Evaluation modules for financial metrics and regime detection"""
 
 from .financial_metrics import FinancialMetrics
+from .portfolio_backtester import PortfolioBacktester, PortfolioResult
 from .regime_detector import RegimeDetector
 
-__all__ = ['FinancialMetrics', 'RegimeDetector']
+__all__ = ['FinancialMetrics', 'PortfolioBacktester', 'PortfolioResult', 'RegimeDetector']
@@ -0,0 +1,203 @@
+"""
+bootstrap.py
+---------------------------------------------------------------------
+Block-bootstrap confidence intervals for strategy Sharpe and profit factor.
+
+A single test split gives noisy point estimates. Resampling contiguous
+blocks of the strategy-return series (so autocorrelation from overlapping
+forward returns survives) gives a distribution per metric; deployment
+gates can then use the lower confidence bound instead of the point value.
+
+Every resample is a row of one (n_resamples x n) index matrix, so the
+metrics for thousands of resamples are computed with array operations.
+
+Usage:
+    bootstrap = StrategyBootstrap(n_resamples=2000, confidence=0.90)
+    cis = bootstrap.run(y_pred, forward_returns, holding_period=10)
+    cis["sharpe_ratio"].lower, cis["profit_factor"].lower
+"""
+
+import numpy as np
+from typing import Dict, Optional
+from dataclasses import dataclass
+
+from .financial_metrics import FinancialMetrics
+
+BOOTSTRAP_METHODS = ("stationary", "moving")
+
+# Resamples per vectorized chunk (bounds the index matrix memory)
+CHUNK_SIZE = 500
+
+
+@dataclass
+class BootstrapCI:
+    """Point estimate and bootstrap confidence band for one metric"""
+    point: float
+    lower: float
+    upper: float
+    std: float
+    confidence: float
+
+    def to_dict(self) -> Dict:
+        return {
+            'point': self.point,
+            'lower': self.lower,
+            'upper': self.upper,
+            'std': self.std,
+            'confidence': self.confidence
+        }
+
+
+def block_bootstrap_indices(
+    n: int,
+    n_resamples: int,
+    block_length: int,
+    method: str = "stationary",
+    rng: Optional[np.random.Generator] = None
+) -> np.ndarray:
+    """
+    (n_resamples, n) matrix of resampled row indices.
+
+    "stationary": Politis-Romano stationary bootstrap - geometric block
+                  lengths with mean ``block_length``, wrapping circularly.
+    "moving":     fixed-length overlapping blocks with random starts.
+    """
+    rng = rng or np.random.default_rng()
+    block_length = max(1, min(int(block_length), n))
+
+    if method == "moving":
+        n_blocks = -(-n // block_length)
+        starts = rng.integers(0, n - block_length + 1, (n_resamples, n_blocks))
+        idx = starts[:, :, None] + np.arange(block_length)
+        return idx.reshape(n_resamples, -1)[:, :n]
+
+    if method != "stationary":
+        raise ValueError(f"Unknown bootstrap method '{method}', expected one of {BOOTSTRAP_METHODS}")
+
+    # A new block starts at each position with probability 1 / block_length;
+    # within a block the index advances by one from the block's random start
+    new_block = rng.random((n_resamples, n)) < 1.0 / block_length
+    new_block[:, 0] = True
+    starts = rng.integers(0, n, (n_resamples, n))
+
+    positions = np.arange(n)
+    block_start = np.maximum.accumulate(np.where(new_block, positions, 0), axis=1)
+    start_index = np.take_along_axis(starts, block_start, axis=1)
+    return (start_index + (positions - block_start)) % n
+
+
+class StrategyBootstrap:
+    """
+    Confidence intervals for Sharpe ratio (on per-period strategy returns)
+    and profit factor (on per-trade returns), with the same definitions as
+    FinancialMetrics.evaluate.
+    """
+
+    def __init__(
+        self,
+        evaluator: Optional[FinancialMetrics] = None,
+        n_resamples: int = 2000,
+        confidence: float = 0.90,
+        method: str = "stationary",
+        block_length: Optional[int] = None,
+        seed: int = 42
+    ):
+        """
+        Args:
+            evaluator: FinancialMetrics defining costs / risk-free rate
+            n_resamples: Bootstrap resamples
+            confidence: Two-sided confidence level of the bands
+            method: "stationary" or "moving" block bootstrap
+            block_length: Mean block length (None = max(holding period, n^(1/3)))
+            seed: RNG seed (reproducible bands per model)
+        """
+        self.evaluator = evaluator or FinancialMetrics(transaction_cost_bps=10)
+        self.n_resamples = n_resamples
+        self.confidence = confidence
+        self.method = method
+        self.block_length = block_length
+        self.seed = seed
+
+    def _sharpe(self, returns: np.ndarray) -> np.ndarray:
+        """Row-wise FinancialMetrics._sharpe_ratio (returns are finite)."""
+        ev = self.evaluator
+        excess = returns - (ev.risk_free_rate / ev.trading_days)
+        std = np.std(excess, axis=1, ddof=1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            sharpe = np.mean(excess, axis=1) / std * np.sqrt(ev.trading_days)
+        return np.where(std < 1e-8, 0.0, np.clip(sharpe, -10, 10))
+
+    @staticmethod
+    def _profit_factor(trade_returns: np.ndarray, traded: np.ndarray) -> np.ndarray:
+        """Row-wise FinancialMetrics profit factor (0 without trades)."""
+        gains = np.where(traded & (trade_returns > 0), trade_returns, 0.0).sum(axis=1)
+        losses = -np.where(traded & (trade_returns < 0), trade_returns, 0.0).sum(axis=1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            pf = np.where(losses > 0, gains / losses, np.inf)
+        return np.where(traded.any(axis=1), pf, 0.0)
+
+    def _interval(self, point: float, samples: np.ndarray) -> BootstrapCI:
+        alpha = (1 - self.confidence) / 2
+        # "nearest" keeps infinite profit factors from producing inf - inf
+        lower, upper = np.quantile(samples, [alpha, 1 - alpha], method="nearest")
+        finite = samples[np.isfinite(samples)]
+        return BootstrapCI(
+            point=float(point),
+            lower=float(lower),
+            upper=float(upper),
+            std=float(np.std(finite)) if len(finite) > 1 else 0.0,
+            confidence=self.confidence
+        )
+
+    def run(
+        self,
+        y_pred: np.ndarray,
+        forward_returns: np.ndarray,
+        holding_period: int = 1
+    ) -> Dict[str, BootstrapCI]:
+        """
+        Bootstrap CIs for a strategy's Sharpe ratio and profit factor.
+
+        Args:
+            y_pred: Predicted labels (-1, 0, 1)
+            forward_returns: Forward returns aligned with y_pred
+            holding_period: Forward-return horizon; the default block length
+                            is at least this, so overlapping returns stay together
+
+        Returns:
+            {"sharpe_ratio": BootstrapCI, "profit_factor": BootstrapCI}
+        """
+        y_pred = np.array(y_pred).flatten()
+        forward_returns = np.array(forward_returns, dtype=float).flatten()
+        n = len(y_pred)
+
+        strategy_returns = self.evaluator.strategy_returns(y_pred, forward_returns)
+
+        # Per-row trade returns as in FinancialMetrics._trade_metrics
+        positions = np.where(y_pred == 1, 1.0, np.where(y_pred == -1, -1.0, 0.0))
+        trade_returns = positions * forward_returns - self.evaluator.transaction_cost
+        traded = y_pred != 0
+
+        point_sharpe = self._sharpe(strategy_returns[None, :])[0] if n >= 2 else 0.0
+        point_pf = self._profit_factor(trade_returns[None, :], traded[None, :])[0]
+
+        if n < 2:
+            return {
+                'sharpe_ratio': BootstrapCI(point_sharpe, 0.0, 0.0, 0.0, self.confidence),
+                'profit_factor': BootstrapCI(point_pf, point_pf, point_pf, 0.0, self.confidence),
+            }
+
+        block_length = self.block_length or max(holding_period, int(round(n ** (1 / 3))))
+        rng = np.random.default_rng(self.seed)
+
+        sharpes, pfs = [], []
+        for chunk_start in range(0, self.n_resamples, CHUNK_SIZE):
+            n_chunk = min(CHUNK_SIZE, self.n_resamples - chunk_start)
+            idx = block_bootstrap_indices(n, n_chunk, block_length, self.method, rng)
+            sharpes.append(self._sharpe(strategy_returns[idx]))
+            pfs.append(self._profit_factor(trade_returns[idx], traded[idx]))
+
+        return {
+            'sharpe_ratio': self._interval(point_sharpe, np.concatenate(sharpes)),
+            'profit_factor': self._interval(point_pf, np.concatenate(pfs)),
+        }
@@ -14,6 +14,7 @@ Computes realistic trading metrics beyond classification accuracy:
 Usage:
     evaluator = FinancialMetrics(transaction_cost_bps=10)
     metrics = evaluator.evaluate(y_true, y_pred, returns)
+    sweep = evaluator.evaluate_many(pred_matrix, returns)  # K strategies at once
 """
 
 import numpy as np
@@ -160,6 +161,131 @@ class FinancialMetrics:
             avg_holding_period=holding_period
         )
 
+    def evaluate_many(
+        self,
+        y_pred_matrix: np.ndarray,
+        forward_returns: np.ndarray,
+        y_true: Optional[np.ndarray] = None
+    ) -> Dict[str, np.ndarray]:
+        """
+        Evaluate K prediction vectors against the same forward returns in
+        one vectorized pass (e.g. threshold sweeps, tuner objectives).
+
+        Each row gets the same metrics as ``evaluate`` on that row, equal
+        up to floating-point summation order.
+
+        Args:
+            y_pred_matrix: Predicted labels/positions (-1, 0, 1), shape (K, N)
+            forward_returns: Actual forward returns, shape (N,)
+            y_true: Actual labels (N,) for accuracy (optional)
+
+        Returns:
+            Dictionary of (K,) arrays keyed like TradingMetrics.to_dict()
+            (accuracy only when y_true is given; no avg_holding_period)
+        """
+        preds = np.atleast_2d(np.asarray(y_pred_matrix))
+        raw_returns = np.asarray(forward_returns, dtype=float).flatten()
+        n_strategies, n = preds.shape
+
+        positions = np.where(preds == 1, 1.0, np.where(preds == -1, -1.0, 0.0))
+
+        # Strategy returns (same construction as _simulate_trading); finite
+        # by construction, so the per-call NaN/inf filtering is a no-op
+        clean_returns = np.nan_to_num(raw_returns, nan=0.0, posinf=0.0, neginf=0.0)
+        position_changes = np.abs(np.diff(positions, axis=1, prepend=0))
+        returns = positions * clean_returns - position_changes * self.transaction_cost
+
+        zeros = np.zeros(n_strategies)
+        results = {}
+        if y_true is not None:
+            results['accuracy'] = np.mean(
+                np.asarray(y_true).flatten() == preds, axis=1)
+
+        total_ret = np.prod(1 + returns, axis=1) - 1 if n > 0 else zeros
+
+        if n < 2:
+            sharpe = sortino = max_dd = annual_ret = zeros
+        else:
+            excess = returns - (self.risk_free_rate / self.trading_days)
+            mean_excess = np.mean(excess, axis=1)
+
+            # Sharpe
+            std_excess = np.std(excess, axis=1, ddof=1)
+            valid = (std_excess >= 1e-8) & ~np.isnan(std_excess)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                sharpe = mean_excess / std_excess * np.sqrt(self.trading_days)
+            sharpe = np.where(valid, np.clip(sharpe, -10, 10), 0.0)
+
+            # Sortino (downside deviation over negative excess returns only)
+            downside = excess < 0
+            n_down = downside.sum(axis=1)
+            down_mean = np.where(downside, excess, 0.0).sum(axis=1) / np.maximum(n_down, 1)
+            down_dev = np.where(downside, excess - down_mean[:, None], 0.0)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                down_std = np.sqrt((down_dev ** 2).sum(axis=1) / (n_down - 1))
+                sortino = mean_excess / down_std * np.sqrt(self.trading_days)
+            sortino = np.clip(sortino, -10, 10)
+            sortino = np.where((down_std == 0) | np.isnan(down_std), 0.0, sortino)
+            sortino = np.where(
+                n_down == 0, np.where(mean_excess > 0, np.inf, 0.0), sortino)
+
+            # Max drawdown
+            cumulative = np.cumprod(1 + returns, axis=1)
+            running_max = np.maximum.accumulate(cumulative, axis=1)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                drawdown = np.min((cumulative - running_max) / running_max, axis=1)
+            broken = np.any(cumulative <= 0, axis=1) | np.any(np.isnan(cumulative), axis=1)
+            max_dd = np.where(broken, 0.0, np.clip(np.abs(drawdown), 0, 1))
+
+            # Annualized return
+            with np.errstate(invalid='ignore'):
+                annual_ret = (1 + total_ret) ** (1 / (n / self.trading_days)) - 1
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            calmar = np.where(max_dd > 0, annual_ret / max_dd, 0.0)
+
+        # Trade-level metrics (raw returns, costs per trade)
+        traded = preds != 0
+        n_trades = traded.sum(axis=1)
+        trade_returns = positions * raw_returns - self.transaction_cost
+        wins = traded & (trade_returns > 0)
+        losses = traded & (trade_returns < 0)
+        n_wins = wins.sum(axis=1)
+        n_losses = losses.sum(axis=1)
+        gross_profit = np.where(wins, trade_returns, 0.0).sum(axis=1)
+        gross_loss = np.where(losses, np.abs(trade_returns), 0.0).sum(axis=1)
+
+        has_trades = n_trades > 0
+        with np.errstate(divide='ignore', invalid='ignore'):
+            profit_factor = np.where(gross_loss > 0, gross_profit / gross_loss, np.inf)
+            win_rate = n_wins / n_trades
+            avg_win = np.where(n_wins > 0, gross_profit / n_wins, 0.0)
+            avg_loss = np.where(n_losses > 0, gross_loss / n_losses, 0.0)
+
+        results.update({
+            'sharpe_ratio': sharpe,
+            'sortino_ratio': sortino,
+            'max_drawdown': max_dd,
+            'calmar_ratio': calmar,
+            'profit_factor': np.where(has_trades, profit_factor, 0.0),
+            'win_rate': np.where(has_trades, win_rate, 0.0),
+            'avg_win': np.where(has_trades, avg_win, 0.0),
+            'avg_loss': np.where(has_trades, avg_loss, 0.0),
+            'total_return': total_ret,
+            'annualized_return': annual_ret,
+            'num_trades': n_trades,
+        })
+        return results
+
+    def strategy_returns(
+        self,
+        y_pred: np.ndarray,
+        forward_returns: np.ndarray
+    ) -> np.ndarray:
+        """Per-period net strategy returns, as scored by ``evaluate``."""
+        return self._simulate_trading(
+            np.array(y_pred).flatten(), np.array(forward_returns).flatten(), 1)
+
     def _simulate_trading(
         self,
         predictions: np.ndarray,
@@ -344,6 +470,23 @@ class FinancialMetrics:
 
         return float(annual_ret)
 
+    def return_metrics(self, returns: np.ndarray) -> Dict:
+        """
+        Risk/return metrics of an already-simulated return series
+        (e.g. portfolio PnL), using the same definitions as ``evaluate``.
+        """
+        returns = np.asarray(returns, dtype=float)
+        max_dd = self._max_drawdown(returns)
+
+        return {
+            'sharpe_ratio': self._sharpe_ratio(returns),
+            'sortino_ratio': self._sortino_ratio(returns),
+            'max_drawdown': max_dd,
+            'calmar_ratio': self._calmar_ratio(returns, max_dd),
+            'total_return': self._total_return(returns),
+            'annualized_return': self._annualized_return(returns),
+        }
+
     def compare_to_benchmark(
         self,
         strategy_returns: np.ndarray,
@@ -0,0 +1,245 @@
+"""
+portfolio_backtester.py
+---------------------------------------------------------------------
+Cross-sectional portfolio backtest over the whole ticker universe.
+
+FinancialMetrics scores one ticker's signals in isolation; the system KPIs
+(after-cost Sharpe, max drawdown, annual turnover) are portfolio-level.
+This backtester takes (dates x tickers) panels of signals and aligned
+one-period forward returns and, with array operations only:
+    - sizes positions (equal / signal-strength / inverse-volatility)
+    - normalizes to the gross exposure budget, caps single names and
+      net exposure
+    - charges costs on traded notional (turnover)
+    - computes portfolio PnL, turnover, exposure and drawdown
+
+Usage:
+    bt = PortfolioBacktester(sizing="inverse_vol", max_gross=1.0, max_net=0.3)
+    signals = PortfolioBacktester.signals_from_probabilities(p_up, p_down)
+    result = bt.run(signals, forward_returns, volatility=vol_panel)
+    print(result.summary())
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Dict, Optional
+from dataclasses import dataclass, field
+
+from .financial_metrics import FinancialMetrics
+
+SIZING_METHODS = ("equal", "signal", "inverse_vol")
+
+
+@dataclass
+class PortfolioResult:
+    """Portfolio backtest output (panels keep the input's index/columns)"""
+    returns: pd.Series
+    gross_returns: pd.Series
+    costs: pd.Series
+    turnover: pd.Series
+    gross_exposure: pd.Series
+    net_exposure: pd.Series
+    weights: pd.DataFrame
+    metrics: Dict = field(default_factory=dict)
+
+    @property
+    def equity_curve(self) -> pd.Series:
+        return (1 + self.returns).cumprod()
+
+    def to_dict(self) -> Dict:
+        return dict(self.metrics)
+
+    def summary(self) -> str:
+        m = self.metrics
+        return (
+            f"Sharpe (net): {m['sharpe_ratio']:.2f} | "
+            f"MaxDD: {m['max_drawdown']*100:.1f}% | "
+            f"Turnover: {m['annual_turnover']:.1f}x/yr | "
+            f"PF: {m['profit_factor']:.2f} | "
+            f"Return: {m['annualized_return']*100:.1f}%/yr"
+        )
+
+
+class PortfolioBacktester:
+    """
+    Vectorized long/short portfolio simulation over a ticker panel.
+
+    Weights decided at date t earn the forward return at t, so forward
+    returns should be one-period (next bar) returns. Tickers with a missing
+    signal or forward return on a date are not held on that date.
+    """
+
+    def __init__(
+        self,
+        sizing: str = "equal",
+        max_gross: float = 1.0,
+        max_net: Optional[float] = None,
+        max_single_name: Optional[float] = 0.20,
+        transaction_cost_bps: float = 10.0,
+        risk_free_rate: float = 0.05,
+        trading_days_per_year: int = 252
+    ):
+        """
+        Args:
+            sizing: "equal" (sign only), "signal" (proportional to signal
+                    strength) or "inverse_vol" (sign / volatility)
+            max_gross: Gross exposure budget (sum of |weights|)
+            max_net: Cap on |net exposure| (None = uncapped)
+            max_single_name: Cap on any |weight| (None = uncapped)
+            transaction_cost_bps: Cost per unit of traded notional, in bps
+            risk_free_rate: Annual risk-free rate for Sharpe
+            trading_days_per_year: Periods per year for annualization
+        """
+        if sizing not in SIZING_METHODS:
+            raise ValueError(f"Unknown sizing '{sizing}', expected one of {SIZING_METHODS}")
+
+        self.sizing = sizing
+        self.max_gross = max_gross
+        self.max_net = max_net
+        self.max_single_name = max_single_name
+        self.transaction_cost = transaction_cost_bps / 10000
+        self.trading_days = trading_days_per_year
+        self.metrics = FinancialMetrics(
+            transaction_cost_bps=transaction_cost_bps,
+            risk_free_rate=risk_free_rate,
+            trading_days_per_year=trading_days_per_year
+        )
+
+    @staticmethod
+    def signals_from_probabilities(
+        p_up,
+        p_down,
+        long_threshold: float = 0.55,
+        short_threshold: float = 0.55,
+        min_edge: float = 0.05
+    ):
+        """
+        Panel of -1/0/1 signals from class-probability panels, using the
+        threshold rule of scripts/eval_multiclass_trading.py.
+        """
+        up = np.asarray(p_up, dtype=float)
+        down = np.asarray(p_down, dtype=float)
+
+        go_long = (up - down >= min_edge) & (up >= long_threshold)
+        go_short = ~go_long & (down - up >= min_edge) & (down >= short_threshold)
+        signals = go_long.astype(float) - go_short.astype(float)
+
+        if isinstance(p_up, pd.DataFrame):
+            return pd.DataFrame(signals, index=p_up.index, columns=p_up.columns)
+        return signals
+
+    def target_weights(self, signals, tradable=None, volatility=None) -> np.ndarray:
+        """
+        (dates x tickers) portfolio weights from a signal panel.
+
+        Args:
+            signals: Signal panel (-1/0/1 or signed strength)
+            tradable: Boolean panel of tickers that can be held
+            volatility: Volatility panel, required for "inverse_vol"
+        """
+        s = np.nan_to_num(np.asarray(signals, dtype=float), nan=0.0)
+        if tradable is not None:
+            s = np.where(tradable, s, 0.0)
+
+        if self.sizing == "equal":
+            raw = np.sign(s)
+        elif self.sizing == "signal":
+            raw = s
+        else:
+            if volatility is None:
+                raise ValueError("inverse_vol sizing requires a volatility panel")
+            vol = np.asarray(volatility, dtype=float)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                raw = np.where(np.isfinite(vol) & (vol > 0), np.sign(s) / vol, 0.0)
+
+        # Fully deploy the gross budget across active names each date
+        gross = np.abs(raw).sum(axis=1, keepdims=True)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            weights = np.where(gross > 0, raw / gross * self.max_gross, 0.0)
+
+        if self.max_single_name is not None:
+            weights = np.clip(weights, -self.max_single_name, self.max_single_name)
+
+        if self.max_net is not None:
+            weights = self._cap_net(weights)
+
+        return weights
+
+    def _cap_net(self, weights: np.ndarray) -> np.ndarray:
+        """Scale down the dominant side on dates where |net| > max_net."""
+        longs = np.where(weights > 0, weights, 0.0).sum(axis=1, keepdims=True)
+        shorts = -np.where(weights < 0, weights, 0.0).sum(axis=1, keepdims=True)
+        net = longs - shorts
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            long_scale = np.where(net > self.max_net, (self.max_net + shorts) / longs, 1.0)
+            short_scale = np.where(net < -self.max_net, (self.max_net + longs) / shorts, 1.0)
+
+        return np.where(weights > 0, weights * long_scale, weights * short_scale)
+
+    def run(self, signals, forward_returns, volatility=None) -> PortfolioResult:
+        """
+        Backtest a signal panel against aligned forward returns.
+
+        Args:
+            signals: (dates x tickers) DataFrame or array
+            forward_returns: Same shape; one-period returns earned by the
+                             position held from each date
+            volatility: Same shape; required for "inverse_vol" sizing
+
+        Returns:
+            PortfolioResult with daily series, weights and summary metrics
+        """
+        returns = np.asarray(forward_returns, dtype=float)
+        if np.shape(signals) != returns.shape:
+            raise ValueError(
+                f"signals {np.shape(signals)} and forward_returns {returns.shape} must align")
+
+        tradable = np.isfinite(returns)
+        weights = self.target_weights(signals, tradable=tradable, volatility=volatility)
+        returns = np.where(tradable, returns, 0.0)
+
+        # Turnover: traded notional from the previous date's book (starts flat)
+        turnover = np.abs(np.diff(weights, axis=0, prepend=0.0)).sum(axis=1)
+        costs = turnover * self.transaction_cost
+        gross_pnl = (weights * returns).sum(axis=1)
+        net_pnl = gross_pnl - costs
+
+        index = signals.index if isinstance(signals, pd.DataFrame) else None
+        columns = signals.columns if isinstance(signals, pd.DataFrame) else None
+
+        def series(values):
+            return pd.Series(values, index=index)
+
+        result = PortfolioResult(
+            returns=series(net_pnl),
+            gross_returns=series(gross_pnl),
+            costs=series(costs),
+            turnover=series(turnover),
+            gross_exposure=series(np.abs(weights).sum(axis=1)),
+            net_exposure=series(weights.sum(axis=1)),
+            weights=pd.DataFrame(weights, index=index, columns=columns),
+        )
+        result.metrics = self._summarize(result)
+        return result
+
+    def _summarize(self, result: PortfolioResult) -> Dict:
+        net = result.returns.to_numpy()
+        metrics = self.metrics.return_metrics(net)
+
+        gains = net[net > 0].sum()
+        losses = -net[net < 0].sum()
+        n_periods = max(len(net), 1)
+
+        metrics.update({
+            'profit_factor': float(gains / losses) if losses > 0 else float('inf'),
+            'gross_sharpe_ratio': self.metrics.return_metrics(
+                result.gross_returns.to_numpy())['sharpe_ratio'],
+            'annual_turnover': float(result.turnover.sum() / n_periods * self.trading_days),
+            'annual_cost': float(result.costs.sum() / n_periods * self.trading_days),
+            'avg_gross_exposure': float(result.gross_exposure.mean()) if len(net) else 0.0,
+            'avg_net_exposure': float(result.net_exposure.mean()) if len(net) else 0.0,
+            'hit_rate': float((net > 0).sum() / max((net != 0).sum(), 1)),
+            'num_periods': len(net),
+        })
+        return metrics
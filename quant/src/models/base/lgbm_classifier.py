@@ -10,24 +10,15 @@ from sklearn.preprocessing import StandardScaler
 from collections import Counter
 import logging
 import pickle
-import subprocess
+
+from ..compute_resources import get_resources
 
 logger = logging.getLogger(__name__)
 
 
 def check_gpu_available():
-    """Check if GPU is available for LightGBM."""
-    try:
-        result = subprocess.run(
-            ['nvidia-smi'], capture_output=True, text=True, timeout=2)
-        if result.returncode == 0:
-            logger.info("[GPU] NVIDIA GPU detected - using GPU")
-            return True
-    except:
-        pass
-
-    logger.info("[CPU] GPU not available - using CPU")
-    return False
+    """Check if GPU is available for LightGBM (probed once per process)."""
+    return get_resources().gpu_available()
 
 
 def hybrid_balance(X, y, multiplier=1.4):
@@ -90,7 +81,14 @@ def compute_class_weights(y):
 class LGBMClassifier:
     """LightGBM classifier with hybrid imbalance handling."""
 
-    def __init__(self, params=None, use_tuning=False, use_gpu='auto', confidence_threshold=0.65):
+    def __init__(self, params=None, use_tuning=False, use_gpu='auto', confidence_threshold=0.65,
+                 scale_features=False):
+        """
+        Args:
+            scale_features: Standardize features before training. Tree splits
+                are invariant to it, so it is off by default; models pickled
+                with a fitted scaler keep applying it.
+        """
         self.use_tuning = use_tuning
         self.confidence_threshold = confidence_threshold
 
@@ -112,7 +110,7 @@ class LGBMClassifier:
             'reg_alpha': 0.2,
             'reg_lambda': 0.2,
             'random_state': 42,
-            'n_jobs': -1,
+            'n_jobs': -1,  # resolved per host at fit time
             'verbosity': -1
         }
 
@@ -131,9 +129,20 @@ class LGBMClassifier:
         else:
             self.params = default_params
         self.model = None
-        self.scaler = StandardScaler()
+        self.scaler = StandardScaler() if scale_features else None
         self.feature_names = None
 
+    def _transform(self, X, fit=False):
+        """Apply the scaler when the model has one (legacy artifacts)."""
+        if self.scaler is None:
+            return X
+        return self.scaler.fit_transform(X) if fit else self.scaler.transform(X)
+
+    def _train_params(self):
+        """Params with this host's thread budget (saved params keep -1)."""
+        return {**self.params,
+                'n_jobs': get_resources().resolve(self.params.get('n_jobs'))}
+
     def fit(self, X, y, X_val=None, y_val=None, calibrate=False):
         """
         Train the model with hybrid balancing.
@@ -157,7 +166,7 @@ class LGBMClassifier:
         # Convert class weights to per-sample weights
         weight_array = np.array([class_weights[c] for c in yb])
 
-        Xb_scaled = self.scaler.fit_transform(Xb)
+        Xb_scaled = self._transform(Xb, fit=True)
 
         train_data = lgb.Dataset(Xb_scaled, label=yb, weight=weight_array)
 
@@ -165,14 +174,14 @@ class LGBMClassifier:
         valid_names = ["train"]
 
         if X_val is not None:
-            X_val_scaled = self.scaler.transform(X_val)
+            X_val_scaled = self._transform(X_val)
             val_data = lgb.Dataset(X_val_scaled, label=y_val_mapped)
             valid_sets.append(val_data)
             valid_names.append("val")
 
         # --------- Train ----------
         self.model = lgb.train(
-            self.params,
+            self._train_params(),
             train_data,
             num_boost_round=800,
             valid_sets=valid_sets,
@@ -187,11 +196,18 @@ class LGBMClassifier:
         return self
 
     def predict_proba(self, X):
-        X_scaled = self.scaler.transform(X)
-        return self.model.predict(X_scaled)
+        return self.model.predict(self._transform(X))
 
     def predict(self, X):
+        return self.labels_from_proba(self.predict_proba(X))
+
+    def predict_with_proba(self, X):
+        """Class labels and probabilities from a single forward pass."""
         probas = self.predict_proba(X)
+        return self.labels_from_proba(probas), probas
+
+    def labels_from_proba(self, probas):
+        """Map class probabilities to -1/0/1 labels (confidence-gated)."""
         labels = np.argmax(probas, axis=1)
         max_probs = np.max(probas, axis=1)
 
@@ -205,8 +221,7 @@ class LGBMClassifier:
         )
 
         # Map back to -1,0,1
-        label_map_reverse = {0: -1, 1: 0, 2: 1}
-        return np.array([label_map_reverse[a] for a in labels])
+        return np.array([-1, 0, 1])[labels]
 
     def get_feature_importance(self, importance_type="gain"):
         if self.model is None:
@@ -239,7 +254,7 @@ class LGBMClassifier:
 
         inst = cls()
         inst.model = artifact["model"]
-        inst.scaler = artifact["scaler"]
+        inst.scaler = artifact.get("scaler")
         inst.feature_names = artifact["feature_names"]
         inst.params = artifact["params"]
         logger.info(f"[LGBM] Loaded from {path}")
@@ -18,6 +18,8 @@ from sklearn.preprocessing import StandardScaler
 import logging
 import pickle
 
+from ..compute_resources import get_resources
+
 logger = logging.getLogger(__name__)
 
 
@@ -31,13 +33,16 @@ class LGBMReturnPredictor:
         self,
         long_threshold: float = 0.01,
         short_threshold: float = -0.01,
-        use_gpu: bool = False
+        use_gpu: bool = False,
+        scale_features: bool = False
     ):
         """
         Args:
             long_threshold: Minimum predicted return to go long (e.g., 0.01 = 1%)
             short_threshold: Maximum predicted return to go short (e.g., -0.01 = -1%)
             use_gpu: Whether to use GPU for training
+            scale_features: Standardize features (no effect on tree splits;
+                            artifacts pickled with a scaler keep using it)
         """
         self.long_threshold = long_threshold
         self.short_threshold = short_threshold
@@ -55,7 +60,7 @@ class LGBMReturnPredictor:
             'reg_alpha': 0.05,
             'reg_lambda': 0.05,
             'random_state': 42,
-            'n_jobs': -1,
+            'n_jobs': -1,  # resolved per host at fit time
             'verbosity': -1
         }
 
@@ -63,9 +68,20 @@ class LGBMReturnPredictor:
             self.params['device'] = 'gpu'
 
         self.model = None
-        self.scaler = StandardScaler()
+        self.scaler = StandardScaler() if scale_features else None
         self.feature_names = None
 
+    def _transform(self, X, fit=False):
+        """Apply the scaler when the model has one (legacy artifacts)."""
+        if self.scaler is None:
+            return X
+        return self.scaler.fit_transform(X) if fit else self.scaler.transform(X)
+
+    def _train_params(self):
+        """Params with this host's thread budget (saved params keep -1)."""
+        return {**self.params,
+                'n_jobs': get_resources().resolve(self.params.get('n_jobs'))}
+
     def fit(self, X, y_returns, X_val=None, y_val_returns=None):
         """
         Train the model on forward returns (not class labels).
@@ -79,8 +95,7 @@ class LGBMReturnPredictor:
         if isinstance(X, pd.DataFrame):
             self.feature_names = list(X.columns)
 
-        # Scale features
-        X_scaled = self.scaler.fit_transform(X)
+        X_scaled = self._transform(X, fit=True)
 
         # Create LightGBM datasets
         train_data = lgb.Dataset(X_scaled, label=y_returns)
@@ -89,14 +104,14 @@ class LGBMReturnPredictor:
         valid_names = ['train']
 
         if X_val is not None:
-            X_val_scaled = self.scaler.transform(X_val)
+            X_val_scaled = self._transform(X_val)
             val_data = lgb.Dataset(X_val_scaled, label=y_val_returns)
             valid_sets.append(val_data)
             valid_names.append('val')
 
         # Train
         self.model = lgb.train(
-            self.params,
+            self._train_params(),
             train_data,
             num_boost_round=500,
             valid_sets=valid_sets,
@@ -113,8 +128,7 @@ class LGBMReturnPredictor:
 
     def predict_returns(self, X):
         """Predict raw forward returns."""
-        X_scaled = self.scaler.transform(X)
-        return self.model.predict(X_scaled)
+        return self.model.predict(self._transform(X))
 
     def predict(self, X, threshold_scale=None):
         """
@@ -127,7 +141,23 @@ class LGBMReturnPredictor:
 
         This handles clustered predictions better than fixed thresholds.
         """
+        return self.signals_from_returns(self.predict_returns(X), threshold_scale)
+
+    def predict_proba(self, X):
+        """
+        Return pseudo-probabilities based on predicted returns.
+        Maps returns to [0, 1] range for compatibility with existing code.
+        """
+        return self.probas_from_returns(self.predict_returns(X))
+
+    def predict_with_proba(self, X, threshold_scale=None):
+        """Signals and pseudo-probabilities from a single booster pass."""
         pred_returns = self.predict_returns(X)
+        return (self.signals_from_returns(pred_returns, threshold_scale),
+                self.probas_from_returns(pred_returns))
+
+    def signals_from_returns(self, pred_returns, threshold_scale=None):
+        """Map predicted returns to -1/0/1 signals (see predict)."""
         signals = np.zeros(len(pred_returns))
 
         # Use model's threshold_scale if not provided
@@ -148,13 +178,9 @@ class LGBMReturnPredictor:
 
         return signals.astype(int)
 
-    def predict_proba(self, X):
-        """
-        Return pseudo-probabilities based on predicted returns.
-        Maps returns to [0, 1] range for compatibility with existing code.
-        """
-        pred_returns = self.predict_returns(X)
-
+    @staticmethod
+    def probas_from_returns(pred_returns):
+        """Map predicted returns to (short, neutral, long) pseudo-probabilities."""
         # Clip returns to reasonable range for sigmoid
         clipped = np.clip(pred_returns, -0.1, 0.1)
 
@@ -202,7 +228,7 @@ class LGBMReturnPredictor:
             short_threshold=artifact.get("short_threshold", -0.01)
         )
         instance.model = artifact["model"]
-        instance.scaler = artifact["scaler"]
+        instance.scaler = artifact.get("scaler")
         instance.feature_names = artifact.get("feature_names")
         instance.params = artifact.get("params", instance.params)
 
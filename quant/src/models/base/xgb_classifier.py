@@ -11,6 +11,8 @@ from collections import Counter
 import logging
 import pickle
 
+from ..compute_resources import get_resources
+
 logger = logging.getLogger(__name__)
 
 
@@ -72,7 +74,13 @@ def compute_class_weights(y):
 class XGBClassifier:
     """XGBoost classifier with hybrid class balancing."""
 
-    def __init__(self, params=None, use_tuning=False, use_gpu=False):
+    def __init__(self, params=None, use_tuning=False, use_gpu=False, scale_features=False):
+        """
+        Args:
+            scale_features: Standardize features before training. Tree splits
+                are invariant to it, so it is off by default; models pickled
+                with a fitted scaler keep applying it.
+        """
         self.use_tuning = use_tuning
         self.use_gpu = use_gpu
 
@@ -90,7 +98,7 @@ class XGBClassifier:
             'reg_alpha': 0.2,
             'reg_lambda': 0.2,
             'random_state': 42,
-            'nthread': -1,
+            'nthread': -1,  # resolved per host at fit time
             'verbosity': 0
         }
 
@@ -103,10 +111,19 @@ class XGBClassifier:
         self.params = params or default_params
 
         self.model = None
-        self.scaler = StandardScaler()
+        self.scaler = StandardScaler() if scale_features else None
         self.feature_names = None
         self.tuning_study = None
 
+    def _transform(self, X, fit=False):
+        """
+        Features as a float ndarray (DMatrix feature names stay f0..fN),
+        scaled when the model has a scaler (legacy artifacts).
+        """
+        if self.scaler is None:
+            return np.asarray(X, dtype=np.float32)
+        return self.scaler.fit_transform(X) if fit else self.scaler.transform(X)
+
     def fit(self, X, y, X_val=None, y_val=None):
         """
         Train XGBoost with hybrid balancing.
@@ -130,19 +147,20 @@ class XGBClassifier:
         # Assign per-sample weights to DMatrix
         weight_array = np.array([class_weights[c] for c in yb])
 
-        Xb_scaled = self.scaler.fit_transform(Xb)
+        Xb_scaled = self._transform(Xb, fit=True)
 
         dtrain = xgb.DMatrix(Xb_scaled, label=yb, weight=weight_array)
 
         evals = [(dtrain, "train")]
 
         if X_val is not None:
-            X_val_scaled = self.scaler.transform(X_val)
+            X_val_scaled = self._transform(X_val)
             dval = xgb.DMatrix(X_val_scaled, label=y_val_mapped)
             evals.append((dval, "val"))
 
         self.model = xgb.train(
-            params=self.params,
+            params={**self.params,
+                    'nthread': get_resources().resolve(self.params.get('nthread'))},
             dtrain=dtrain,
             num_boost_round=800,
             evals=evals,
@@ -150,20 +168,27 @@ class XGBClassifier:
             verbose_eval=50
         )
 
+        # The booster pickles its config; predict on the loading host's threads
+        self.model.set_param('nthread', -1)
+
         logger.info(f"[XGB] Best iteration: {self.model.best_iteration}")
         return self
 
     def predict_proba(self, X):
-        X_scaled = self.scaler.transform(X)
-        dtest = xgb.DMatrix(X_scaled)
+        dtest = xgb.DMatrix(self._transform(X))
         return self.model.predict(dtest)
 
     def predict(self, X):
+        return self.labels_from_proba(self.predict_proba(X))
+
+    def predict_with_proba(self, X):
+        """Class labels and probabilities from a single forward pass."""
         probas = self.predict_proba(X)
-        labels = np.argmax(probas, axis=1)
+        return self.labels_from_proba(probas), probas
 
-        label_map_reverse = {0: -1, 1: 0, 2: 1}
-        return np.array([label_map_reverse[a] for a in labels])
+    def labels_from_proba(self, probas):
+        """Map class probabilities to -1/0/1 labels."""
+        return np.array([-1, 0, 1])[np.argmax(probas, axis=1)]
 
     def get_feature_importance(self, importance_type='gain'):
         if self.model is None:
@@ -203,7 +228,7 @@ class XGBClassifier:
 
         inst = cls()
         inst.model = artifact["model"]
-        inst.scaler = artifact["scaler"]
+        inst.scaler = artifact.get("scaler")
         inst.feature_names = artifact.get("feature_names")
         inst.params = artifact.get("params", inst.params)
 
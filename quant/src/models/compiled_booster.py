@@ -0,0 +1,221 @@
+"""
+Compiled LightGBM inference backend (lleaves).
+
+Serving scores a single ~100-feature row per ticker, where Booster.predict's
+per-call overhead (parameter parsing, data conversion, thread start-up)
+dominates the tree traversal itself. lleaves compiles a booster into a
+native shared object with LLVM; ``CompiledBooster`` exposes the same
+``predict`` so the model wrappers use it transparently.
+
+The shared object is tuned for the CPU it was compiled on, so compile where
+you serve (e.g. during the Docker build). Each library has a sidecar JSON
+with the source booster's fingerprint and the parity error measured at
+compile time; stale or unverified libraries are never attached.
+
+Usage:
+    compiled = compile_booster(model.model, "models/AAPL_return.so")
+    max_err = verify_parity(model.model, compiled)
+    save_compiled_meta("models/AAPL_return.so", model.model, max_err)
+    ...
+    attach_compiled(model, "models/AAPL_return.so")  # at load time
+"""
+
+import hashlib
+import json
+import logging
+from pathlib import Path
+
+import lightgbm as lgb
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+try:
+    import lleaves
+    LLEAVES_AVAILABLE = True
+except ImportError:
+    lleaves = None
+    LLEAVES_AVAILABLE = False
+
+# Compiled predictions must match Booster.predict to this absolute tolerance
+PARITY_ATOL = 1e-9
+# LightGBM's kZeroThreshold, widened for its float32 round trip in the dump
+ZERO_THRESHOLD = 1e-34
+
+
+def _unwrap(booster):
+    return booster
+
+
+def booster_fingerprint(booster):
+    """Hash of the booster's serialized trees (best iteration only)."""
+    return hashlib.sha1(booster.model_to_string().encode()).hexdigest()
+
+
+def _meta_path(lib_path):
+    return Path(lib_path).with_suffix(".compiled.json")
+
+
+class CompiledBooster:
+    """
+    Drop-in stand-in for a LightGBM Booster that predicts via a compiled
+    library. Calls with extra predict kwargs (raw_score, pred_leaf, ...) and
+    every other attribute fall back to the original booster. Pickles as the
+    plain booster, so saved artifacts never depend on the native library.
+    """
+
+    def __init__(self, booster, compiled, n_jobs=1):
+        self.booster = booster
+        self.compiled = compiled
+        self.n_jobs = n_jobs
+
+    def predict(self, X, **kwargs):
+        if kwargs:
+            return self.booster.predict(X, **kwargs)
+
+        if isinstance(X, pd.DataFrame):
+            X = X.to_numpy(dtype=np.float64)
+        data = np.ascontiguousarray(X, dtype=np.float64)
+        if data.ndim == 1:
+            data = data.reshape(1, -1)
+
+        return self.compiled.predict(data, n_jobs=self.n_jobs)
+
+    def __getattr__(self, name):
+        if name in ("booster", "compiled", "n_jobs"):
+            raise AttributeError(name)
+        return getattr(self.booster, name)
+
+    def __reduce__(self):
+        return (_unwrap, (self.booster,))
+
+
+def _load_lleaves(model_file, lib_path):
+    compiled = lleaves.Model(model_file=str(model_file))
+    # Compiles and writes lib_path, or loads it if it already exists
+    compiled.compile(cache=str(lib_path))
+    return compiled
+
+
+def compile_booster(booster, lib_path, n_jobs=1):
+    """
+    Compile a LightGBM booster to ``lib_path`` (overwriting it).
+
+    Returns:
+        CompiledBooster wrapping ``booster``
+    """
+    if not LLEAVES_AVAILABLE:
+        raise ImportError("lleaves is required to compile boosters")
+
+    lib_path = Path(lib_path)
+    model_file = lib_path.with_suffix(".txt")
+    model_file.write_text(booster.model_to_string())
+
+    for stale in (lib_path, _meta_path(lib_path)):
+        stale.unlink(missing_ok=True)
+
+    return CompiledBooster(booster, _load_lleaves(model_file, lib_path), n_jobs=n_jobs)
+
+
+def save_compiled_meta(lib_path, booster, max_error):
+    """Mark a compiled library as verified for this exact booster."""
+    with open(_meta_path(lib_path), "w") as f:
+        json.dump({
+            "model_sha1": booster_fingerprint(booster),
+            "parity_max_abs_error": float(max_error),
+            "lleaves_version": getattr(lleaves, "__version__", None),
+        }, f, indent=2)
+
+
+def remove_compiled(lib_path):
+    lib_path = Path(lib_path)
+    for path in (lib_path, lib_path.with_suffix(".txt"), _meta_path(lib_path)):
+        path.unlink(missing_ok=True)
+
+
+def attach_compiled(model, lib_path, n_jobs=1):
+    """
+    Swap ``model.model`` for its compiled library when one exists, passed
+    parity and was built from this exact booster.
+
+    Returns:
+        True if the compiled backend was attached
+    """
+    lib_path = Path(lib_path)
+    booster = getattr(model, "model", None)
+    meta_path = _meta_path(lib_path)
+
+    if not LLEAVES_AVAILABLE or not isinstance(booster, lgb.Booster):
+        return False
+    if not lib_path.exists() or not meta_path.exists():
+        return False
+
+    try:
+        with open(meta_path, "r") as f:
+            meta = json.load(f)
+        if meta.get("model_sha1") != booster_fingerprint(booster):
+            logger.warning(f"[Compiled] Ignoring stale library {lib_path.name}")
+            return False
+
+        compiled = _load_lleaves(lib_path.with_suffix(".txt"), lib_path)
+    except Exception as e:
+        logger.warning(f"[Compiled] Failed to load {lib_path.name}: {e}")
+        return False
+
+    model.model = CompiledBooster(booster, compiled, n_jobs=n_jobs)
+    return True
+
+
+def split_thresholds(booster):
+    """Numerical split thresholds per feature index, from the tree dump."""
+    thresholds = {}
+
+    def walk(node):
+        if "split_feature" not in node:
+            return
+        if node["decision_type"] == "<=":  # categorical "a||b" splits have no threshold
+            threshold = float(node["threshold"])
+            # LightGBM encodes splits at zero as +-kZeroThreshold (1e-35)
+            if abs(threshold) <= ZERO_THRESHOLD:
+                threshold = 0.0
+            thresholds.setdefault(node["split_feature"], set()).add(threshold)
+        walk(node["left_child"])
+        walk(node["right_child"])
+
+    for tree in booster.dump_model()["tree_info"]:
+        walk(tree["tree_structure"])
+
+    return {f: np.array(sorted(t)) for f, t in thresholds.items()}
+
+
+def parity_inputs(booster, n_rows=2000, missing_rate=0.02, seed=0):
+    """
+    Rows that exercise every split boundary: each value sits exactly on, just
+    below or just above a random threshold of its feature, with some NaNs.
+    """
+    rng = np.random.default_rng(seed)
+    n_features = booster.num_feature()
+    thresholds = split_thresholds(booster)
+
+    X = rng.standard_normal((n_rows, n_features))
+    for f, values in thresholds.items():
+        picked = rng.choice(values, size=n_rows)
+        nudge = rng.choice([-1.0, 0.0, 1.0], size=n_rows)
+        X[:, f] = picked + nudge * 1e-7 * (1.0 + np.abs(picked))
+
+    X[rng.random(X.shape) < missing_rate] = np.nan
+    return X
+
+
+def verify_parity(booster, compiled, X=None, n_rows=2000):
+    """
+    Max absolute difference between Booster.predict and the compiled
+    predict on ``X`` (boundary-probing synthetic rows when None).
+    """
+    if X is None:
+        X = parity_inputs(booster, n_rows=n_rows)
+
+    expected = booster.predict(X)
+    actual = compiled.predict(X)
+    return float(np.max(np.abs(np.asarray(expected) - np.asarray(actual))))
@@ -0,0 +1,152 @@
+"""
+Process-wide compute resource manager.
+
+Probes the hardware once per process (GPU via nvidia-smi, usable CPU cores
+via the scheduler affinity mask) and hands out thread budgets so that
+models trained inside parallel workers do not each grab every core.
+
+Thread budget resolution, most specific first:
+    1. ``allocate(n)`` context on the current thread (thread pools)
+    2. ``set_threads(n)`` for the whole process (worker processes)
+    3. ``QUANT_NUM_THREADS`` environment variable
+    4. ``OMP_NUM_THREADS`` (e.g. the per-worker split gunicorn.conf.py sets)
+    5. All usable cores
+
+Budgets are resolved when a model trains, never stored in its params:
+saved artifacts keep ``-1`` so whichever host loads them decides.
+
+torch's intra-op pool is process-global, so ``configure_torch`` only
+follows the process budget (2.-5.); ``allocate`` does not scope it.
+
+Usage:
+    resources = get_resources()
+    train_params = {**params, "num_threads": resources.resolve(params.get("num_threads"))}
+
+    per_worker = resources.partition(n_workers)
+    with resources.allocate(per_worker):
+        model.fit(X, y)
+"""
+
+import logging
+import os
+import subprocess
+import threading
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+THREADS_ENV = "QUANT_NUM_THREADS"
+OMP_THREADS_ENV = "OMP_NUM_THREADS"
+
+
+def _usable_cores():
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:  # macOS / Windows
+        return os.cpu_count() or 1
+
+
+class ComputeResources:
+    """Hardware probe results and thread budgets for this process."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._gpu_available = None
+        self._torch_threads = None
+
+        self.cores = _usable_cores()
+        env_threads = os.environ.get(THREADS_ENV) or os.environ.get(OMP_THREADS_ENV)
+        self._process_threads = (
+            max(1, int(env_threads)) if env_threads else self.cores)
+
+    def gpu_available(self):
+        """Probe for an NVIDIA GPU once; later calls return the cached result."""
+        with self._lock:
+            if self._gpu_available is None:
+                self._gpu_available = False
+                try:
+                    result = subprocess.run(
+                        ['nvidia-smi'], capture_output=True, text=True, timeout=2)
+                    self._gpu_available = result.returncode == 0
+                except (OSError, subprocess.SubprocessError):
+                    pass
+
+                if self._gpu_available:
+                    logger.info("[GPU] NVIDIA GPU detected - using GPU")
+                else:
+                    logger.info("[CPU] GPU not available - using CPU")
+
+            return self._gpu_available
+
+    def threads(self):
+        """Thread budget for a model created/trained on the calling thread."""
+        return getattr(self._local, "threads", None) or self._process_threads
+
+    def resolve(self, n_threads=None):
+        """
+        Concrete thread count for a persisted setting: positive values are
+        kept, ``None``/``0``/``-1`` ("use the host") become ``threads()``.
+        """
+        if n_threads is not None and int(n_threads) > 0:
+            return int(n_threads)
+        return self.threads()
+
+    def process_threads(self):
+        """The process-wide budget, ignoring any ``allocate`` on this thread."""
+        return self._process_threads
+
+    def set_threads(self, n_threads):
+        """Set the process-wide budget (e.g. in a worker process)."""
+        self._process_threads = max(1, int(n_threads))
+
+    def partition(self, n_workers):
+        """Per-worker budget when ``n_workers`` share this process' budget."""
+        return max(1, self._process_threads // max(1, n_workers))
+
+    @contextmanager
+    def allocate(self, n_threads):
+        """Temporarily give the calling thread its own budget."""
+        previous = getattr(self._local, "threads", None)
+        self._local.threads = max(1, int(n_threads))
+        try:
+            yield self._local.threads
+        finally:
+            self._local.threads = previous
+
+    def configure_torch(self, n_threads=None, interop_threads=None):
+        """
+        Apply a thread budget to torch intra-op parallelism (if changed).
+
+        torch's thread pool is shared by the whole process, so the default
+        is the process budget rather than a per-thread ``allocate`` budget.
+        ``interop_threads`` can only be set before torch starts any parallel
+        work; later requests are logged and ignored.
+        """
+        import torch
+
+        n_threads = n_threads or self._process_threads
+        if n_threads != self._torch_threads:
+            torch.set_num_threads(n_threads)
+            self._torch_threads = n_threads
+
+        if interop_threads and torch.get_num_interop_threads() != interop_threads:
+            try:
+                torch.set_num_interop_threads(interop_threads)
+            except RuntimeError:
+                logger.debug("[CPU] Inter-op threads already fixed for this process")
+        return n_threads
+
+
+_resources = None
+_resources_lock = threading.Lock()
+
+
+def get_resources():
+    """The process-wide ComputeResources instance."""
+    global _resources
+    if _resources is None:
+        with _resources_lock:
+            if _resources is None:
+                _resources = ComputeResources()
+    return _resources
@@ -0,0 +1,108 @@
+"""
+CPU-throughput training helpers for the deep sequence classifiers.
+
+Training hosts without a GPU spend most of their time in fp32 GEMMs and
+batch assembly. The CPU-optimized mode:
+    - splits the thread budget between intra-op threads and loader workers
+    - runs forward passes under bfloat16 autocast when the CPU supports it
+      (AVX512-BF16 / AMX); weights and optimizer state stay fp32
+    - optionally wraps the model with torch.compile
+    - prefetches batches in persistent DataLoader workers
+    - keeps the best validation state, writing a checkpoint only when the
+      validation loss improves
+"""
+import contextlib
+import copy
+import logging
+
+import torch
+
+from ..compute_resources import get_resources
+
+logger = logging.getLogger(__name__)
+
+
+def bf16_supported() -> bool:
+    """True if the CPU has native bfloat16 kernels (oneDNN)."""
+    try:
+        return bool(torch.ops.mkldnn._is_mkldnn_bf16_supported())
+    except (AttributeError, RuntimeError):
+        return False
+
+
+def autocast(device: torch.device, enabled: bool):
+    """bfloat16 autocast on CPU when enabled, otherwise a no-op context."""
+    if enabled and device.type == 'cpu':
+        return torch.autocast(device_type='cpu', dtype=torch.bfloat16)
+    return contextlib.nullcontext()
+
+
+def maybe_compile(model: torch.nn.Module, enabled: bool) -> torch.nn.Module:
+    """torch.compile the model if requested and available (else unchanged)."""
+    if not enabled:
+        return model
+    if not hasattr(torch, 'compile'):
+        logger.warning("torch.compile unavailable (torch < 2.0) - running eagerly")
+        return model
+    return torch.compile(model)
+
+
+def configure_cpu_threads(num_threads=None, loader_workers=0):
+    """
+    Apply the thread budget for CPU training: loader workers take their
+    cores out of the budget, the rest go to intra-op parallelism, and
+    inter-op parallelism is pinned to one thread (the models are sequential).
+
+    Returns:
+        Intra-op thread count
+    """
+    budget = num_threads or get_resources().process_threads()
+    intra = max(1, budget - loader_workers)
+    return get_resources().configure_torch(intra, interop_threads=1)
+
+
+def loader_options(device: torch.device, workers: int) -> dict:
+    """DataLoader kwargs for prefetching workers (pinned only when feeding a GPU)."""
+    if workers <= 0:
+        return {}
+    return {
+        'num_workers': workers,
+        'persistent_workers': True,
+        'prefetch_factor': 4,
+        'pin_memory': device.type == 'cuda',
+    }
+
+
+class BestStateCheckpoint:
+    """
+    Tracks the best validation loss, snapshotting the weights (and optionally
+    saving a checkpoint) only when it improves.
+    """
+
+    def __init__(self, save_fn=None, keep_best=True):
+        """
+        Args:
+            save_fn: Called with no arguments after each improvement
+                (e.g. ``lambda: classifier.save(path)``)
+            keep_best: Snapshot the best weights so ``restore`` can reload
+                them; when False only the loss is tracked
+        """
+        self.best_loss = float('inf')
+        self.best_state = None
+        self.save_fn = save_fn
+        self.keep_best = keep_best
+
+    def update(self, loss: float, model: torch.nn.Module) -> bool:
+        if loss >= self.best_loss:
+            return False
+
+        self.best_loss = loss
+        if self.keep_best:
+            self.best_state = copy.deepcopy(model.state_dict())
+        if self.save_fn is not None:
+            self.save_fn()
+        return True
+
+    def restore(self, model: torch.nn.Module):
+        if self.best_state is not None:
+            model.load_state_dict(self.best_state)
@@ -0,0 +1,111 @@
+"""
+Sliding-window sequence datasets for the deep sequence classifiers.
+
+The classifiers see every ``sequence_length``-row window of the scaled
+feature matrix. Materializing all windows up front costs
+n × sequence_length × F floats; these helpers keep only the n × F matrix
+and gather windows per batch, so peak memory no longer scales with the
+window length (the index-based equivalent of a strided sliding-window view).
+"""
+import numpy as np
+import torch
+from torch.utils.data import DataLoader, Dataset, default_collate
+
+
+class SlidingWindowDataset(Dataset):
+    """
+    Dataset of (window, label) pairs over a 2D feature matrix.
+
+    Item ``i`` is rows ``i .. i + sequence_length - 1`` with the label of the
+    last row. Batches are gathered with one indexing op via ``__getitems__``.
+    """
+
+    def __init__(self, X: np.ndarray, y: np.ndarray = None,
+                 sequence_length: int = 20, device=None):
+        """
+        Args:
+            X: Scaled features (n_samples, n_features)
+            y: Class indices (n_samples,), or None for inference
+            sequence_length: Rows per window
+            device: Device to keep the base matrix on (windows are gathered there)
+        """
+        self.sequence_length = sequence_length
+        self.X = torch.from_numpy(
+            np.ascontiguousarray(X, dtype=np.float32)).to(device)
+        self.y = None
+        if y is not None:
+            self.y = torch.from_numpy(np.asarray(y, dtype=np.int64)).to(device)
+
+        self._offsets = torch.arange(sequence_length, device=self.X.device)
+
+    @property
+    def n_features(self) -> int:
+        return self.X.shape[1]
+
+    def __len__(self):
+        return max(0, len(self.X) - self.sequence_length + 1)
+
+    def windows(self, indices):
+        """Gather windows starting at ``indices`` -> (len(indices), L, F)."""
+        starts = torch.as_tensor(indices, dtype=torch.long, device=self.X.device)
+        return self.X[starts.unsqueeze(1) + self._offsets]
+
+    def labels(self, indices):
+        starts = torch.as_tensor(indices, dtype=torch.long, device=self.y.device)
+        return self.y[starts + self.sequence_length - 1]
+
+    def __getitem__(self, i):
+        window = self.X[i:i + self.sequence_length]
+        if self.y is None:
+            return window
+        return window, self.y[i + self.sequence_length - 1]
+
+    def __getitems__(self, indices):
+        if self.y is None:
+            return self.windows(indices)
+        return self.windows(indices), self.labels(indices)
+
+
+def collate_windows(batch):
+    """Pass through pre-batched ``__getitems__`` output (older torch: stack items)."""
+    if isinstance(batch, list):
+        return default_collate(batch)
+    return batch
+
+
+def window_loader(dataset: SlidingWindowDataset, batch_size: int,
+                  shuffle: bool = False, **kwargs) -> DataLoader:
+    """DataLoader yielding batched windows from a SlidingWindowDataset."""
+    return DataLoader(dataset, batch_size=batch_size, shuffle=shuffle,
+                      collate_fn=collate_windows, **kwargs)
+
+
+class RollingWindowBuffer:
+    """
+    Last ``sequence_length`` scaled rows of one stream (e.g. a ticker), for
+    scoring only the newest window as rows arrive.
+    """
+
+    def __init__(self, sequence_length: int):
+        self.sequence_length = sequence_length
+        self.rows = None
+
+    def __len__(self):
+        return 0 if self.rows is None else len(self.rows)
+
+    def append(self, rows: np.ndarray):
+        rows = np.atleast_2d(np.asarray(rows, dtype=np.float32))
+        if self.rows is not None:
+            rows = np.vstack([self.rows, rows])
+        self.rows = rows[-self.sequence_length:]
+
+    def window(self) -> np.ndarray:
+        """
+        Newest window (1, sequence_length, F); short histories are padded
+        with their first row, matching the classifiers' predict_proba.
+        """
+        rows = self.rows
+        if len(rows) < self.sequence_length:
+            padding = np.repeat(rows[0:1], self.sequence_length - len(rows), axis=0)
+            rows = np.vstack([padding, rows])
+        return rows[np.newaxis]
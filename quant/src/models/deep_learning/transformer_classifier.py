@@ -5,14 +5,20 @@ Uses attention mechanisms for capturing long-range dependencies.
 import torch
 import torch.nn as nn
 import torch.optim as optim
-from torch.utils.data import DataLoader, TensorDataset
 import numpy as np
 import pandas as pd
 from sklearn.preprocessing import StandardScaler
 import logging
 import math
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import Optional
+
+from ..compute_resources import get_resources
+from .cpu_training import (
+    BestStateCheckpoint, autocast, bf16_supported, configure_cpu_threads,
+    loader_options, maybe_compile
+)
+from .sequence_data import RollingWindowBuffer, SlidingWindowDataset, window_loader
 
 logger = logging.getLogger(__name__)
 
@@ -134,7 +140,12 @@ class TransformerClassifier:
         epochs: int = 100,
         patience: int = 15,
         sequence_length: int = 30,
-        device: Optional[str] = None
+        device: Optional[str] = None,
+        num_threads: Optional[int] = None,
+        cpu_optimized: bool = False,
+        compile_model: bool = False,
+        loader_workers: int = 2,
+        checkpoint_path: Optional[str] = None
     ):
         """
         Initialize Transformer classifier.
@@ -151,6 +162,13 @@ class TransformerClassifier:
             patience: Early stopping patience
             sequence_length: Length of input sequences
             device: Device to use ('cuda', 'cpu', or None for auto)
+            num_threads: CPU threads for torch (None = process budget)
+            cpu_optimized: CPU throughput mode (bf16 autocast when supported,
+                prefetching loader workers, budgeted intra/inter-op threads);
+                training also ends on the best-validation weights
+            compile_model: Train through torch.compile
+            loader_workers: DataLoader workers in CPU-optimized mode
+            checkpoint_path: Save a checkpoint here whenever val loss improves
         """
         self.d_model = d_model
         self.nhead = nhead
@@ -171,22 +189,22 @@ class TransformerClassifier:
             self.device = torch.device(device)
 
         logger.info(f"Using device: {self.device}")
+        self.num_threads = num_threads
+        self.cpu_optimized = cpu_optimized
+        self.compile_model = compile_model
+        self.loader_workers = loader_workers
+        self.checkpoint_path = checkpoint_path
 
         self.model = None
         self.scaler = StandardScaler()
         self.feature_names = None
         self.best_loss = float('inf')
+        self._window_buffers = {}
 
-    def _create_sequences(self, X: np.ndarray, y: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
-        """Create sequences for Transformer input."""
-        sequences = []
-        labels = []
-
-        for i in range(len(X) - self.sequence_length + 1):
-            sequences.append(X[i:i + self.sequence_length])
-            labels.append(y[i + self.sequence_length - 1])
-
-        return np.array(sequences), np.array(labels)
+    def _configure_threads(self):
+        """Apply the torch CPU thread budget (no-op on GPU)."""
+        if self.device.type == 'cpu':
+            get_resources().configure_torch(getattr(self, 'num_threads', None))
 
     def fit(self, X, y, X_val=None, y_val=None):
         """
@@ -198,6 +216,17 @@ class TransformerClassifier:
             X_val: Validation features
             y_val: Validation labels
         """
+        cpu_mode = self.cpu_optimized and self.device.type == 'cpu'
+        if cpu_mode:
+            configure_cpu_threads(self.num_threads, self.loader_workers)
+            use_bf16 = bf16_supported()
+            loader_kwargs = loader_options(self.device, self.loader_workers)
+            logger.info(f"CPU-optimized training (bf16={use_bf16}, "
+                        f"workers={self.loader_workers})")
+        else:
+            self._configure_threads()
+            use_bf16 = False
+            loader_kwargs = {}
         logger.info(f"Training Transformer on {len(X)} samples...")
 
         # Store feature names
@@ -215,20 +244,15 @@ class TransformerClassifier:
         # Scale features
         X_scaled = self.scaler.fit_transform(X)
 
-        # Create sequences
-        X_seq, y_seq = self._create_sequences(X_scaled, y_mapped)
+        # Create sequences (gathered per batch, not materialized up front)
+        dataset = SlidingWindowDataset(
+            X_scaled, y_mapped, self.sequence_length, device=self.device)
 
         logger.info(
-            f"Created {len(X_seq)} sequences of length {self.sequence_length}")
+            f"Created {len(dataset)} sequences of length {self.sequence_length}")
 
-        # Convert to tensors
-        X_tensor = torch.FloatTensor(X_seq).to(self.device)
-        y_tensor = torch.LongTensor(y_seq).to(self.device)
-
-        # Create data loader
-        dataset = TensorDataset(X_tensor, y_tensor)
-        train_loader = DataLoader(
-            dataset, batch_size=self.batch_size, shuffle=True)
+        train_loader = window_loader(
+            dataset, batch_size=self.batch_size, shuffle=True, **loader_kwargs)
 
         # Validation data
         if X_val is not None and y_val is not None:
@@ -239,20 +263,15 @@ class TransformerClassifier:
 
             y_val_mapped = np.array([label_map.get(yi, yi) for yi in y_val])
             X_val_scaled = self.scaler.transform(X_val)
-            X_val_seq, y_val_seq = self._create_sequences(
-                X_val_scaled, y_val_mapped)
-
-            X_val_tensor = torch.FloatTensor(X_val_seq).to(self.device)
-            y_val_tensor = torch.LongTensor(y_val_seq).to(self.device)
-
-            val_dataset = TensorDataset(X_val_tensor, y_val_tensor)
-            val_loader = DataLoader(
-                val_dataset, batch_size=self.batch_size, shuffle=False)
+            val_dataset = SlidingWindowDataset(
+                X_val_scaled, y_val_mapped, self.sequence_length, device=self.device)
+            val_loader = window_loader(
+                val_dataset, batch_size=self.batch_size, shuffle=False, **loader_kwargs)
         else:
             val_loader = None
 
         # Initialize model
-        input_dim = X_seq.shape[2]
+        input_dim = dataset.n_features
         self.model = TransformerModel(
             input_dim=input_dim,
             d_model=self.d_model,
@@ -270,8 +289,14 @@ class TransformerClassifier:
         scheduler = optim.lr_scheduler.CosineAnnealingWarmRestarts(
             optimizer, T_0=10, T_mult=2)
 
+        train_model = maybe_compile(self.model, self.compile_model)
+        # Only CPU-optimized mode ends on the best-validation weights;
+        # default training keeps the last epoch's weights as before
+        checkpoint = BestStateCheckpoint(
+            save_fn=(lambda: self.save(self.checkpoint_path)) if self.checkpoint_path else None,
+            keep_best=self.cpu_optimized)
+
         # Training loop
-        best_val_loss = float('inf')
         patience_counter = 0
 
         for epoch in range(self.epochs):
@@ -280,8 +305,9 @@ class TransformerClassifier:
             train_loss = 0
             for batch_X, batch_y in train_loader:
                 optimizer.zero_grad()
-                outputs = self.model(batch_X)
-                loss = criterion(outputs, batch_y)
+                with autocast(self.device, use_bf16):
+                    outputs = train_model(batch_X)
+                    loss = criterion(outputs, batch_y)
                 loss.backward()
                 torch.nn.utils.clip_grad_norm_(
                     self.model.parameters(), max_norm=1.0)
@@ -297,15 +323,15 @@ class TransformerClassifier:
                 val_loss = 0
                 with torch.no_grad():
                     for batch_X, batch_y in val_loader:
-                        outputs = self.model(batch_X)
-                        loss = criterion(outputs, batch_y)
+                        with autocast(self.device, use_bf16):
+                            outputs = train_model(batch_X)
+                            loss = criterion(outputs, batch_y)
                         val_loss += loss.item()
 
                 val_loss /= len(val_loader)
 
-                # Early stopping
-                if val_loss < best_val_loss:
-                    best_val_loss = val_loss
+                # Early stopping (snapshot/checkpoint only on improvement)
+                if checkpoint.update(val_loss, self.model):
                     patience_counter = 0
                     self.best_loss = val_loss
                 else:
@@ -323,11 +349,20 @@ class TransformerClassifier:
                     logger.info(
                         f"Epoch {epoch+1}/{self.epochs} - Train Loss: {train_loss:.4f}")
 
+        checkpoint.restore(self.model)
         logger.info("Training complete")
         return self
 
-    def predict_proba(self, X):
-        """Predict probabilities."""
+    def predict_proba(self, X, batch_size: Optional[int] = None):
+        """
+        Predict probabilities for every window of X.
+
+        Args:
+            X: Features, oldest row first
+            batch_size: Windows per forward pass (default: training batch
+                size); bounds memory for long backfills
+        """
+        self._configure_threads()
         if isinstance(X, pd.DataFrame):
             X = X.values
 
@@ -339,25 +374,73 @@ class TransformerClassifier:
                 X_scaled[0:1], self.sequence_length - len(X_scaled), axis=0)
             X_scaled = np.vstack([padding, X_scaled])
 
-        X_seq, _ = self._create_sequences(X_scaled, np.zeros(len(X_scaled)))
+        dataset = SlidingWindowDataset(
+            X_scaled, sequence_length=self.sequence_length, device=self.device)
+
+        self.model.eval()
+        probas = []
+        with torch.no_grad():
+            for batch_X in window_loader(dataset, batch_size=batch_size or self.batch_size):
+                outputs = self.model(batch_X)
+                probas.append(torch.softmax(outputs, dim=1))
+
+        probas = torch.cat(probas)
 
-        X_tensor = torch.FloatTensor(X_seq).to(self.device)
+        return probas.cpu().numpy()
+
+    def predict_latest(self, X, key: str = "default"):
+        """
+        Streaming inference: append new rows to ``key``'s rolling window and
+        score only the newest window.
+
+        Feeding a history row by row gives the same result as the last row
+        of ``predict_proba`` on the full history.
+
+        Args:
+            X: One or more new feature rows, oldest first
+            key: Stream identifier (e.g. ticker)
+
+        Returns:
+            Probabilities for the newest window, shape (1, 3)
+        """
+        self._configure_threads()
+        if isinstance(X, pd.DataFrame):
+            X = X.values
+
+        buffers = self.__dict__.setdefault('_window_buffers', {})
+        buffer = buffers.get(key)
+        if buffer is None:
+            buffer = buffers[key] = RollingWindowBuffer(self.sequence_length)
+        buffer.append(self.scaler.transform(np.atleast_2d(X)))
+
+        X_tensor = torch.from_numpy(buffer.window()).to(self.device)
 
         self.model.eval()
         with torch.no_grad():
-            outputs = self.model(X_tensor)
-            probas = torch.softmax(outputs, dim=1)
+            probas = torch.softmax(self.model(X_tensor), dim=1)
 
         return probas.cpu().numpy()
 
+    def reset_stream(self, key: Optional[str] = None):
+        """Drop the rolling window for ``key`` (all streams if None)."""
+        buffers = self.__dict__.setdefault('_window_buffers', {})
+        if key is None:
+            buffers.clear()
+        else:
+            buffers.pop(key, None)
+
     def predict(self, X):
         """Predict class labels."""
+        return self.labels_from_proba(self.predict_proba(X))
+
+    def predict_with_proba(self, X):
+        """Class labels and probabilities from a single forward pass."""
         probas = self.predict_proba(X)
-        labels = np.argmax(probas, axis=1)
+        return self.labels_from_proba(probas), probas
 
-        # Map back to -1, 0, 1
-        label_map_reverse = {0: -1, 1: 0, 2: 1}
-        return np.array([label_map_reverse[l] for l in labels])
+    def labels_from_proba(self, probas):
+        """Map class probabilities to -1/0/1 labels."""
+        return np.array([-1, 0, 1])[np.argmax(probas, axis=1)]
 
     def save(self, path: str):
         """Save model."""
@@ -7,10 +7,15 @@ import numpy as np
 import pandas as pd
 from typing import List, Any, Dict, Optional
 from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_score
+from contextlib import contextmanager
 import logging
+import threading
 
 logger = logging.getLogger(__name__)
 
+# Class index (0, 1, 2) -> trading label (-1, 0, 1)
+CLASS_LABELS = np.array([-1, 0, 1])
+
 
 def compute_model_score(y_true, y_pred):
     """
@@ -23,9 +28,29 @@ def compute_model_score(y_true, y_pred):
         return 0.0
 
 
+def member_labels(model, probas, X):
+    """A member's -1/0/1 predictions, reusing its probabilities when it can."""
+    if hasattr(model, "labels_from_proba"):
+        return model.labels_from_proba(probas)
+    return model.predict(X)
+
+
+def _classification_scores(y, y_pred):
+    return {
+        "accuracy": accuracy_score(y, y_pred),
+        "precision": precision_score(y, y_pred, average='macro', zero_division=0),
+        "recall": recall_score(y, y_pred, average='macro', zero_division=0),
+        "f1": f1_score(y, y_pred, average='macro', zero_division=0)
+    }
+
+
 class EnsembleClassifier:
     """
     Ensemble classifier with improved weighted averaging, voting, and stacking.
+
+    Inside ``with ensemble.batch_cache(X):`` every prediction on that same X
+    object reuses one pass over the members. The cache is per thread and
+    ends with the block, so nothing outlives a batch or a refit.
     """
 
     def __init__(self, models: List[Any], strategy: str = "weighted", weights: Optional[List[float]] = None):
@@ -34,21 +59,52 @@ class EnsembleClassifier:
         self.weights = weights
         self.meta_model = None
         self.validation_scores = None
+        self._batch = threading.local()
 
         if strategy == "weighted" and weights is None:
             logger.info(
                 "[Ensemble] Using equal weights until validation weighting occurs.")
             self.weights = [1.0 / len(models)] * len(models)
 
-    def compute_weights(self, X_val, y_val, power=2.0):
-        preds = []
-        scores = []
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state.pop("_batch", None)
+        return state
+
+    def __setstate__(self, state):
+        state.pop("_proba_cache", None)  # content-hash cache of older artifacts
+        self.__dict__.update(state)
+        self._batch = threading.local()
+
+    @contextmanager
+    def batch_cache(self, X):
+        """Run each member once on X for every prediction on X in the block."""
+        previous = getattr(self._batch, "entry", None)
+        self._batch.entry = (X, self._predict_members(X))
+        try:
+            yield self._batch.entry[1]
+        finally:
+            self._batch.entry = previous
+
+    def _predict_members(self, X):
+        return np.stack([np.asarray(m.predict_proba(X)) for m in self.models])
+
+    def member_probas(self, X):
+        """
+        Stacked member probabilities, shape (n_models, n_samples, n_classes).
+        Reuses the enclosing ``batch_cache`` when it was opened on this X.
+        """
+        entry = getattr(self._batch, "entry", None)
+        if entry is not None and entry[0] is X:
+            return entry[1]
+        return self._predict_members(X)
 
-        for model in self.models:
-            y_pred = model.predict(X_val)
-            score = compute_model_score(y_val, y_pred)
-            scores.append(score)
-            preds.append(y_pred)
+    def compute_weights(self, X_val, y_val, power=2.0):
+        all_probs = self.member_probas(X_val)
+        scores = [
+            compute_model_score(y_val, member_labels(m, probs, X_val))
+            for m, probs in zip(self.models, all_probs)
+        ]
 
         self.validation_scores = scores
 
@@ -70,8 +126,7 @@ class EnsembleClassifier:
     def fit_meta_model(self, X_train, y_train, X_val=None, y_val=None):
         from .base.lgbm_classifier import LGBMClassifier
 
-        train_probs = [m.predict_proba(X_train) for m in self.models]
-        X_meta = np.hstack(train_probs)
+        X_meta = np.hstack(self.member_probas(X_train))
 
         params = {
             "objective": "multiclass",
@@ -85,8 +140,7 @@ class EnsembleClassifier:
         self.meta_model = LGBMClassifier(params=params)
 
         if X_val is not None:
-            val_probs = [m.predict_proba(X_val) for m in self.models]
-            X_val_meta = np.hstack(val_probs)
+            X_val_meta = np.hstack(self.member_probas(X_val))
             self.meta_model.fit(X_meta, y_train, X_val_meta, y_val)
         else:
             self.meta_model.fit(X_meta, y_train)
@@ -95,22 +149,21 @@ class EnsembleClassifier:
 
     # Probability Prediction
     def predict_proba(self, X):
-        all_probs = [m.predict_proba(X) for m in self.models]
+        all_probs = self.member_probas(X)
 
         if self.strategy == "average":
-            return np.mean(all_probs, axis=0)
+            return all_probs.mean(axis=0)
 
         elif self.strategy == "weighted":
-            return sum(w * p for w, p in zip(self.weights, all_probs))
+            return np.tensordot(np.asarray(self.weights, dtype=float), all_probs, axes=1)
 
         elif self.strategy == "voting":
-            votes = np.zeros_like(all_probs[0])
-            for probs in all_probs:
-                class_preds = np.argmax(probs, axis=1)
-                for i, pred in enumerate(class_preds):
-                    votes[i, pred] += 1
-            votes = votes / len(self.models)
-            return votes
+            n_models, n_samples, n_classes = all_probs.shape
+            class_preds = np.argmax(all_probs, axis=2)
+            # Flat (sample, class) cell index per member vote
+            cells = np.arange(n_samples) * n_classes + class_preds
+            votes = np.bincount(cells.ravel(), minlength=n_samples * n_classes)
+            return votes.reshape(n_samples, n_classes) / n_models
 
         elif self.strategy == "stacking":
             meta_input = np.hstack(all_probs)
@@ -120,33 +173,27 @@ class EnsembleClassifier:
             raise ValueError(f"Unknown ensemble strategy: {self.strategy}")
 
     def predict(self, X):
-        probas = self.predict_proba(X)
-        labels = np.argmax(probas, axis=1)
+        return self.predict_with_proba(X)[0]
 
-        label_map_reverse = {0: -1, 1: 0, 2: 1}
-        return np.array([label_map_reverse[l] for l in labels])
+    def predict_with_proba(self, X):
+        """Class labels and probabilities from a single pass over the members."""
+        probas = self.predict_proba(X)
+        return CLASS_LABELS[np.argmax(probas, axis=1)], probas
 
     def evaluate(self, X, y):
-        y_pred = self.predict(X)
+        with self.batch_cache(X) as all_probs:
+            y_pred = self.predict(X)
 
         results = {
-            "ensemble": {
-                "accuracy": accuracy_score(y, y_pred),
-                "precision": precision_score(y, y_pred, average='macro', zero_division=0),
-                "recall": recall_score(y, y_pred, average='macro', zero_division=0),
-                "f1": f1_score(y, y_pred, average='macro', zero_division=0)
-            },
+            "ensemble": _classification_scores(y, y_pred),
             "individual_models": []
         }
 
-        for i, m in enumerate(self.models):
-            yp = m.predict(X)
+        for i, (m, probs) in enumerate(zip(self.models, all_probs)):
+            yp = member_labels(m, probs, X)
             results["individual_models"].append({
                 "model": f"{m.__class__.__name__}_{i}",
-                "accuracy": accuracy_score(y, yp),
-                "precision": precision_score(y, yp, average='macro', zero_division=0),
-                "recall": recall_score(y, yp, average='macro', zero_division=0),
-                "f1": f1_score(y, yp, average='macro', zero_division=0)
+                **_classification_scores(y, yp)
             })
 
         return results
@@ -230,5 +277,8 @@ class QuantModel:
     def predict_proba(self, X):
         return self.ensemble.predict_proba(X)
 
+    def predict_with_proba(self, X):
+        return self.ensemble.predict_with_proba(X)
+
     def evaluate(self, X, y):
         return self.ensemble.evaluate(X, y)
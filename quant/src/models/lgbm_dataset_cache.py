@@ -0,0 +1,129 @@
+"""
+LightGBM Dataset cache for hyperparameter tuning.
+
+Tuning trials only change booster parameters, so the binned training and
+validation Datasets can be constructed once and reused by every trial.
+With a cache directory the binned Datasets are also persisted via
+``save_binary``, keyed by a hash of the data, so reruns on unchanged data
+skip construction entirely.
+
+Usage:
+    cache = LGBMDatasetCache(cache_dir="cache/lgbm_datasets")
+    train_data, val_data = cache.build(X_train, y_train, X_val, y_val, weight=w)
+"""
+
+import hashlib
+import logging
+import os
+from pathlib import Path
+
+import lightgbm as lgb
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Dataset-level parameters shared by all trials. Pre-filtering is disabled so
+# trials can lower min_data_in_leaf / min_child_samples without re-binning.
+DATASET_PARAMS = {
+    "max_bin": 255,
+    "feature_pre_filter": False,
+    "verbosity": -1,
+}
+
+
+def dataset_fingerprint(*arrays, params=None):
+    """
+    Hash the contents of feature/label/weight arrays plus dataset params.
+
+    Used as the on-disk cache key, so any change in data, column order or
+    binning parameters produces a different binary file.
+    """
+    h = hashlib.sha1()
+    h.update(lgb.__version__.encode())
+    h.update(repr(sorted((params or {}).items())).encode())
+
+    for arr in arrays:
+        if arr is None:
+            h.update(b"<none>")
+            continue
+        if isinstance(arr, pd.DataFrame):
+            h.update(",".join(map(str, arr.columns)).encode())
+        values = np.ascontiguousarray(np.asarray(arr))
+        h.update(f"{values.dtype}{values.shape}".encode())
+        h.update(memoryview(values).cast("B"))
+
+    return h.hexdigest()
+
+
+class LGBMDatasetCache:
+    """
+    Builds binned LightGBM Datasets once, optionally persisting them to disk.
+
+    Returned Datasets are constructed with ``free_raw_data=False`` so they can
+    be passed to ``lgb.train`` repeatedly; per-trial sample weights can be
+    swapped in with ``Dataset.set_weight`` without re-binning.
+    """
+
+    def __init__(self, cache_dir=None, params=None):
+        """
+        Args:
+            cache_dir: Directory for ``save_binary`` files (None = memory only)
+            params: Extra dataset-level params merged over DATASET_PARAMS
+        """
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.params = {**DATASET_PARAMS, **(params or {})}
+
+        if self.cache_dir is not None:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def build(self, X_train, y_train, X_val=None, y_val=None, weight=None):
+        """
+        Construct (or load) the training Dataset and a validation Dataset
+        binned with the training bin mappers.
+
+        Returns:
+            (train_data, val_data) - val_data is None when X_val is None
+        """
+        train_key = dataset_fingerprint(
+            X_train, y_train, weight, params=self.params)
+        train_data = self._load_or_construct(
+            train_key, X_train, y_train, weight=weight)
+
+        val_data = None
+        if X_val is not None:
+            val_key = dataset_fingerprint(
+                X_val, y_val, params={**self.params, "reference": train_key})
+            val_data = self._load_or_construct(
+                val_key, X_val, y_val, reference=train_data)
+
+        return train_data, val_data
+
+    def _load_or_construct(self, key, X, y, weight=None, reference=None):
+        path = self.cache_dir / f"{key}.bin" if self.cache_dir else None
+
+        if path is not None and path.exists():
+            try:
+                data = lgb.Dataset(
+                    str(path), reference=reference, params=self.params,
+                    free_raw_data=False
+                ).construct()
+                logger.info(f"[Dataset Cache] Loaded binary {path.name}")
+                return data
+            except lgb.basic.LightGBMError as e:
+                logger.warning(
+                    f"[Dataset Cache] Ignoring unreadable {path.name}: {e}")
+
+        data = lgb.Dataset(
+            X, label=y, weight=weight, reference=reference,
+            params=self.params, free_raw_data=False
+        ).construct()
+
+        if path is not None:
+            # Write then rename so concurrent tuners never read a partial file
+            tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+            data.save_binary(str(tmp_path))
+            os.replace(tmp_path, path)
+            logger.info(f"[Dataset Cache] Saved binary {path.name}")
+
+        return data
@@ -13,6 +13,13 @@ from collections import Counter
 import lightgbm as lgb
 import logging
 
+from .lgbm_dataset_cache import LGBMDatasetCache
+from .optuna_study import (
+    LGBMPruningCallback, create_study, make_pruner, multi_fidelity_search,
+    optimize_study,
+    threads_per_worker
+)
+
 logger = logging.getLogger(__name__)
 
 
@@ -51,24 +58,69 @@ def compute_class_weights(y):
 
 # LightGBM Hyperparameter Tuner
 class LightGBMHyperparameterTuner:
-    def __init__(self, n_trials=40, use_gpu=False):
+    def __init__(self, n_trials=40, use_gpu=False, dataset_cache_dir=None,
+                 storage=None, study_name=None, n_workers=1, pruner="none",
+                 seed_params=None, multi_fidelity=None):
+        """
+        Args:
+            storage: SQLite path / journal file (.log) / DB URL for a resumable
+                     study (None = in-memory)
+            study_name: Study name within the storage
+            n_workers: Worker processes sharing the study (needs storage)
+            pruner: "none" (default), "median" or "halving" - stops weak
+                    trials early on their intermediate validation macro-F1
+            seed_params: Param dicts enqueued as the first trials of a new study
+            multi_fidelity: None, "window" (recent-history rungs) or "rows"
+                            (row-subsample rungs) successive-halving search
+        """
         self.n_trials = n_trials
         self.use_gpu = use_gpu
+        self.storage = storage
+        self.study_name = study_name
+        self.n_workers = n_workers
+        self.pruner = pruner
+        self.seed_params = seed_params
+        self.multi_fidelity = multi_fidelity
+        self.best_trial_params = None
+        self.best_score = None
+        self.num_threads = threads_per_worker(n_workers)
         self.study = None
+        self.dataset_cache = LGBMDatasetCache(cache_dir=dataset_cache_dir)
+        self._prepared = {}
+
+    def _prepare(self, X_train, y_train, X_val, y_val):
+        """
+        Balance, weight and bin the data once per (train, val) pair.
+        Trials reuse the binned Datasets and only swap in penalised weights.
+        """
+        key = (id(X_train), id(y_train), id(X_val), id(y_val))
+        if key not in self._prepared:
+            Xb, yb = hybrid_balance(X_train, y_train)
+            class_weights = compute_class_weights(yb)
+
+            # Per-sample weights
+            weight_array = np.array([class_weights[c] for c in yb])
+
+            train_data, val_data = self.dataset_cache.build(
+                Xb, yb, X_val, y_val, weight=weight_array)
+
+            # Keep the inputs alive so their ids stay unique while cached
+            self._prepared[key] = (
+                (X_train, y_train, X_val, y_val),
+                (train_data, val_data, weight_array)
+            )
+
+        return self._prepared[key][1]
 
     # Optimizable Objective
     def objective(self, trial, X_train, y_train, X_val, y_val):
 
-        # Hybrid balance
-        Xb, yb = hybrid_balance(X_train, y_train)
-        class_weights = compute_class_weights(yb)
-
-        # Per-sample weights
-        weight_array = np.array([class_weights[c] for c in yb])
+        train_data, val_data, base_weight = self._prepare(
+            X_train, y_train, X_val, y_val)
 
         # Additional class penalty (tunable)
         penalty = trial.suggest_float("class_penalty", 0.8, 4.0)
-        weight_array = weight_array * penalty
+        train_data.set_weight(base_weight * penalty)
 
         # Parameter search space for LGBM
         params = {
@@ -88,7 +140,7 @@ class LightGBMHyperparameterTuner:
             "verbosity": -1,
             "force_col_wise": True,
             "deterministic": True,
-            "num_threads": -1,
+            "num_threads": self.num_threads,
         }
 
         if self.use_gpu:
@@ -96,18 +148,22 @@ class LightGBMHyperparameterTuner:
         else:
             params["device_type"] = "cpu"
 
-        # Dataset
-        train_data = lgb.Dataset(Xb, label=yb, weight=weight_array)
-        val_data = lgb.Dataset(X_val, label=y_val, reference=train_data)
+        # Intermediate reports use validation macro-F1, the score the trial
+        # is ranked by
+        def f1_proxy(booster):
+            y_pred = np.argmax(booster.predict(X_val), axis=1)
+            return f1_score(y_val, y_pred, average="macro", zero_division=0)
 
-        # Train
+        # Train (Datasets are already binned and shared across trials)
         model = lgb.train(
             params,
             train_data,
             valid_sets=[train_data, val_data],
             num_boost_round=800,
-            early_stopping_rounds=50,
-            verbose_eval=False,
+            callbacks=[
+                lgb.early_stopping(50, verbose=False),
+                LGBMPruningCallback(trial, score_fn=f1_proxy),
+            ],
         )
 
         # Predict
@@ -120,15 +176,27 @@ class LightGBMHyperparameterTuner:
         return score
 
     def tune(self, X_train, y_train, X_val, y_val):
-        def _objective(trial):
-            return self.objective(trial, X_train, y_train, X_val, y_val)
-
-        self.study = optuna.create_study(direction="maximize")
-        self.study.optimize(
-            _objective, n_trials=self.n_trials, show_progress_bar=True)
-
-        logger.info(f"[LGBM Tuner] Best Trial: {self.study.best_trial.number}")
-        logger.info(f"[LGBM Tuner] Best Macro-F1: {self.study.best_value:.4f}")
-        logger.info(f"[LGBM Tuner] Params: {self.study.best_trial.params}")
-
-        return self.study.best_trial.params
+        self.num_threads = threads_per_worker(self.n_workers)
+        self.study = create_study(
+            "maximize", storage=self.storage, study_name=self.study_name,
+            pruner=make_pruner(self.pruner), seed_params=self.seed_params)
+        try:
+            if self.multi_fidelity:
+                self.best_trial_params, self.best_score = multi_fidelity_search(
+                    self.study, self, X_train, y_train, (X_val, y_val), self.n_trials,
+                    mode=self.multi_fidelity, n_workers=self.n_workers,
+                    storage=self.storage)
+            else:
+                optimize_study(
+                    self.study, self, (X_train, y_train, X_val, y_val),
+                    n_trials=self.n_trials, n_workers=self.n_workers,
+                    storage=self.storage)
+                self.best_trial_params = self.study.best_params
+                self.best_score = self.study.best_value
+        finally:
+            self._prepared.clear()
+
+        logger.info(f"[LGBM Tuner] Best Macro-F1: {self.best_score:.4f}")
+        logger.info(f"[LGBM Tuner] Params: {self.best_trial_params}")
+
+        return self.best_trial_params
@@ -12,9 +12,16 @@ import optuna
 import numpy as np
 import pandas as pd
 import lightgbm as lgb
-from sklearn.preprocessing import StandardScaler
 import logging
 
+from ..evaluation.financial_metrics import FinancialMetrics
+from .lgbm_dataset_cache import LGBMDatasetCache
+from .optuna_study import (
+    LGBMPruningCallback, create_study, make_pruner, multi_fidelity_search,
+    optimize_study,
+    threads_per_worker
+)
+
 logger = logging.getLogger(__name__)
 
 optuna.logging.set_verbosity(optuna.logging.WARNING)
@@ -31,7 +38,14 @@ class LGBMReturnTuner:
         n_trials: int = 30,
         forward_periods: int = 10,
         transaction_cost_bps: float = 10.0,
-        use_gpu: bool = False
+        use_gpu: bool = False,
+        dataset_cache_dir: str = None,
+        storage: str = None,
+        study_name: str = None,
+        n_workers: int = 1,
+        pruner: str = "none",
+        seed_params: list = None,
+        multi_fidelity: str = None
     ):
         """
         Args:
@@ -39,52 +53,105 @@ class LGBMReturnTuner:
             forward_periods: Forward look period for threshold scaling
             transaction_cost_bps: Transaction costs in basis points
             use_gpu: Whether to use GPU for training
+            dataset_cache_dir: Directory to persist binned Datasets across reruns
+            storage: SQLite path / journal file (.log) / DB URL for a resumable
+                     study (None = in-memory)
+            study_name: Study name within the storage
+            n_workers: Worker processes sharing the study (needs storage)
+            pruner: "none" (default), "median" or "halving" - stops weak
+                    trials early on their intermediate validation Sharpe
+            seed_params: Param dicts enqueued as the first trials of a new study
+            multi_fidelity: None, "window" (recent-history rungs) or "rows"
+                            (row-subsample rungs) successive-halving search
         """
         self.n_trials = n_trials
         self.forward_periods = forward_periods
         self.transaction_cost = transaction_cost_bps / 10000
+        # Sharpe scoring: costs on position changes, no risk-free hurdle
+        self.metrics = FinancialMetrics(
+            transaction_cost_bps=transaction_cost_bps, risk_free_rate=0.0)
         self.use_gpu = use_gpu
+        self.storage = storage
+        self.study_name = study_name
+        self.n_workers = n_workers
+        self.pruner = pruner
+        self.seed_params = seed_params
+        self.multi_fidelity = multi_fidelity
+        self.best_trial_params = None
+        self.best_score = None
+        self.num_threads = threads_per_worker(n_workers)
         self.study = None
         self.best_params = None
         self.best_threshold = None
+        self.dataset_cache = LGBMDatasetCache(cache_dir=dataset_cache_dir)
+        self._prepared = {}
 
-    def _calculate_sharpe(self, returns: np.ndarray) -> float:
-        """Calculate annualized Sharpe ratio from daily returns"""
-        if len(returns) < 2:
-            return -10.0
-
-        returns = returns[~np.isnan(returns) & ~np.isinf(returns)]
-        if len(returns) < 2 or np.std(returns) < 1e-8:
-            return -10.0
+    def _prepare(self, X_train, y_train, X_val, y_val):
+        """
+        Bin the data once per (train, val) pair; every trial reuses the
+        Datasets. Features are not scaled, matching LGBMReturnPredictor.
+        """
+        key = (id(X_train), id(y_train), id(X_val), id(y_val))
+        if key not in self._prepared:
+            train_data, val_data = self.dataset_cache.build(
+                X_train, y_train, X_val, y_val)
 
-        # Annualized Sharpe (assuming 252 trading days)
-        mean_ret = np.mean(returns)
-        std_ret = np.std(returns, ddof=1)
-        sharpe = (mean_ret / std_ret) * np.sqrt(252)
+            self._prepared[key] = (
+                (X_train, y_train, X_val, y_val),
+                (train_data, val_data)
+            )
 
-        return float(np.clip(sharpe, -10, 10))
+        return self._prepared[key][1]
 
-    def _simulate_trading(
+    def _strategy_signals(
         self,
         predictions: np.ndarray,
-        forward_returns: np.ndarray,
-        long_threshold: float,
-        short_threshold: float
+        threshold_scales: np.ndarray
     ) -> np.ndarray:
-        """Simulate trading and return strategy returns"""
-        # Generate signals
-        signals = np.zeros(len(predictions))
-        signals[predictions > long_threshold] = 1
-        signals[predictions < short_threshold] = -1
+        """
+        Adaptive-threshold signals for each threshold scale, shape (K, N).
+        Long above mean + scale * std; short below mean - scale * std, and
+        only if the prediction is negative.
+        """
+        pred_mean = np.mean(predictions)
+        pred_std = np.std(predictions)
+        scales = np.atleast_1d(np.asarray(threshold_scales, dtype=float))[:, None]
 
-        # Strategy returns
-        gross_returns = signals * forward_returns
+        long_thresh = pred_mean + scales * pred_std
+        short_thresh = pred_mean - scales * pred_std
 
-        # Transaction costs on position changes
-        position_changes = np.abs(np.diff(signals, prepend=0))
-        costs = position_changes * self.transaction_cost
+        signals = np.zeros((len(scales), len(predictions)))
+        signals[predictions > long_thresh] = 1
+        signals[(predictions < short_thresh) & (predictions < 0)] = -1
+        return signals
 
-        return gross_returns - costs
+    def strategy_sharpes(
+        self,
+        predictions: np.ndarray,
+        forward_returns: np.ndarray,
+        threshold_scales: np.ndarray
+    ) -> np.ndarray:
+        """
+        Sharpe of the adaptive-threshold strategy for every threshold scale,
+        in one FinancialMetrics.evaluate_many pass. Strategies that never
+        trade, or whose returns are constant, score -10.
+        """
+        metrics = self.metrics.evaluate_many(
+            self._strategy_signals(predictions, threshold_scales), forward_returns)
+        # evaluate_many reports Sharpe 0 when the return std is below 1e-8;
+        # those degenerate strategies must rank below any real Sharpe
+        degenerate = (metrics['num_trades'] == 0) | (metrics['sharpe_ratio'] == 0)
+        return np.where(degenerate, -10.0, metrics['sharpe_ratio'])
+
+    def _strategy_sharpe(
+        self,
+        predictions: np.ndarray,
+        forward_returns: np.ndarray,
+        threshold_scale: float
+    ) -> float:
+        """Sharpe of the adaptive-threshold strategy on a set of predictions"""
+        return float(self.strategy_sharpes(
+            predictions, forward_returns, [threshold_scale])[0])
 
     def objective(self, trial, X_train, y_train, X_val, y_val):
         """Optuna objective: maximize Sharpe ratio"""
@@ -105,7 +172,7 @@ class LGBMReturnTuner:
             'verbosity': -1,
             'force_col_wise': True,
             'deterministic': True,
-            'num_threads': -1,
+            'num_threads': self.num_threads,
         }
 
         if self.use_gpu:
@@ -115,14 +182,14 @@ class LGBMReturnTuner:
         # Higher = fewer but stronger signals, Lower = more signals
         threshold_scale = trial.suggest_float('threshold_scale', 0.2, 1.5)
 
-        # Scale features
-        scaler = StandardScaler()
-        X_train_scaled = scaler.fit_transform(X_train)
-        X_val_scaled = scaler.transform(X_val)
+        # Binned datasets are shared across trials
+        train_data, val_data = self._prepare(X_train, y_train, X_val, y_val)
 
-        # Create datasets
-        train_data = lgb.Dataset(X_train_scaled, label=y_train)
-        val_data = lgb.Dataset(X_val_scaled, label=y_val, reference=train_data)
+        # Intermediate reports use the partially trained booster's Sharpe,
+        # the same quantity the trial is finally scored on
+        def sharpe_proxy(booster):
+            return self._strategy_sharpe(
+                booster.predict(X_val), y_val, threshold_scale)
 
         # Train model
         model = lgb.train(
@@ -132,33 +199,14 @@ class LGBMReturnTuner:
             num_boost_round=500,
             callbacks=[
                 lgb.early_stopping(30, verbose=False),
+                LGBMPruningCallback(trial, score_fn=sharpe_proxy),
             ]
         )
 
         # Predict on validation
-        predictions = model.predict(X_val_scaled)
-
-        # Adaptive threshold based on prediction distribution
-        pred_mean = np.mean(predictions)
-        pred_std = np.std(predictions)
+        predictions = model.predict(X_val)
 
-        long_thresh = pred_mean + threshold_scale * pred_std
-        short_thresh = pred_mean - threshold_scale * pred_std
-
-        # Generate signals (only short if prediction is negative)
-        signals = np.zeros(len(predictions))
-        signals[predictions > long_thresh] = 1
-        signals[(predictions < short_thresh) & (predictions < 0)] = -1
-
-        # Calculate strategy returns
-        gross_returns = signals * y_val
-        position_changes = np.abs(np.diff(signals, prepend=0))
-        costs = position_changes * self.transaction_cost
-        strategy_returns = gross_returns - costs
-
-        sharpe = self._calculate_sharpe(strategy_returns)
-
-        return sharpe
+        return self._strategy_sharpe(predictions, y_val, threshold_scale)
 
     def tune(self, X_train, y_train, X_val, y_val):
         """
@@ -173,21 +221,29 @@ class LGBMReturnTuner:
         Returns:
             Dictionary of best hyperparameters
         """
-        def _objective(trial):
-            return self.objective(trial, X_train, y_train, X_val, y_val)
-
-        self.study = optuna.create_study(direction='maximize')
-        self.study.optimize(
-            _objective,
-            n_trials=self.n_trials,
-            show_progress_bar=True,
-            n_jobs=1
-        )
+        self.num_threads = threads_per_worker(self.n_workers)
+        self.study = create_study(
+            'maximize', storage=self.storage, study_name=self.study_name,
+            pruner=make_pruner(self.pruner), seed_params=self.seed_params)
+        try:
+            if self.multi_fidelity:
+                self.best_trial_params, self.best_score = multi_fidelity_search(
+                    self.study, self, X_train, y_train, (X_val, y_val), self.n_trials,
+                    mode=self.multi_fidelity, n_workers=self.n_workers,
+                    storage=self.storage)
+            else:
+                optimize_study(
+                    self.study, self, (X_train, y_train, X_val, y_val),
+                    n_trials=self.n_trials, n_workers=self.n_workers,
+                    storage=self.storage)
+                self.best_trial_params = self.study.best_params
+                self.best_score = self.study.best_value
+        finally:
+            self._prepared.clear()
 
         # Extract best params (exclude threshold_scale from model params)
-        best_trial = self.study.best_trial
         self.best_params = {
-            k: v for k, v in best_trial.params.items()
+            k: v for k, v in self.best_trial_params.items()
             if k != 'threshold_scale'
         }
 
@@ -198,15 +254,13 @@ class LGBMReturnTuner:
             'verbosity': -1,
             'force_col_wise': True,
             'deterministic': True,
-            'num_threads': -1,
         })
 
         # Get best threshold scale
-        self.best_threshold_scale = best_trial.params.get(
+        self.best_threshold_scale = self.best_trial_params.get(
             'threshold_scale', 0.5)
 
-        logger.info(f"[Return Tuner] Best Trial: {best_trial.number}")
-        logger.info(f"[Return Tuner] Best Sharpe: {self.study.best_value:.4f}")
+        logger.info(f"[Return Tuner] Best Sharpe: {self.best_score:.4f}")
         logger.info(
             f"[Return Tuner] Best Threshold Scale: {self.best_threshold_scale:.2f}")
 
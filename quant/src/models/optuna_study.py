@@ -0,0 +1,436 @@
+"""
+Optuna study helpers shared by the hyperparameter tuners.
+
+Adds optional persistent storage (local SQLite file or Optuna journal file)
+so a per-ticker study survives crashes and resumes from its finished trials
+on rerun, and runs trials across worker processes that share that storage,
+splitting the CPU thread budget between them. Trials report intermediate
+validation scores every few boosting rounds so a pruner can stop clearly
+losing trials early. An optional multi-fidelity mode searches on the most
+recent slice of the training window (or a row subsample) and promotes only
+the best candidates to longer windows, training on full data for finalists.
+
+Usage:
+    study = create_study("maximize", storage="studies/AAPL_lgbm.db",
+                         study_name="AAPL_lgbm")
+    optimize_study(study, tuner, (X_train, y_train, X_val, y_val),
+                   n_trials=40, n_workers=4, storage="studies/AAPL_lgbm.db")
+"""
+
+import copy
+import logging
+import math
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+import optuna
+from optuna.trial import TrialState
+
+from .compute_resources import get_resources
+
+logger = logging.getLogger(__name__)
+
+FINISHED_STATES = (TrialState.COMPLETE, TrialState.PRUNED)
+JOURNAL_SUFFIXES = (".log", ".journal")
+PRUNERS = ("median", "halving", "none")
+
+# Boosting rounds between intermediate reports
+REPORT_EVERY = 25
+
+# Database storages: running trials write a heartbeat every HEARTBEAT_INTERVAL
+# seconds and are failed once it is HEARTBEAT_GRACE seconds old. Journal files
+# have no heartbeat, so there a RUNNING trial is failed once it started more
+# than STALE_TRIAL_SECONDS ago (longer than any single trial should take).
+HEARTBEAT_INTERVAL = 60
+HEARTBEAT_GRACE = 180
+STALE_TRIAL_SECONDS = 6 * 3600
+
+# Multi-fidelity: training fractions per rung, 1/eta promoted between rungs
+FIDELITY_MODES = ("window", "rows")
+FIDELITY_RUNGS = (0.25, 0.5, 1.0)
+FIDELITY_ETA = 3
+
+
+def pruning_enabled(trial):
+    """
+    Whether intermediate reports can stop ``trial``: False for FixedTrial
+    (multi-fidelity re-scoring) and for studies using NopPruner, so the
+    callbacks skip computing scores nobody reads.
+    """
+    pruner = getattr(getattr(trial, "study", None), "pruner", None)
+    return pruner is not None and not isinstance(pruner, optuna.pruners.NopPruner)
+
+
+def _journal_backend(path):
+    try:
+        from optuna.storages.journal import JournalFileBackend
+    except ImportError:  # optuna < 4.0
+        from optuna.storages import JournalFileStorage as JournalFileBackend
+    return JournalFileBackend(path)
+
+
+def make_storage(storage):
+    """
+    Resolve a storage spec into something optuna.create_study accepts.
+
+    Args:
+        storage: None (in-memory), a database URL, a path ending in .log/.journal
+                 (journal file, best for many processes) or any other path
+                 (SQLite file)
+    """
+    if storage is None:
+        return None
+
+    storage = str(storage)
+    if "://" in storage:
+        url = storage
+    else:
+        path = Path(storage).expanduser().resolve()
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        if path.suffix in JOURNAL_SUFFIXES:
+            return optuna.storages.JournalStorage(_journal_backend(str(path)))
+        url = f"sqlite:///{path}"
+
+    return optuna.storages.RDBStorage(
+        url, heartbeat_interval=HEARTBEAT_INTERVAL, grace_period=HEARTBEAT_GRACE)
+
+
+def make_pruner(name="none", n_startup_trials=5, n_warmup_steps=2 * REPORT_EVERY):
+    """
+    Build a pruner by name. Steps are boosting rounds.
+
+    Args:
+        name: "median" (MedianPruner), "halving" (SuccessiveHalvingPruner)
+              or "none"
+        n_startup_trials: Trials that always run to completion (median)
+        n_warmup_steps: Rounds before a trial can be pruned / first rung
+    """
+    if name in (None, "none"):
+        return optuna.pruners.NopPruner()
+    if name == "median":
+        return optuna.pruners.MedianPruner(
+            n_startup_trials=n_startup_trials, n_warmup_steps=n_warmup_steps)
+    if name == "halving":
+        return optuna.pruners.SuccessiveHalvingPruner(
+            min_resource=n_warmup_steps, reduction_factor=3)
+    raise ValueError(f"Unknown pruner: {name} (expected one of {PRUNERS})")
+
+
+class LGBMPruningCallback:
+    """
+    LightGBM callback reporting to an Optuna trial every ``report_every``
+    rounds and raising TrialPruned when the pruner says so.
+
+    Reports the validation metric (negated when lower is better, so every
+    tuner reports on a maximize scale), or ``score_fn(booster)`` when given.
+    Tuners pass the objective's own score as ``score_fn`` so trials are
+    pruned on the quantity they are ranked by.
+    """
+
+    order = 25
+
+    def __init__(self, trial, metric=None, score_fn=None, report_every=REPORT_EVERY):
+        self.trial = trial
+        self.metric = metric
+        self.score_fn = score_fn
+        self.report_every = report_every
+        self.enabled = pruning_enabled(trial)
+
+    def __call__(self, env):
+        step = env.iteration + 1
+        if not self.enabled or step % self.report_every:
+            return
+
+        if self.score_fn is not None:
+            value = self.score_fn(env.model)
+        else:
+            value = None
+            for data_name, eval_name, result, higher_better, *_ in env.evaluation_result_list:
+                if data_name == "training" or (self.metric and eval_name != self.metric):
+                    continue
+                value = result if higher_better else -result
+
+        if value is None:
+            return
+
+        self.trial.report(float(value), step)
+        if self.trial.should_prune():
+            raise optuna.TrialPruned(f"Pruned at round {step}")
+
+
+def count_finished_trials(study):
+    return len(study.get_trials(deepcopy=False, states=FINISHED_STATES))
+
+
+def enqueue_seeds(study, seed_params):
+    """
+    Enqueue warm-start params as the first trials of a fresh study.
+    Resumed studies already have their own history and are left alone.
+    """
+    if not seed_params or study.get_trials(deepcopy=False):
+        return
+
+    for params in seed_params:
+        study.enqueue_trial(params, skip_if_exists=True)
+    logger.info(f"[Study] Enqueued {len(seed_params)} warm-start trials")
+
+
+def fail_stale_trials(study, stale_after=None):
+    """
+    Mark trials abandoned by a crashed process FAIL so they neither count
+    towards the budget nor block the sampler. Trials still running in other
+    processes sharing the storage are left alone.
+    """
+    if isinstance(study._storage, optuna.storages.RDBStorage):
+        # Stale = heartbeat older than the grace period
+        optuna.storages.fail_stale_trials(study)
+        return
+
+    if stale_after is None:
+        stale_after = STALE_TRIAL_SECONDS
+    cutoff = datetime.now() - timedelta(seconds=stale_after)
+    for trial in study.get_trials(deepcopy=False, states=(TrialState.RUNNING,)):
+        if trial.datetime_start is not None and trial.datetime_start < cutoff:
+            study.tell(trial.number, state=TrialState.FAIL)
+
+
+def create_study(direction, storage=None, study_name=None, sampler=None, pruner=None,
+                 seed_params=None):
+    """
+    Create an in-memory study, or create/resume a persistent one.
+
+    Stale RUNNING trials left by a crashed run are failed (see
+    fail_stale_trials). ``seed_params`` are enqueued only when the study is
+    new.
+    """
+    storage_obj = make_storage(storage)
+    if storage_obj is None:
+        study = optuna.create_study(direction=direction, sampler=sampler, pruner=pruner)
+        enqueue_seeds(study, seed_params)
+        return study
+
+    study = optuna.create_study(
+        direction=direction,
+        storage=storage_obj,
+        study_name=study_name or "tuning",
+        sampler=sampler,
+        pruner=pruner,
+        load_if_exists=True
+    )
+
+    fail_stale_trials(study)
+
+    enqueue_seeds(study, seed_params)
+
+    finished = count_finished_trials(study)
+    if finished:
+        logger.info(
+            f"[Study] Resuming '{study.study_name}' with {finished} finished trials")
+
+    return study
+
+
+def threads_per_worker(n_workers):
+    """Split this process' thread budget between worker processes."""
+    return get_resources().partition(n_workers)
+
+
+def _worker_tuner(tuner):
+    """Copy of a tuner safe to send to a spawned worker process."""
+    # Studies hold live storage handles and cached Datasets are per-process
+    worker_tuner = copy.copy(tuner)
+    worker_tuner.study = None
+    if hasattr(worker_tuner, "_prepared"):
+        worker_tuner._prepared = {}
+    return worker_tuner
+
+
+def _run_worker(tuner, objective_args, study_name, storage, pruner, n_trials):
+    """Worker process entry point: load the shared study and run trials."""
+    optuna.logging.set_verbosity(optuna.logging.WARNING)
+    get_resources().set_threads(tuner.num_threads)
+    study = optuna.load_study(
+        study_name=study_name, storage=make_storage(storage), pruner=pruner)
+    study.optimize(
+        lambda trial: tuner.objective(trial, *objective_args),
+        n_trials=n_trials
+    )
+
+
+def optimize_study(study, tuner, objective_args, n_trials, n_workers=1,
+                   storage=None, show_progress_bar=True):
+    """
+    Run ``tuner.objective(trial, *objective_args)`` until the study holds
+    ``n_trials`` finished trials.
+
+    With ``n_workers > 1`` and a storage, trials run in spawned worker
+    processes (fork is unsafe once OpenMP has been used by LightGBM/XGBoost
+    in the parent). Each worker receives a copy of the tuner and the data.
+    """
+    remaining = max(0, n_trials - count_finished_trials(study))
+    if remaining == 0:
+        logger.info(
+            f"[Study] '{study.study_name}' already has {n_trials} finished trials")
+        return study
+
+    if n_workers > 1 and storage is None:
+        logger.warning(
+            "[Study] Parallel workers need a persistent storage; running in-process")
+        n_workers = 1
+
+    if n_workers <= 1:
+        study.optimize(
+            lambda trial: tuner.objective(trial, *objective_args),
+            n_trials=remaining,
+            show_progress_bar=show_progress_bar
+        )
+        return study
+
+    n_workers = min(n_workers, remaining)
+    shares = [remaining // n_workers + (1 if i < remaining % n_workers else 0)
+              for i in range(n_workers)]
+
+    worker_tuner = _worker_tuner(tuner)
+
+    ctx = multiprocessing.get_context("spawn")
+    workers = [
+        ctx.Process(
+            target=_run_worker,
+            args=(worker_tuner, objective_args, study.study_name, storage,
+                  study.pruner, share)
+        )
+        for share in shares
+    ]
+
+    logger.info(
+        f"[Study] Running {remaining} trials on {n_workers} workers "
+        f"({threads_per_worker(n_workers)} threads each)")
+
+    for worker in workers:
+        worker.start()
+    failed = []
+    for worker in workers:
+        worker.join()
+        if worker.exitcode != 0:
+            failed.append(worker.exitcode)
+            logger.warning(
+                f"[Study] Worker {worker.pid} exited with code {worker.exitcode}")
+
+    if failed and not study.get_trials(deepcopy=False, states=(TrialState.COMPLETE,)):
+        raise RuntimeError(
+            f"[Study] '{study.study_name}': {len(failed)}/{n_workers} workers failed "
+            f"(exit codes {failed}) and no trial completed")
+
+    return study
+
+
+def fidelity_subset(X, y, fraction, mode="window", seed=42):
+    """
+    Low-fidelity training set.
+
+    Args:
+        fraction: Share of training rows to keep (1.0 = full data)
+        mode: "window" keeps the most recent rows (by index order, so it also
+              works on shuffled/oversampled frames), "rows" a random subsample
+              kept in time order
+    """
+    if fraction >= 1.0:
+        return X, y
+    if mode not in FIDELITY_MODES:
+        raise ValueError(f"Unknown fidelity mode: {mode} (expected one of {FIDELITY_MODES})")
+
+    n = len(X)
+    n_keep = max(1, int(n * fraction))
+    order = (np.argsort(np.asarray(X.index), kind="stable")
+             if hasattr(X, "index") else np.arange(n))
+
+    if mode == "window":
+        rows = order[n - n_keep:]
+    else:
+        rng = np.random.default_rng(seed)
+        rows = order[np.sort(rng.choice(n, size=n_keep, replace=False))]
+
+    rows = np.sort(rows)
+    X_sub = X.iloc[rows] if hasattr(X, "iloc") else X[rows]
+    y_sub = y.iloc[rows] if hasattr(y, "iloc") else np.asarray(y)[rows]
+    return X_sub, y_sub
+
+
+_scorer = None  # (tuner, objective_args) in a rung-scoring worker
+
+
+def _init_scorer(tuner, objective_args):
+    global _scorer
+    get_resources().set_threads(tuner.num_threads)
+    _scorer = (tuner, objective_args)
+
+
+def _score_params(params):
+    tuner, objective_args = _scorer
+    return tuner.objective(optuna.trial.FixedTrial(params), *objective_args)
+
+
+def score_candidates(tuner, candidates, objective_args, n_workers=1):
+    """
+    ``tuner.objective`` for each param set (FixedTrial), in order. With
+    ``n_workers > 1`` the candidates are scored on spawned worker processes,
+    each receiving the tuner and the data once.
+    """
+    n_workers = min(n_workers, len(candidates))
+    if n_workers <= 1:
+        return [tuner.objective(optuna.trial.FixedTrial(params), *objective_args)
+                for params in candidates]
+
+    ctx = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=n_workers, mp_context=ctx,
+                             initializer=_init_scorer,
+                             initargs=(_worker_tuner(tuner), objective_args)) as pool:
+        return list(pool.map(_score_params, candidates))
+
+
+def multi_fidelity_search(study, tuner, X_train, y_train, extra_args, n_trials,
+                          mode="window", rungs=FIDELITY_RUNGS, eta=FIDELITY_ETA,
+                          n_workers=1, storage=None):
+    """
+    Successive-halving search over training-window length.
+
+    The study runs ``n_trials`` on the first rung's subset; the top 1/eta of
+    its trials are re-scored on each longer rung with FixedTrial (on
+    ``n_workers`` processes), and the last rung (full data) picks the winner.
+
+    Returns:
+        (best_params, best_score) at the final rung
+    """
+    X_rung, y_rung = fidelity_subset(X_train, y_train, rungs[0], mode)
+    logger.info(
+        f"[Multi-Fidelity] Rung {rungs[0]:.2f}: {n_trials} trials on {len(X_rung)} rows")
+    optimize_study(study, tuner, (X_rung, y_rung, *extra_args), n_trials,
+                   n_workers=n_workers, storage=storage)
+
+    if len(rungs) == 1:
+        return study.best_params, study.best_value
+
+    completed = study.get_trials(deepcopy=False, states=(TrialState.COMPLETE,))
+    ranked = sorted(completed, key=lambda t: t.value, reverse=True)
+    if not ranked:
+        return study.best_params, study.best_value  # raises: nothing completed
+    candidates = [t.params for t in ranked[:max(1, math.ceil(len(ranked) / eta))]]
+
+    for fraction in rungs[1:]:
+        X_rung, y_rung = fidelity_subset(X_train, y_train, fraction, mode)
+        logger.info(
+            f"[Multi-Fidelity] Rung {fraction:.2f}: {len(candidates)} candidates "
+            f"on {len(X_rung)} rows")
+
+        scores = score_candidates(
+            tuner, candidates, (X_rung, y_rung, *extra_args), n_workers=n_workers)
+        scored = list(zip(scores, candidates))
+        scored.sort(key=lambda s: s[0], reverse=True)
+        candidates = [p for _, p in scored[:max(1, math.ceil(len(scored) / eta))]]
+
+    best_score, best_params = scored[0]
+    return best_params, best_score
@@ -0,0 +1,123 @@
+"""
+Cross-ticker hyperparameter history for warm-starting tuning studies.
+
+Every finished study records its best params together with the ticker's
+sector and return profile (annualized volatility, lag-1 autocorrelation).
+A new study can then enqueue the best params of the most similar tickers
+as its first trials instead of starting from a random search.
+
+Usage:
+    history = TuningParamHistory("models/tuning_history.json")
+    seeds = history.seeds("lgbm", profile=return_profile(returns), sector="Financials")
+    ...
+    history.record("JPM", "lgbm", best_params, best_score, profile, sector)
+"""
+
+import json
+import logging
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+PROFILE_KEYS = ("volatility", "autocorr")
+
+
+def return_profile(returns):
+    """
+    Summarize a daily return series for similarity matching.
+
+    Returns:
+        {"volatility": annualized std, "autocorr": lag-1 autocorrelation}
+    """
+    r = np.asarray(returns, dtype=float)
+    r = r[np.isfinite(r)]
+    if len(r) < 3 or np.std(r) < 1e-12:
+        return {"volatility": 0.0, "autocorr": 0.0}
+
+    autocorr = np.corrcoef(r[:-1], r[1:])[0, 1]
+    return {
+        "volatility": float(np.std(r, ddof=1) * np.sqrt(252)),
+        "autocorr": float(autocorr) if np.isfinite(autocorr) else 0.0,
+    }
+
+
+class TuningParamHistory:
+    """
+    JSON-backed store of the best tuned params per (ticker, tuner).
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.entries = {}
+
+        if self.path.exists():
+            try:
+                with open(self.path, "r") as f:
+                    self.entries = json.load(f).get("entries", {})
+            except (json.JSONDecodeError, OSError) as e:
+                logger.warning(f"[Param History] Ignoring unreadable {self.path}: {e}")
+
+    def record(self, ticker, tuner_key, params, score, profile=None, sector=None):
+        """Store (overwrite) a ticker's best params for a tuner and save."""
+        self.entries[f"{ticker}:{tuner_key}"] = {
+            "ticker": ticker,
+            "tuner": tuner_key,
+            "params": params,
+            "score": float(score),
+            "profile": profile or {},
+            "sector": sector,
+            "updated_at": pd.Timestamp.now().isoformat(),
+        }
+        self.save()
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_path, "w") as f:
+            json.dump({"entries": self.entries}, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+    def seeds(self, tuner_key, profile=None, sector=None, exclude=None, k=3):
+        """
+        Best params of the ``k`` most similar tuned tickers.
+
+        Same-sector tickers rank first; ties are broken by distance in
+        (volatility, autocorrelation), each scaled by its spread across the
+        history so neither dimension dominates.
+        """
+        candidates = [
+            e for e in self.entries.values()
+            if e["tuner"] == tuner_key and e["ticker"] != exclude
+        ]
+        if not candidates:
+            return []
+
+        scales = {}
+        for key in PROFILE_KEYS:
+            values = [e["profile"].get(key) for e in candidates
+                      if e["profile"].get(key) is not None]
+            spread = np.std(values) if len(values) > 1 else 0.0
+            scales[key] = spread if spread > 1e-12 else 1.0
+
+        def distance(entry):
+            if not profile or not entry["profile"]:
+                return np.inf
+            return float(np.sqrt(sum(
+                ((entry["profile"].get(key, 0.0) - profile.get(key, 0.0)) / scales[key]) ** 2
+                for key in PROFILE_KEYS
+            )))
+
+        ranked = sorted(
+            candidates,
+            key=lambda e: (
+                not (sector is not None and e["sector"] == sector),
+                distance(e),
+                -e["score"],
+            )
+        )
+
+        return [e["params"] for e in ranked[:k]]
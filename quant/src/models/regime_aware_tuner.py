@@ -23,6 +23,12 @@ import lightgbm as lgb
 import logging
 from typing import Dict, Optional, Tuple
 
+from .lgbm_dataset_cache import LGBMDatasetCache
+from .optuna_study import (
+    LGBMPruningCallback, create_study, make_pruner, optimize_study,
+    threads_per_worker
+)
+
 logger = logging.getLogger(__name__)
 
 
@@ -55,6 +61,24 @@ def compute_class_weights(y):
     return {cls: total / (n_class * cnt) for cls, cnt in counts.items()}
 
 
+def regime_history_from_study(study):
+    """
+    Rebuild per-trial regime performance from trial user attributes.
+    Works for trials run in worker processes or resumed from storage.
+    """
+    history = []
+    for t in study.get_trials(deepcopy=False, states=(optuna.trial.TrialState.COMPLETE,)):
+        if 'overall_f1' not in t.user_attrs:
+            continue
+        history.append({
+            'trial': t.number,
+            'composite_score': t.value,
+            'regime_accuracies': t.user_attrs.get('regime_accuracies', {}),
+            'overall_f1': t.user_attrs['overall_f1']
+        })
+    return history
+
+
 class RegimeAwareHyperparameterTuner:
 
     def __init__(
@@ -62,14 +86,52 @@ class RegimeAwareHyperparameterTuner:
         n_trials: int = 40,
         use_gpu: bool = False,
         regime_weight: float = 0.6,
-        min_regime_samples: int = 50
+        min_regime_samples: int = 50,
+        dataset_cache_dir: Optional[str] = None,
+        storage: Optional[str] = None,
+        study_name: Optional[str] = None,
+        n_workers: int = 1,
+        pruner: str = "none",
+        seed_params: Optional[list] = None
     ):
         self.n_trials = n_trials
         self.use_gpu = use_gpu
         self.regime_weight = regime_weight
         self.min_regime_samples = min_regime_samples
+        self.storage = storage
+        self.study_name = study_name
+        self.n_workers = n_workers
+        self.pruner = pruner
+        self.seed_params = seed_params
+        self.num_threads = threads_per_worker(n_workers)
         self.study = None
         self.regime_performance_history = []
+        self.dataset_cache = LGBMDatasetCache(cache_dir=dataset_cache_dir)
+        self._prepared = {}
+
+    def _prepare(self, X_train, y_train, X_val, y_val):
+        """Balance, weight and bin the data once; trials reuse the Datasets."""
+        key = (id(X_train), id(y_train), id(X_val), id(y_val))
+        if key not in self._prepared:
+            Xb, yb = hybrid_balance(X_train, y_train)
+
+            label_map = {-1: 0, 0: 1, 1: 2}
+            yb_mapped = np.array([label_map.get(int(l), int(l)) for l in yb])
+            y_val_mapped = np.array(
+                [label_map.get(int(l), int(l)) for l in y_val])
+            class_weights = compute_class_weights(yb)
+
+            weight_array = np.array([class_weights[c] for c in yb])
+
+            train_data, val_data = self.dataset_cache.build(
+                Xb, yb_mapped, X_val, y_val_mapped, weight=weight_array)
+
+            self._prepared[key] = (
+                (X_train, y_train, X_val, y_val),
+                (train_data, val_data, weight_array)
+            )
+
+        return self._prepared[key][1]
 
     def _compute_regime_score(
         self,
@@ -114,17 +176,11 @@ class RegimeAwareHyperparameterTuner:
         y_val: np.ndarray,
         regime_labels_val: np.ndarray
     ) -> float:
-        Xb, yb = hybrid_balance(X_train, y_train)
-
-        label_map = {-1: 0, 0: 1, 1: 2}
-        yb_mapped = np.array([label_map.get(int(l), int(l)) for l in yb])
-        y_val_mapped = np.array([label_map.get(int(l), int(l)) for l in y_val])
-        class_weights = compute_class_weights(yb)
-
-        weight_array = np.array([class_weights[c] for c in yb])
+        train_data, val_data, base_weight = self._prepare(
+            X_train, y_train, X_val, y_val)
 
         penalty = trial.suggest_float("class_penalty", 0.8, 4.0)
-        weight_array = weight_array * penalty
+        train_data.set_weight(base_weight * penalty)
 
         params = {
             "objective": "multiclass",
@@ -143,7 +199,7 @@ class RegimeAwareHyperparameterTuner:
             "verbosity": -1,
             "force_col_wise": True,
             "deterministic": True,
-            "num_threads": -1,
+            "num_threads": self.num_threads,
         }
 
         if self.use_gpu:
@@ -151,33 +207,41 @@ class RegimeAwareHyperparameterTuner:
         else:
             params["device_type"] = "cpu"
 
-        train_data = lgb.Dataset(Xb, label=yb_mapped, weight=weight_array)
-        val_data = lgb.Dataset(X_val, label=y_val_mapped, reference=train_data)
+        reverse_label_map = {0: -1, 1: 0, 2: 1}
+
+        def predict_labels(booster):
+            y_pred_mapped = np.argmax(booster.predict(X_val), axis=1)
+            return np.array([reverse_label_map.get(int(l), int(l))
+                             for l in y_pred_mapped])
+
+        # Intermediate reports use the composite regime score the trial is
+        # ranked by
+        def composite_proxy(booster):
+            return self._compute_regime_score(
+                y_val, predict_labels(booster), regime_labels_val)[0]
 
         model = lgb.train(
             params,
             train_data,
             valid_sets=[train_data, val_data],
             num_boost_round=800,
-            callbacks=[lgb.early_stopping(50, verbose=False)],
+            callbacks=[
+                lgb.early_stopping(50, verbose=False),
+                LGBMPruningCallback(trial, score_fn=composite_proxy),
+            ],
         )
 
-        preds = model.predict(X_val)
-        y_pred_mapped = np.argmax(preds, axis=1)
-        reverse_label_map = {0: -1, 1: 0, 2: 1}
-        y_pred = np.array([reverse_label_map.get(int(l), int(l))
-                          for l in y_pred_mapped])
+        y_pred = predict_labels(model)
 
         composite_score, regime_accs = self._compute_regime_score(
             y_val, y_pred, regime_labels_val
         )
 
-        self.regime_performance_history.append({
-            'trial': trial.number,
-            'composite_score': composite_score,
-            'regime_accuracies': regime_accs,
-            'overall_f1': f1_score(y_val, y_pred, average="macro", zero_division=0)
-        })
+        # Stored on the trial so workers and resumed studies keep the history
+        trial.set_user_attr(
+            'regime_accuracies', {k: float(v) for k, v in regime_accs.items()})
+        trial.set_user_attr('overall_f1', float(
+            f1_score(y_val, y_pred, average="macro", zero_division=0)))
 
         return composite_score
 
@@ -190,22 +254,25 @@ class RegimeAwareHyperparameterTuner:
         regime_labels_val: np.ndarray
     ) -> Dict:
 
-        self.regime_performance_history = []
-
-        def _objective(trial):
-            return self.objective(
-                trial, X_train, y_train, X_val, y_val, regime_labels_val
-            )
-
         # Suppress Optuna logging
         optuna.logging.set_verbosity(optuna.logging.WARNING)
 
-        self.study = optuna.create_study(direction="maximize")
-        self.study.optimize(
-            _objective,
-            n_trials=self.n_trials,
-            show_progress_bar=True
-        )
+        self.num_threads = threads_per_worker(self.n_workers)
+        self.study = create_study(
+            "maximize", storage=self.storage, study_name=self.study_name,
+            pruner=make_pruner(self.pruner), seed_params=self.seed_params)
+        try:
+            optimize_study(
+                self.study, self,
+                (X_train, y_train, X_val, y_val, regime_labels_val),
+                n_trials=self.n_trials,
+                n_workers=self.n_workers,
+                storage=self.storage
+            )
+        finally:
+            self._prepared.clear()
+
+        self.regime_performance_history = regime_history_from_study(self.study)
 
         # Log results
         best_trial = self.study.best_trial
@@ -262,12 +329,23 @@ class RegimeAwareXGBTuner:
         n_trials: int = 40,
         use_gpu: bool = False,
         regime_weight: float = 0.6,
-        min_regime_samples: int = 50
+        min_regime_samples: int = 50,
+        storage: Optional[str] = None,
+        study_name: Optional[str] = None,
+        n_workers: int = 1,
+        pruner: str = "none",
+        seed_params: Optional[list] = None
     ):
         self.n_trials = n_trials
         self.use_gpu = use_gpu
         self.regime_weight = regime_weight
         self.min_regime_samples = min_regime_samples
+        self.storage = storage
+        self.study_name = study_name
+        self.n_workers = n_workers
+        self.pruner = pruner
+        self.seed_params = seed_params
+        self.num_threads = threads_per_worker(n_workers)
         self.study = None
         self.regime_performance_history = []
 
@@ -319,6 +397,7 @@ class RegimeAwareXGBTuner:
     ) -> float:
         """Optuna objective function with regime-aware scoring for XGBoost."""
         import xgboost as xgb
+        from .xgb_hyperparameter_tuner import XGBPruningCallback
 
         Xb, yb = hybrid_balance(X_train, y_train)
         class_weights = compute_class_weights(yb)
@@ -339,6 +418,7 @@ class RegimeAwareXGBTuner:
             "reg_alpha": trial.suggest_float("reg_alpha", 0.0, 5.0),
             "reg_lambda": trial.suggest_float("reg_lambda", 0.0, 5.0),
             "verbosity": 0,
+            "nthread": self.num_threads,
         }
 
         if self.use_gpu:
@@ -347,12 +427,19 @@ class RegimeAwareXGBTuner:
         dtrain = xgb.DMatrix(Xb, label=yb, weight=weight_array)
         dval = xgb.DMatrix(X_val, label=y_val)
 
+        # Intermediate reports use the composite regime score the trial is
+        # ranked by
+        def composite_proxy(booster):
+            y_pred = np.argmax(booster.predict(dval), axis=1)
+            return self._compute_regime_score(y_val, y_pred, regime_labels_val)[0]
+
         model = xgb.train(
             params,
             dtrain,
             num_boost_round=800,
             evals=[(dtrain, "train"), (dval, "val")],
             early_stopping_rounds=50,
+            callbacks=[XGBPruningCallback(trial, score_fn=composite_proxy)],
             verbose_eval=False,
         )
 
@@ -363,12 +450,11 @@ class RegimeAwareXGBTuner:
             y_val, y_pred, regime_labels_val
         )
 
-        self.regime_performance_history.append({
-            'trial': trial.number,
-            'composite_score': composite_score,
-            'regime_accuracies': regime_accs,
-            'overall_f1': f1_score(y_val, y_pred, average="macro", zero_division=0)
-        })
+        # Stored on the trial so workers and resumed studies keep the history
+        trial.set_user_attr(
+            'regime_accuracies', {k: float(v) for k, v in regime_accs.items()})
+        trial.set_user_attr('overall_f1', float(
+            f1_score(y_val, y_pred, average="macro", zero_division=0)))
 
         return composite_score
 
@@ -381,21 +467,20 @@ class RegimeAwareXGBTuner:
         regime_labels_val: np.ndarray
     ) -> Dict:
         """Run regime-aware hyperparameter tuning for XGBoost."""
-        self.regime_performance_history = []
-
-        def _objective(trial):
-            return self.objective(
-                trial, X_train, y_train, X_val, y_val, regime_labels_val
-            )
-
         optuna.logging.set_verbosity(optuna.logging.WARNING)
 
-        self.study = optuna.create_study(direction="maximize")
-        self.study.optimize(
-            _objective,
+        self.num_threads = threads_per_worker(self.n_workers)
+        self.study = create_study(
+            "maximize", storage=self.storage, study_name=self.study_name,
+            pruner=make_pruner(self.pruner), seed_params=self.seed_params)
+        optimize_study(
+            self.study, self,
+            (X_train, y_train, X_val, y_val, regime_labels_val),
             n_trials=self.n_trials,
-            show_progress_bar=True
+            n_workers=self.n_workers,
+            storage=self.storage
         )
+        self.regime_performance_history = regime_history_from_study(self.study)
 
         best_trial = self.study.best_trial
         logger.info(f"[Regime XGB Tuner] Best Trial: {best_trial.number}")
@@ -12,6 +12,11 @@ from collections import Counter
 from sklearn.metrics import f1_score
 import logging
 
+from .optuna_study import (
+    REPORT_EVERY, create_study, make_pruner, pruning_enabled, multi_fidelity_search, optimize_study,
+    threads_per_worker
+)
+
 logger = logging.getLogger(__name__)
 
 
@@ -45,10 +50,73 @@ def compute_class_weights(y):
     return {c: total / (n_class * counts[c]) for c in counts}
 
 
+class XGBPruningCallback(xgb.callback.TrainingCallback):
+    """
+    Reports the negated validation loss (or ``score_fn(booster)`` when
+    given) to an Optuna trial every ``report_every`` rounds and raises
+    TrialPruned when the pruner says so.
+    """
+
+    def __init__(self, trial, data_name="val", metric="mlogloss", score_fn=None,
+                 report_every=REPORT_EVERY):
+        super().__init__()
+        self.trial = trial
+        self.data_name = data_name
+        self.metric = metric
+        self.score_fn = score_fn
+        self.report_every = report_every
+        self.enabled = pruning_enabled(trial)
+
+    def after_iteration(self, model, epoch, evals_log):
+        step = epoch + 1
+        if not self.enabled or step % self.report_every:
+            return False
+
+        if self.score_fn is not None:
+            value = float(self.score_fn(model))
+        else:
+            history = evals_log.get(self.data_name, {}).get(self.metric)
+            if not history:
+                return False
+
+            value = history[-1]
+            if isinstance(value, tuple):  # (mean, std) when running xgb.cv
+                value = value[0]
+            value = -float(value)
+
+        self.trial.report(value, step)
+        if self.trial.should_prune():
+            raise optuna.TrialPruned(f"Pruned at round {step}")
+        return False
+
+
 class XGBHyperparameterTuner:
-    def __init__(self, n_trials=40, use_gpu=False):
+    def __init__(self, n_trials=40, use_gpu=False, storage=None,
+                 study_name=None, n_workers=1, pruner="none",
+                 seed_params=None, multi_fidelity=None):
+        """
+        Args:
+            storage: SQLite path / journal file (.log) / DB URL for a resumable
+                     study (None = in-memory)
+            study_name: Study name within the storage
+            n_workers: Worker processes sharing the study (needs storage)
+            pruner: "none" (default), "median" or "halving" - stops weak
+                    trials early on their intermediate validation macro-F1
+            seed_params: Param dicts enqueued as the first trials of a new study
+            multi_fidelity: None, "window" (recent-history rungs) or "rows"
+                            (row-subsample rungs) successive-halving search
+        """
         self.n_trials = n_trials
         self.use_gpu = use_gpu
+        self.storage = storage
+        self.study_name = study_name
+        self.n_workers = n_workers
+        self.pruner = pruner
+        self.seed_params = seed_params
+        self.multi_fidelity = multi_fidelity
+        self.best_trial_params = None
+        self.best_score = None
+        self.num_threads = threads_per_worker(n_workers)
         self.study = None
 
     def objective(self, trial, X_train, y_train, X_val, y_val):
@@ -77,7 +145,7 @@ class XGBHyperparameterTuner:
             "reg_alpha": trial.suggest_float("reg_alpha", 0.0, 1.5),
             "reg_lambda": trial.suggest_float("reg_lambda", 0.5, 4.0),
             "random_state": 42,
-            "nthread": -1,
+            "nthread": self.num_threads,
         }
 
         if self.use_gpu:
@@ -93,6 +161,12 @@ class XGBHyperparameterTuner:
         dtrain = xgb.DMatrix(Xb_np, label=yb, weight=weight_array)
         dval = xgb.DMatrix(Xv_np, label=y_val)
 
+        # Intermediate reports use validation macro-F1, the score the trial
+        # is ranked by
+        def f1_proxy(booster):
+            y_pred = np.argmax(booster.predict(dval), axis=1)
+            return f1_score(y_val, y_pred, average="macro", zero_division=0)
+
         # Train
         model = xgb.train(
             params,
@@ -100,6 +174,7 @@ class XGBHyperparameterTuner:
             num_boost_round=600,
             evals=[(dtrain, "train"), (dval, "val")],
             early_stopping_rounds=50,
+            callbacks=[XGBPruningCallback(trial, score_fn=f1_proxy)],
             verbose_eval=False
         )
 
@@ -112,16 +187,25 @@ class XGBHyperparameterTuner:
         return score
 
     def tune(self, X_train, y_train, X_val, y_val):
-        def _objective(trial):
-            return self.objective(trial, X_train, y_train, X_val, y_val)
-
-        self.study = optuna.create_study(direction="maximize")
-        self.study.optimize(
-            _objective, n_trials=self.n_trials, show_progress_bar=True)
+        self.num_threads = threads_per_worker(self.n_workers)
+        self.study = create_study(
+            "maximize", storage=self.storage, study_name=self.study_name,
+            pruner=make_pruner(self.pruner), seed_params=self.seed_params)
+        if self.multi_fidelity:
+            self.best_trial_params, self.best_score = multi_fidelity_search(
+                self.study, self, X_train, y_train, (X_val, y_val), self.n_trials,
+                mode=self.multi_fidelity, n_workers=self.n_workers,
+                storage=self.storage)
+        else:
+            optimize_study(
+                self.study, self, (X_train, y_train, X_val, y_val),
+                n_trials=self.n_trials, n_workers=self.n_workers,
+                storage=self.storage)
+            self.best_trial_params = self.study.best_params
+            self.best_score = self.study.best_value
 
-        logger.info(f"[XGB Tuner] Best Trial: {self.study.best_trial.number}")
         logger.info(
-            f"[XGB Tuner] Best Score (macro-F1): {self.study.best_value:.4f}")
-        logger.info(f"[XGB Tuner] Params: {self.study.best_trial.params}")
+            f"[XGB Tuner] Best Score (macro-F1): {self.best_score:.4f}")
+        logger.info(f"[XGB Tuner] Params: {self.best_trial_params}")
 
-        return self.study.best_trial.params
+        return self.best_trial_params
@@ -0,0 +1,7 @@
+import sys
+from pathlib import Path
+
+# Tests import the project as the scripts do: `from src...`, sagemaker modules by name
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "sagemaker"))
@@ -0,0 +1,131 @@
+"""
+Parity of the compiled (lleaves) backend against Booster.predict.
+
+Inputs probe every split boundary (on / just below / just above each
+threshold), missing values and categorical splits, including categories
+the booster never saw.
+"""
+
+import pickle
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+lgb = pytest.importorskip("lightgbm")
+pytest.importorskip("lleaves")
+
+from src.models.compiled_booster import (PARITY_ATOL, CompiledBooster,  # noqa: E402
+                                         attach_compiled, compile_booster,
+                                         parity_inputs, save_compiled_meta,
+                                         verify_parity)
+
+N_FEATURES = 6
+CAT_FEATURE = N_FEATURES - 1
+N_CATEGORIES = 8
+
+
+def _training_data(rng, n_rows=3000):
+    X = rng.standard_normal((n_rows, N_FEATURES))
+    X[:, CAT_FEATURE] = rng.integers(0, N_CATEGORIES, n_rows)
+    X[rng.random(X.shape) < 0.05] = np.nan
+
+    cat_effect = np.where(np.isin(X[:, CAT_FEATURE], [1, 4, 6]), 0.02, -0.01)
+    signal = np.nan_to_num(X[:, 0]) * 0.01 - np.nan_to_num(X[:, 1]) * 0.005 + cat_effect
+    return X, signal + rng.standard_normal(n_rows) * 0.005
+
+
+def _train(objective):
+    rng = np.random.default_rng(7)
+    X, y = _training_data(rng)
+    params = {"objective": objective, "num_leaves": 15, "learning_rate": 0.1,
+              "min_child_samples": 20, "verbosity": -1, "seed": 7}
+    if objective == "multiclass":
+        params["num_class"] = 3
+        y = np.digitize(y, np.quantile(y, [1 / 3, 2 / 3]))
+
+    data = lgb.Dataset(X, label=y, categorical_feature=[CAT_FEATURE])
+    return lgb.train(params, data, num_boost_round=40)
+
+
+def _probe_rows(booster):
+    X = parity_inputs(booster, n_rows=2000, missing_rate=0.05)
+    rng = np.random.default_rng(1)
+    # Seen and unseen (incl. negative) categories, plus missing
+    X[:, CAT_FEATURE] = rng.choice(
+        np.r_[np.arange(N_CATEGORIES), [N_CATEGORIES + 3, -1, np.nan]], size=len(X))
+    all_missing = np.full((1, X.shape[1]), np.nan)
+    return np.vstack([X, all_missing])
+
+
+@pytest.fixture(params=["regression", "multiclass"])
+def booster(request):
+    return _train(request.param)
+
+
+@pytest.fixture
+def compiled_model(booster, tmp_path):
+    lib_path = tmp_path / "TEST_return.so"
+    compiled = compile_booster(booster, lib_path)
+    save_compiled_meta(lib_path, booster, verify_parity(booster, compiled))
+
+    model = SimpleNamespace(model=booster)
+    assert attach_compiled(model, lib_path)
+    return model, booster
+
+
+def test_has_categorical_split(booster):
+    decisions = set()
+
+    def walk(node):
+        if "split_feature" in node:
+            decisions.add(node["decision_type"])
+            walk(node["left_child"])
+            walk(node["right_child"])
+
+    for tree in booster.dump_model()["tree_info"]:
+        walk(tree["tree_structure"])
+    assert "==" in decisions
+
+
+def test_attached_predictions_match_booster(compiled_model):
+    model, booster = compiled_model
+    assert isinstance(model.model, CompiledBooster)
+
+    X = _probe_rows(booster)
+    np.testing.assert_allclose(model.model.predict(X), booster.predict(X),
+                               rtol=0, atol=PARITY_ATOL)
+
+
+def test_single_row_matches_booster(compiled_model):
+    model, booster = compiled_model
+    X = _probe_rows(booster)
+
+    for row in X[:50]:
+        np.testing.assert_allclose(model.model.predict(row), booster.predict(row.reshape(1, -1)),
+                                   rtol=0, atol=PARITY_ATOL)
+
+
+def test_predict_kwargs_fall_back_to_booster(compiled_model):
+    model, booster = compiled_model
+    X = _probe_rows(booster)[:100]
+
+    np.testing.assert_array_equal(model.model.predict(X, pred_leaf=True),
+                                  booster.predict(X, pred_leaf=True))
+
+
+def test_pickles_as_plain_booster(compiled_model):
+    model, _ = compiled_model
+    assert isinstance(pickle.loads(pickle.dumps(model.model)), lgb.Booster)
+
+
+def test_stale_library_is_not_attached(booster, tmp_path):
+    lib_path = tmp_path / "TEST_return.so"
+    compiled = compile_booster(booster, lib_path)
+    save_compiled_meta(lib_path, booster, verify_parity(booster, compiled))
+
+    retrained = _train("regression" if booster.params["objective"] == "multiclass"
+                       else "multiclass")
+    model = SimpleNamespace(model=retrained)
+    assert not attach_compiled(model, lib_path)
+    assert model.model is retrained
@@ -0,0 +1,83 @@
+"""
+Hot reload of versioned model sets (sagemaker/inference.py reload_models).
+"""
+
+import joblib
+import pytest
+
+pytest.importorskip("prometheus_client")
+
+import inference  # noqa: E402
+import model_manifest  # noqa: E402
+
+
+def _publish(model_dir, source_dir, version, models):
+    """Publish {ticker: picklable model} as ``version`` through model_manifest."""
+    source_dir.mkdir(exist_ok=True)
+    for path in source_dir.glob("*.pkl"):
+        path.unlink()
+    for ticker, model in models.items():
+        joblib.dump(model, source_dir / f"{ticker}_return.pkl")
+
+    previous = model_manifest.read_manifest(model_dir / model_manifest.MANIFEST_NAME)
+    manifest = model_manifest.build_manifest(source_dir, version=version, previous=previous)
+    model_manifest.publish(manifest, source_dir, model_dir, previous=previous)
+    return manifest
+
+
+@pytest.fixture
+def model_dir(tmp_path, monkeypatch):
+    model_dir = tmp_path / "model"
+    model_dir.mkdir()
+    v1 = _publish(model_dir, tmp_path / "src", "v1", {"AAPL": {"version": 1}})
+
+    monkeypatch.setattr(inference, "MODEL_DIR", str(model_dir))
+    monkeypatch.setattr(inference, "MODEL_MANIFEST",
+                        str(model_dir / model_manifest.MANIFEST_NAME))
+    monkeypatch.setattr(inference, "USE_COMPILED_MODELS", False)
+    monkeypatch.setattr(inference, "_manifest", v1)
+    monkeypatch.setattr(inference, "_manifest_mtime", None)
+    monkeypatch.setattr(inference, "_pending", [])
+    monkeypatch.setattr(inference, "_model_cache", inference.ModelCache())
+    return model_dir
+
+
+def test_failed_tickers_are_retried_on_the_next_poll(model_dir, tmp_path, monkeypatch):
+    assert inference.load_model("AAPL") == {"version": 1}
+    v2 = _publish(model_dir, tmp_path / "src", "v2",
+                  {"AAPL": {"version": 2}, "MSFT": {"version": 2}})
+
+    reload_ticker = inference._reload_ticker
+    failed = set()
+
+    def fail_once(ticker, entry):
+        if ticker not in failed:
+            failed.add(ticker)
+            return False
+        return reload_ticker(ticker, entry)
+
+    monkeypatch.setattr(inference, "_reload_ticker", fail_once)
+
+    summary = inference.reload_models()
+    assert sorted(summary["pending"]) == ["AAPL", "MSFT"]
+    assert inference.manifest_version() == "v2"
+    assert inference.load_model("AAPL") == {"version": 1}  # old model keeps serving
+    assert inference.load_model("MSFT") is None
+
+    # Same manifest file and version: the pending tickers are still applied
+    summary = inference.reload_models()
+    assert summary["pending"] == []
+    assert summary["changed"] == 2
+    assert inference._manifest["models"] == v2["models"]
+    assert inference.load_model("AAPL") == {"version": 2}
+    assert inference.load_model("MSFT") == {"version": 2}
+
+    assert inference.reload_models() is None
+
+
+def test_served_tickers_come_from_the_manifest(model_dir):
+    # Artifacts live under <version>/, none at the top level
+    assert not list(model_dir.glob("*.pkl"))
+    assert model_manifest.served_tickers(model_dir) == ["AAPL"]
+    assert inference.available_tickers() == ["AAPL"]
+    assert inference.model_fn(str(model_dir)) == model_dir